@@ -6,14 +6,23 @@ Uses SQLAlchemy with async SQLite support.
 """
 
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 
-from sqlalchemy import create_engine, Column, String, Text, DateTime, Boolean, Integer, JSON, ForeignKey, Table
+from sqlalchemy import create_engine, Column, String, Text, DateTime, Boolean, Integer, JSON, ForeignKey, Table, LargeBinary
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship
 from sqlalchemy.pool import StaticPool
 
+from .json_codec import json_dumps, json_loads
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is listed in requirements.txt
+    zstandard = None
+
 # Database file location
 DB_PATH = Path("/root/.claude/auto-claude.db")
 DATABASE_URL = f"sqlite:///{DB_PATH}"
@@ -27,6 +36,12 @@ engine = create_engine(
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Every session shares the one StaticPool connection, so sessions from
+# different threads (state exports run on a worker thread) must not
+# interleave: closing one would roll back another's open transaction.
+# Reentrant because services may open a session inside another.
+_session_lock = threading.RLock()
 Base = declarative_base()
 
 
@@ -51,7 +66,7 @@ class ProjectModel(Base):
 
     # Project-level data (previously flat files in .auto-claude/)
     project_index = Column(JSON, nullable=True)  # was project_index.json
-    insights_sessions = Column(JSON, nullable=True)  # was insights_sessions.json
+    insights_sessions = Column(JSON, nullable=True)  # Legacy - moved to insights_sessions table
     file_timelines = Column(JSON, nullable=True)  # was file-timelines/*.json
 
     # Relationships
@@ -81,7 +96,7 @@ class TaskModel(Base):
 
     id = Column(String, primary_key=True)  # Same as spec_id
     spec_id = Column(String, nullable=False)
-    project_id = Column(String, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(String, ForeignKey("projects.id"), nullable=False, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     status = Column(String, default="pending")
@@ -258,6 +273,16 @@ class SettingModel(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class InsightsSessionModel(Base):
+    """One insights chat session, stored as an encoded JSON blob."""
+    __tablename__ = "insights_sessions"
+
+    project_id = Column(String, ForeignKey("projects.id"), primary_key=True)
+    session_id = Column(String, primary_key=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    data = Column(LargeBinary, nullable=False)
+
+
 class TabStateModel(Base):
     """UI tab state model."""
     __tablename__ = "tab_state"
@@ -421,6 +446,13 @@ def _run_migrations():
                     except Exception as e:
                         print(f"[Database] Migration warning for tasks.{col_name}: {e}")
 
+            # Per-project task lookups (state export, listings) use this index
+            try:
+                db.execute(text('CREATE INDEX IF NOT EXISTS ix_tasks_project_id ON tasks (project_id)'))
+                db.commit()
+            except Exception as e:
+                print(f"[Database] Migration warning for ix_tasks_project_id: {e}")
+
 
 def get_db():
     """Get a database session."""
@@ -431,18 +463,61 @@ def get_db():
         db.close()
 
 
+# Insights session blobs of at least _ZSTD_MIN_BYTES are zstd-compressed
+# when zstandard is installed. Compressed rows start with _ZSTD_MAGIC;
+# anything else is plain JSON (older rows, small sessions).
+_ZSTD_MAGIC = b"ZST1"
+_ZSTD_MIN_BYTES = 4096
+_ZSTD_LEVEL = 3
+
+
+def _encode_insights_session(session: dict) -> bytes:
+    data = json_dumps(session, default=str)
+    if zstandard is not None and len(data) >= _ZSTD_MIN_BYTES:
+        return _ZSTD_MAGIC + zstandard.compress(data, _ZSTD_LEVEL)
+    return data
+
+
+def _decode_insights_session(data: bytes) -> dict:
+    if data.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read compressed insights sessions")
+        data = zstandard.decompress(data[len(_ZSTD_MAGIC):])
+    return json_loads(data)
+
+
+def _insights_session_upsert(project_id: str, session_id: str, session: dict):
+    """INSERT ... ON CONFLICT DO UPDATE for one insights session row."""
+    data = _encode_insights_session(session)
+    now = datetime.utcnow()
+    return sqlite_insert(InsightsSessionModel).values(
+        project_id=project_id, session_id=session_id, data=data, updated_at=now
+    ).on_conflict_do_update(
+        index_elements=["project_id", "session_id"],
+        set_={"data": data, "updated_at": now},
+    )
+
+
 class get_db_session:
     """Context manager for database sessions."""
     def __init__(self):
         self.db = None
 
     def __enter__(self):
-        self.db = SessionLocal()
+        _session_lock.acquire()
+        try:
+            self.db = SessionLocal()
+        except BaseException:
+            _session_lock.release()
+            raise
         return self.db
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.db:
-            self.db.close()
+        try:
+            if self.db:
+                self.db.close()
+        finally:
+            _session_lock.release()
         return False
 
 
@@ -460,6 +535,19 @@ class ProjectService:
             projects = db.query(ProjectModel).all()
             return [p.to_dict() for p in projects]
 
+    @staticmethod
+    def get_rows() -> List[tuple]:
+        """
+        (id, name, path, auto_build_path, settings, created_at, updated_at) for
+        every project, without loading the project data columns.
+        """
+        with get_db_session() as db:
+            query = db.query(
+                ProjectModel.id, ProjectModel.name, ProjectModel.path, ProjectModel.auto_build_path,
+                ProjectModel.settings, ProjectModel.created_at, ProjectModel.updated_at,
+            )
+            return [tuple(row) for row in query]
+
     @staticmethod
     def get_by_id(project_id: str) -> Optional[dict]:
         """Get project by ID."""
@@ -484,6 +572,41 @@ class ProjectService:
             db.refresh(project)
             return project.to_dict()
 
+    @staticmethod
+    def bulk_upsert(projects: List[dict]) -> None:
+        """
+        Insert or update many projects in one transaction.
+
+        Settings are merged into the stored settings, as update() does.
+        """
+        if not projects:
+            return
+        now = datetime.utcnow()
+        with get_db_session() as db:
+            stored = dict(db.query(ProjectModel.id, ProjectModel.settings).filter(
+                ProjectModel.id.in_([p["id"] for p in projects])
+            ))
+            rows = [
+                {
+                    "id": p["id"],
+                    "name": p["name"],
+                    "path": p["path"],
+                    "auto_build_path": p.get("autoBuildPath"),
+                    "settings": {**(stored.get(p["id"]) or {}), **(p.get("settings") or {})},
+                    "updated_at": now,
+                }
+                for p in projects
+            ]
+            insert = sqlite_insert(ProjectModel)
+            db.execute(insert.on_conflict_do_update(
+                index_elements=["id"],
+                set_={
+                    column: insert.excluded[column]
+                    for column in ("name", "path", "auto_build_path", "settings", "updated_at")
+                },
+            ), rows)
+            db.commit()
+
     @staticmethod
     def update(project_id: str, updates: dict) -> Optional[dict]:
         """Update a project."""
@@ -533,22 +656,58 @@ class ProjectService:
 
     @staticmethod
     def get_insights_sessions(project_id: str) -> Optional[dict]:
-        """Get insights sessions data."""
+        """
+        Get insights sessions data, keyed by session ID.
+
+        Sessions still in the legacy projects.insights_sessions column are
+        moved to the insights_sessions table on first read.
+        """
         with get_db_session() as db:
+            rows = db.query(InsightsSessionModel.session_id, InsightsSessionModel.data).filter(
+                InsightsSessionModel.project_id == project_id
+            ).all()
+            if rows:
+                return {session_id: _decode_insights_session(data) for session_id, data in rows}
+
             project = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
-            return project.insights_sessions if project else None
+            legacy = project.insights_sessions if project else None
+
+        if legacy:
+            ProjectService.save_insights_sessions(project_id, legacy)
+        return legacy
 
     @staticmethod
     def save_insights_sessions(project_id: str, sessions: dict) -> bool:
-        """Save insights sessions data."""
+        """Save every insights session of a project (used for migration)."""
         with get_db_session() as db:
             project = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
             if not project:
                 return False
-            project.insights_sessions = sessions
+            for session_id, session in sessions.items():
+                db.execute(_insights_session_upsert(project_id, session_id, session))
+            project.insights_sessions = None
             db.commit()
             return True
 
+    @staticmethod
+    def upsert_insights_session(project_id: str, session_id: str, session: dict) -> bool:
+        """Insert or replace one insights session."""
+        with get_db_session() as db:
+            db.execute(_insights_session_upsert(project_id, session_id, session))
+            db.commit()
+            return True
+
+    @staticmethod
+    def delete_insights_session(project_id: str, session_id: str) -> bool:
+        """Delete one insights session."""
+        with get_db_session() as db:
+            deleted = db.query(InsightsSessionModel).filter(
+                InsightsSessionModel.project_id == project_id,
+                InsightsSessionModel.session_id == session_id,
+            ).delete()
+            db.commit()
+            return deleted > 0
+
     @staticmethod
     def get_file_timelines(project_id: str) -> Optional[dict]:
         """Get file timelines data."""
@@ -574,6 +733,7 @@ class ProjectService:
             project = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
             if not project:
                 return False
+            db.query(InsightsSessionModel).filter(InsightsSessionModel.project_id == project_id).delete()
             db.delete(project)
             db.commit()
             return True
@@ -598,6 +758,32 @@ class TaskService:
             tasks = query.all()
             return [t.to_dict() for t in tasks]
 
+    @staticmethod
+    def get_rows(project_id: Optional[str] = None, include_archived: bool = False) -> List[tuple]:
+        """
+        (id, spec_id, project_id, title, description, status) for every task,
+        selected as plain columns instead of full rows and dicts.
+        """
+        with get_db_session() as db:
+            query = db.query(
+                TaskModel.id, TaskModel.spec_id, TaskModel.project_id,
+                TaskModel.title, TaskModel.description, TaskModel.status,
+            )
+            if project_id:
+                query = query.filter(TaskModel.project_id == project_id)
+            if not include_archived:
+                query = query.filter(TaskModel.archived == False)
+            return [tuple(row) for row in query]
+
+    @staticmethod
+    def count(include_archived: bool = False) -> int:
+        """Number of tasks."""
+        with get_db_session() as db:
+            query = db.query(TaskModel)
+            if not include_archived:
+                query = query.filter(TaskModel.archived == False)
+            return query.count()
+
     @staticmethod
     def get_by_id(task_id: str) -> Optional[dict]:
         """Get task by ID."""
@@ -624,6 +810,62 @@ class TaskService:
             db.refresh(task)
             return task.to_dict()
 
+    @staticmethod
+    def create_many(tasks_data: List[dict]) -> None:
+        """Create many tasks in one transaction; ids that already exist are skipped."""
+        if not tasks_data:
+            return
+        rows = [
+            {
+                "id": task_data["id"],
+                "spec_id": task_data.get("specId", task_data["id"]),
+                "project_id": task_data["projectId"],
+                "title": task_data["title"],
+                "description": task_data.get("description"),
+                "status": task_data.get("status", "pending"),
+                "worktree_branch": task_data.get("worktreeBranch"),
+                "extra_data": task_data.get("metadata", {}),
+            }
+            for task_data in tasks_data
+        ]
+        with get_db_session() as db:
+            db.execute(sqlite_insert(TaskModel).on_conflict_do_nothing(index_elements=["id"]), rows)
+            db.commit()
+
+    @staticmethod
+    def bulk_upsert(tasks_data: List[dict]) -> None:
+        """
+        Insert or update many tasks in one transaction.
+
+        Existing rows get the new title, description and status; their other
+        columns are left alone, as update() does.
+        """
+        if not tasks_data:
+            return
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": task_data["id"],
+                "spec_id": task_data.get("specId", task_data["id"]),
+                "project_id": task_data["projectId"],
+                "title": task_data["title"],
+                "description": task_data.get("description"),
+                "status": task_data.get("status", "pending"),
+                "updated_at": now,
+            }
+            for task_data in tasks_data
+        ]
+        insert = sqlite_insert(TaskModel)
+        with get_db_session() as db:
+            db.execute(insert.on_conflict_do_update(
+                index_elements=["id"],
+                set_={
+                    column: insert.excluded[column]
+                    for column in ("title", "description", "status", "updated_at")
+                },
+            ), rows)
+            db.commit()
+
     @staticmethod
     def update(task_id: str, updates: dict) -> Optional[dict]:
         """Update a task."""
@@ -673,6 +915,17 @@ class TaskService:
             db.commit()
             return True
 
+    @staticmethod
+    def reset_in_progress() -> int:
+        """Move every unarchived in_progress task back to backlog; returns how many."""
+        with get_db_session() as db:
+            count = db.query(TaskModel).filter(
+                TaskModel.status == "in_progress",
+                TaskModel.archived == False,
+            ).update({"status": "backlog"}, synchronize_session=False)
+            db.commit()
+            return count
+
     @staticmethod
     def archive(task_ids: List[str], version: Optional[str] = None) -> int:
         """Archive multiple tasks."""
@@ -950,6 +1203,20 @@ class ReleaseService:
 # Spec Service
 # =============================================================================
 
+# Callbacks run with the spec ID after a spec is written or deleted
+_spec_write_hooks: List[Callable[[str], None]] = []
+
+
+def register_spec_write_hook(hook: Callable[[str], None]) -> None:
+    """Register a callback invoked with the spec ID whenever a spec changes."""
+    _spec_write_hooks.append(hook)
+
+
+def _notify_spec_write(spec_id: str) -> None:
+    for hook in _spec_write_hooks:
+        hook(spec_id)
+
+
 class SpecService:
     """Service for spec data database operations."""
 
@@ -991,6 +1258,7 @@ class SpecService:
             db.add(spec)
             db.commit()
             db.refresh(spec)
+            _notify_spec_write(spec.id)
             return spec.to_dict()
 
     @staticmethod
@@ -1030,6 +1298,7 @@ class SpecService:
 
             db.commit()
             db.refresh(spec)
+            _notify_spec_write(spec_id)
             return spec.to_dict()
 
     @staticmethod
@@ -1088,6 +1357,7 @@ class SpecService:
 
             db.commit()
             db.refresh(spec)
+            _notify_spec_write(spec_id)
             return spec.to_dict()
 
     @staticmethod
@@ -1113,6 +1383,7 @@ class SpecService:
                 return False
             db.delete(spec)
             db.commit()
+            _notify_spec_write(spec_id)
             return True
 
 
@@ -1222,33 +1493,40 @@ class ProfileService:
 # =============================================================================
 
 class SettingsService:
-    """Service for app settings database operations."""
+    """
+    Service for app settings database operations.
+
+    The settings table is small and read far more often than written, so
+    it is cached whole after the first read; set/set_many/delete keep the
+    cache current. Values are cached as encoded JSON, so every read returns
+    a fresh copy the caller may modify, as a database read would.
+    """
+
+    _cache: Optional[Dict[str, bytes]] = None
+
+    @staticmethod
+    def _cached() -> Dict[str, bytes]:
+        if SettingsService._cache is None:
+            with get_db_session() as db:
+                settings = db.query(SettingModel).all()
+                SettingsService._cache = {s.key: json_dumps(s.value) for s in settings}
+        return SettingsService._cache
 
     @staticmethod
     def get(key: str, default: Any = None) -> Any:
         """Get a setting by key."""
-        with get_db_session() as db:
-            setting = db.query(SettingModel).filter(SettingModel.key == key).first()
-            return setting.value if setting else default
+        value = SettingsService._cached().get(key)
+        return default if value is None else json_loads(value)
 
     @staticmethod
     def get_all() -> dict:
         """Get all settings as a dictionary."""
-        with get_db_session() as db:
-            settings = db.query(SettingModel).all()
-            return {s.key: s.value for s in settings}
+        return {key: json_loads(value) for key, value in SettingsService._cached().items()}
 
     @staticmethod
     def set(key: str, value: Any) -> None:
         """Set a setting."""
-        with get_db_session() as db:
-            setting = db.query(SettingModel).filter(SettingModel.key == key).first()
-            if setting:
-                setting.value = value
-            else:
-                setting = SettingModel(key=key, value=value)
-                db.add(setting)
-            db.commit()
+        SettingsService.set_many({key: value})
 
     @staticmethod
     def set_many(settings: dict) -> None:
@@ -1262,6 +1540,10 @@ class SettingsService:
                     setting = SettingModel(key=key, value=value)
                     db.add(setting)
             db.commit()
+        if SettingsService._cache is not None:
+            SettingsService._cache.update(
+                (key, json_dumps(value)) for key, value in settings.items()
+            )
 
     @staticmethod
     def delete(key: str) -> bool:
@@ -1272,7 +1554,9 @@ class SettingsService:
                 return False
             db.delete(setting)
             db.commit()
-            return True
+        if SettingsService._cache is not None:
+            SettingsService._cache.pop(key, None)
+        return True
 
 
 # =============================================================================
@@ -13,20 +13,75 @@ Architecture:
 Uses git plumbing commands to avoid branch switching issues in worktrees.
 """
 
+import hashlib
+import io
 import json
 import subprocess
 import tempfile
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List, Set, Tuple
 import shutil
 import os
 
+from .database import register_spec_write_hook
+from .json_codec import json_dumps, json_loads
+
 
 # Hidden ref - not under refs/heads/ so it won't appear as a branch
 STATE_REF = "refs/auto-claude/state"
 STATE_DIR = ".auto-claude-state"
 
+# Number of state commits kept before the history is squashed into an orphan commit
+STATE_HISTORY_LIMIT = 1000
+
+# Exports touching at least this many files go through a single git fast-import
+FAST_IMPORT_MIN_CHANGES = 20
+
+# Per-project export locks. Concurrent exports would race on update-ref and
+# build commits on stale trees; a busy export instead leaves its state in
+# _pending_exports for the lock holder to re-run with.
+_project_locks: Dict[str, threading.Lock] = {}
+_pending_exports: Dict[str, Tuple[List[Dict[str, Any]], Optional[Dict[str, Dict[str, Any]]], Optional[Set[str]]]] = {}
+_locks_mutex = threading.Lock()
+
+# Short-lived cache of collect_spec_data_from_db results, so a restore followed
+# by an export (or back-to-back exports) doesn't re-read every spec. Entries
+# are dropped whenever SpecService writes the spec.
+_SPEC_CACHE_TTL_SECONDS = 2.0
+_spec_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Flat-file spec data per spec directory, with the (name, mtime_ns, size)
+# of each file it was read from; reused until one of those changes
+_spec_file_cache: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}
+
+
+def _git_blob_sha(data: bytes, hash_algo: str = "sha1") -> str:
+    """Compute the object ID git would assign to a blob with this content."""
+    h = hashlib.new(hash_algo)
+    h.update(b"blob %d\0" % len(data))
+    h.update(data)
+    return h.hexdigest()
+
+
+def _queue_pending_export(key: str, tasks: List[Dict[str, Any]],
+                          specs: Optional[Dict[str, Dict[str, Any]]],
+                          spec_ids: Optional[Set[str]]) -> None:
+    """
+    Fold an export request into the pending one for a project.
+
+    Caller must hold _locks_mutex. Tasks always come from the newest request;
+    partial spec exports are merged so no changed spec is dropped.
+    """
+    pending = _pending_exports.get(key)
+    if pending is not None and spec_ids is not None:
+        _, pending_specs, pending_ids = pending
+        specs = {**(pending_specs or {}), **(specs or {})}
+        spec_ids = None if pending_ids is None else pending_ids | spec_ids
+    _pending_exports[key] = (tasks, specs, spec_ids)
+
 
 class GitStateManager:
     """Manages task state persistence via git using plumbing commands."""
@@ -34,13 +89,17 @@ class GitStateManager:
     def __init__(self, project_path: str):
         self.project_path = Path(project_path)
 
-    def _run_git(self, *args, check: bool = True, capture: bool = True, input_data: str = None) -> subprocess.CompletedProcess:
-        """Run a git command in the project directory."""
+    def _run_git(self, *args, check: bool = True, capture: bool = True, input_data: bytes = None) -> subprocess.CompletedProcess:
+        """
+        Run a git command in the project directory.
+
+        Output is left as bytes: state blobs can be large, and callers decode
+        only what they need (SHAs as ASCII, JSON straight from bytes).
+        """
         cmd = ["git", "-C", str(self.project_path)] + list(args)
         return subprocess.run(
             cmd,
             capture_output=capture,
-            text=True,
             check=check,
             input=input_data
         )
@@ -55,13 +114,63 @@ class GitStateManager:
         result = self._run_git("rev-parse", "--verify", STATE_REF, check=False)
         return result.returncode == 0
 
+    def _ls_tree(self, *paths: str) -> List[Tuple[str, str]]:
+        """
+        List blobs under the state ref as (path, blob_sha) pairs.
+
+        Uses NUL-separated output so paths never need unquoting.
+        """
+        result = subprocess.run(
+            ["git", "-C", str(self.project_path), "ls-tree", "-r", "-z", STATE_REF, "--", *paths],
+            capture_output=True, check=False
+        )
+        if result.returncode != 0:
+            return []
+
+        entries = []
+        for record in result.stdout.split(b"\0"):
+            if not record:
+                continue
+            # Format: <mode> SP <type> SP <sha> TAB <path>
+            meta, path = record.split(b"\t", 1)
+            _mode, obj_type, sha = meta.split(b" ")
+            if obj_type == b"blob":
+                entries.append((path.decode("utf-8"), sha.decode("ascii")))
+        return entries
+
+    def _cat_file_batch(self, shas: List[str]) -> Dict[str, bytes]:
+        """Read many blobs through a single `git cat-file --batch` process."""
+        if not shas:
+            return {}
+
+        result = subprocess.run(
+            ["git", "-C", str(self.project_path), "cat-file", "--batch"],
+            input="".join(f"{sha}\n" for sha in shas).encode("ascii"),
+            capture_output=True, check=True
+        )
+
+        # Each response is "<sha> <type> <size>\n<content>\n" or "<sha> missing\n"
+        out = result.stdout
+        blobs = {}
+        pos = 0
+        while pos < len(out):
+            header_end = out.index(b"\n", pos)
+            header = out[pos:header_end].split(b" ")
+            pos = header_end + 1
+            if len(header) != 3:
+                continue
+            size = int(header[2])
+            blobs[header[0].decode("ascii")] = out[pos:pos + size]
+            pos += size + 1
+        return blobs
+
     def _get_state_tree(self) -> Optional[str]:
         """Get the tree SHA of the current state ref."""
         if not self._state_ref_exists():
             return None
         result = self._run_git("rev-parse", f"{STATE_REF}^{{tree}}", check=False)
         if result.returncode == 0:
-            return result.stdout.strip()
+            return result.stdout.strip().decode("ascii")
         return None
 
     def _create_state_doc(self) -> bool:
@@ -123,64 +232,19 @@ This is a **hidden ref** - not a regular branch. It:
         self._create_state_doc()
 
         try:
-            # Create initial state in a temp directory
-            with tempfile.TemporaryDirectory() as tmpdir:
-                tmppath = Path(tmpdir)
-                state_dir = tmppath / STATE_DIR
-                state_dir.mkdir(parents=True)
-
-                # Create initial state files
-                initial_state = {
-                    "version": "1.0.0",
-                    "created_at": datetime.now().isoformat(),
-                    "tasks": []
-                }
-                (state_dir / "tasks.json").write_text(json.dumps(initial_state, indent=2))
-                (state_dir / "specs").mkdir(exist_ok=True)
-                (state_dir / "specs" / ".gitkeep").write_text("")
-
-                # Add files to git index using a temp index
-                env = os.environ.copy()
-                temp_index = tmppath / "temp_index"
-                env["GIT_INDEX_FILE"] = str(temp_index)
-
-                # Add all files from state_dir
-                for root, dirs, files in os.walk(state_dir):
-                    for file in files:
-                        filepath = Path(root) / file
-                        relpath = filepath.relative_to(tmppath)
-
-                        # Hash the file
-                        result = subprocess.run(
-                            ["git", "-C", str(self.project_path), "hash-object", "-w", str(filepath)],
-                            capture_output=True, text=True, check=True
-                        )
-                        blob_sha = result.stdout.strip()
-
-                        # Add to temp index
-                        subprocess.run(
-                            ["git", "-C", str(self.project_path), "update-index", "--add",
-                             "--cacheinfo", f"100644,{blob_sha},{relpath}"],
-                            env=env, capture_output=True, text=True, check=True
-                        )
-
-                # Write tree from temp index
-                result = subprocess.run(
-                    ["git", "-C", str(self.project_path), "write-tree"],
-                    env=env, capture_output=True, text=True, check=True
-                )
-                tree_sha = result.stdout.strip()
-
-                # Create commit (orphan - no parent)
-                result = subprocess.run(
-                    ["git", "-C", str(self.project_path), "commit-tree", tree_sha,
-                     "-m", "Initialize auto-claude state ref"],
-                    capture_output=True, text=True, check=True
-                )
-                commit_sha = result.stdout.strip()
-
-                # Create the branch ref
-                self._run_git("update-ref", STATE_REF, commit_sha)
+            # Create initial state files
+            initial_state = {
+                "version": "1.0.0",
+                "created_at": datetime.now().isoformat(),
+                "tasks": []
+            }
+            files = {
+                f"{STATE_DIR}/tasks.json": json_dumps(initial_state, indent=True, sort_keys=True),
+                f"{STATE_DIR}/specs/.gitkeep": b"",
+            }
+
+            # Create the orphan commit and ref in one fast-import stream
+            self._fast_import_commit("Initialize auto-claude state ref", files)
 
             print(f"[GitState] Created state ref: {STATE_REF}")
             return True
@@ -191,18 +255,52 @@ This is a **hidden ref** - not a regular branch. It:
             traceback.print_exc()
             return False
 
-    def export_state(self, tasks: List[Dict[str, Any]], specs: Dict[str, Dict[str, Any]] = None) -> bool:
+    def export_state(self, tasks: List[Dict[str, Any]], specs: Dict[str, Dict[str, Any]] = None,
+                     spec_ids: Optional[Set[str]] = None) -> bool:
         """
         Export current state from database to the state ref using plumbing commands.
         Does not switch branches.
 
+        Exports are serialized per project. If an export is already running,
+        this call records its state as pending and returns immediately; the
+        running export picks up the latest pending state when it finishes.
+
         Args:
             tasks: List of task dictionaries from database
             specs: Optional dict of spec_id -> spec data (implementation_plan, etc.)
+            spec_ids: If given, only these specs were collected into `specs`;
+                other spec directories already in the state ref are kept as-is
 
         Returns:
-            True if export successful
+            True if export successful (or coalesced into a running export)
         """
+        key = str(self.project_path)
+        with _locks_mutex:
+            lock = _project_locks.setdefault(key, threading.Lock())
+            if not lock.acquire(blocking=False):
+                _queue_pending_export(key, tasks, specs, spec_ids)
+                print(f"[GitState] Export already running for {key}, coalescing")
+                return True
+
+        released = False
+        try:
+            success = self._export_state_locked(tasks, specs, spec_ids)
+            while True:
+                with _locks_mutex:
+                    pending = _pending_exports.pop(key, None)
+                    if pending is None:
+                        lock.release()
+                        released = True
+                        return success
+                success = self._export_state_locked(*pending)
+        finally:
+            if not released:
+                with _locks_mutex:
+                    lock.release()
+
+    def _export_state_locked(self, tasks: List[Dict[str, Any]], specs: Optional[Dict[str, Dict[str, Any]]],
+                             spec_ids: Optional[Set[str]] = None) -> bool:
+        """Export state; caller must hold the project's export lock."""
         if not self._is_git_repo():
             print(f"[GitState] Not a git repo, skipping export")
             return False
@@ -213,131 +311,123 @@ This is a **hidden ref** - not a regular branch. It:
                 return False
 
         try:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                tmppath = Path(tmpdir)
-                state_dir = tmppath / STATE_DIR
-                state_dir.mkdir(parents=True)
-                (state_dir / "specs").mkdir(exist_ok=True)
-
-                # Write tasks.json
-                tasks_data = {
-                    "version": "1.0.0",
-                    "updated_at": datetime.now().isoformat(),
-                    "tasks": tasks
+            # Build the new state in memory: relpath -> file bytes
+            files: Dict[str, bytes] = {}
+
+            # Write tasks.json
+            tasks_data = {
+                "version": "1.0.0",
+                "updated_at": datetime.now().isoformat(),
+                "tasks": tasks
+            }
+            files[f"{STATE_DIR}/tasks.json"] = json_dumps(tasks_data, indent=True, sort_keys=True)
+
+            # Write project-level data (settings, index, insights, timelines)
+            try:
+                from .database import ProjectService
+                # Get project ID from first task if available
+                project_id = tasks[0].get("projectId") if tasks else None
+                if project_id:
+                    project = ProjectService.get_by_id(project_id)
+                    if project:
+                        # Export claude_settings
+                        settings = project.get("settings", {})
+                        if settings.get("claudeSettings"):
+                            files[f"{STATE_DIR}/claude_settings.json"] = json_dumps(
+                                settings["claudeSettings"], indent=True, sort_keys=True
+                            )
+
+                        # Export project_index
+                        project_index = ProjectService.get_project_index(project_id)
+                        if project_index:
+                            files[f"{STATE_DIR}/project_index.json"] = json_dumps(
+                                project_index, indent=True, sort_keys=True
+                            )
+
+                        # Export insights_sessions
+                        insights = ProjectService.get_insights_sessions(project_id)
+                        if insights:
+                            files[f"{STATE_DIR}/insights_sessions.json"] = json_dumps(
+                                insights, indent=True, sort_keys=True
+                            )
+
+                        # Export file_timelines
+                        timelines = ProjectService.get_file_timelines(project_id)
+                        if timelines:
+                            files[f"{STATE_DIR}/file_timelines.json"] = json_dumps(
+                                timelines, indent=True, sort_keys=True
+                            )
+            except Exception as e:
+                print(f"[GitState] Warning: Could not export project data: {e}")
+
+            # Write specs if provided
+            if specs:
+                for spec_id, spec_data in specs.items():
+                    for filename, content in spec_data.items():
+                        relpath = f"{STATE_DIR}/specs/{spec_id}/{filename}"
+                        if isinstance(content, dict):
+                            files[relpath] = json_dumps(content, indent=True, sort_keys=True)
+                        else:
+                            files[relpath] = str(content).encode("utf-8")
+
+            # Keep specs dir if empty
+            if not specs or not any(specs.values()):
+                files[f"{STATE_DIR}/specs/.gitkeep"] = b""
+
+            # Diff against the previous tree so only changed blobs are hashed
+            previous = dict(self._ls_tree(STATE_DIR))
+            hash_algo = "sha256" if any(len(sha) == 64 for sha in previous.values()) else "sha1"
+
+            changed = [
+                relpath for relpath, data in files.items()
+                if previous.get(relpath) != _git_blob_sha(data, hash_algo)
+            ]
+            removed = previous.keys() - files.keys()
+            if spec_ids is not None:
+                # Spec directories outside spec_ids were not re-collected; keep them
+                specs_prefix = f"{STATE_DIR}/specs/"
+                removed = {
+                    relpath for relpath in removed
+                    if not relpath.startswith(specs_prefix)
+                    or relpath[len(specs_prefix):].split("/", 1)[0] in spec_ids
                 }
-                (state_dir / "tasks.json").write_text(json.dumps(tasks_data, indent=2))
-
-                # Write project-level data (settings, index, insights, timelines)
-                try:
-                    from .database import ProjectService
-                    # Get project ID from first task if available
-                    project_id = tasks[0].get("projectId") if tasks else None
-                    if project_id:
-                        project = ProjectService.get_by_id(project_id)
-                        if project:
-                            # Export claude_settings
-                            settings = project.get("settings", {})
-                            if settings.get("claudeSettings"):
-                                (state_dir / "claude_settings.json").write_text(
-                                    json.dumps(settings["claudeSettings"], indent=2)
-                                )
-
-                            # Export project_index
-                            project_index = ProjectService.get_project_index(project_id)
-                            if project_index:
-                                (state_dir / "project_index.json").write_text(
-                                    json.dumps(project_index, indent=2)
-                                )
-
-                            # Export insights_sessions
-                            insights = ProjectService.get_insights_sessions(project_id)
-                            if insights:
-                                (state_dir / "insights_sessions.json").write_text(
-                                    json.dumps(insights, indent=2)
-                                )
-
-                            # Export file_timelines
-                            timelines = ProjectService.get_file_timelines(project_id)
-                            if timelines:
-                                (state_dir / "file_timelines.json").write_text(
-                                    json.dumps(timelines, indent=2)
-                                )
-                except Exception as e:
-                    print(f"[GitState] Warning: Could not export project data: {e}")
-
-                # Write specs if provided
-                if specs:
-                    for spec_id, spec_data in specs.items():
-                        spec_subdir = state_dir / "specs" / spec_id
-                        spec_subdir.mkdir(parents=True, exist_ok=True)
-
-                        for filename, content in spec_data.items():
-                            filepath = spec_subdir / filename
-                            if isinstance(content, dict):
-                                filepath.write_text(json.dumps(content, indent=2))
-                            else:
-                                filepath.write_text(str(content))
-
-                # Keep specs dir if empty
-                if not any((state_dir / "specs").iterdir()):
-                    (state_dir / "specs" / ".gitkeep").write_text("")
-
-                # Create temp index and add files
-                env = os.environ.copy()
-                temp_index = tmppath / "temp_index"
-                env["GIT_INDEX_FILE"] = str(temp_index)
-
-                for root, dirs, files in os.walk(state_dir):
-                    for file in files:
-                        filepath = Path(root) / file
-                        relpath = filepath.relative_to(tmppath)
-
-                        # Hash the file
-                        result = subprocess.run(
-                            ["git", "-C", str(self.project_path), "hash-object", "-w", str(filepath)],
-                            capture_output=True, text=True, check=True
-                        )
-                        blob_sha = result.stdout.strip()
-
-                        # Add to temp index
-                        subprocess.run(
-                            ["git", "-C", str(self.project_path), "update-index", "--add",
-                             "--cacheinfo", f"100644,{blob_sha},{relpath}"],
-                            env=env, capture_output=True, text=True, check=True
-                        )
-
-                # Write tree
-                result = subprocess.run(
-                    ["git", "-C", str(self.project_path), "write-tree"],
-                    env=env, capture_output=True, text=True, check=True
-                )
-                tree_sha = result.stdout.strip()
-
-                # Check if tree is different from current state ref tree
-                current_tree = self._get_state_tree()
-                if current_tree == tree_sha:
-                    print(f"[GitState] No state changes to export")
-                    return True
-
-                # Get current state ref commit for parent
-                result = self._run_git("rev-parse", STATE_REF, check=False)
-                parent_sha = result.stdout.strip() if result.returncode == 0 else None
 
-                # Create commit
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                commit_args = ["git", "-C", str(self.project_path), "commit-tree", tree_sha,
-                               "-m", f"State update: {timestamp}"]
-                if parent_sha:
-                    commit_args.extend(["-p", parent_sha])
-
-                result = subprocess.run(commit_args, capture_output=True, text=True, check=True)
-                commit_sha = result.stdout.strip()
+            if not changed and not removed:
+                print(f"[GitState] No state changes to export")
+                return True
 
-                # Update branch ref
-                self._run_git("update-ref", STATE_REF, commit_sha)
+            # Get current state ref commit for parent. Once the chain reaches
+            # STATE_HISTORY_LIMIT commits, start a fresh orphan commit instead so
+            # pushes and .git size don't grow with history (pushes are --force)
+            result = self._run_git("rev-list", f"--max-count={STATE_HISTORY_LIMIT}", STATE_REF, check=False)
+            history = result.stdout.split() if result.returncode == 0 else []
+            parent_sha = history[0].decode("ascii") if history else None
+            if len(history) >= STATE_HISTORY_LIMIT:
+                print(f"[GitState] Truncating state history at {STATE_HISTORY_LIMIT} commits")
+                parent_sha = None
+
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            message = f"State update: {timestamp}"
+
+            if parent_sha is None:
+                # Orphan commit: write the full tree in one fast-import stream,
+                # carrying over untouched entries by their existing blob SHA
+                kept = {
+                    relpath: blob_sha for relpath, blob_sha in previous.items()
+                    if relpath not in files and relpath not in removed
+                }
+                self._fast_import_commit(message, files, existing=kept)
+            elif len(changed) >= FAST_IMPORT_MIN_CHANGES:
+                # Bulk rewrite: one fast-import instead of a hash-object per file
+                self._fast_import_commit(
+                    message, {relpath: files[relpath] for relpath in changed},
+                    parent_sha=parent_sha, removed=removed
+                )
+            else:
+                self._commit_changes(message, files, changed, removed, parent_sha, hash_algo)
 
-                print(f"[GitState] Exported state to {STATE_REF} ({len(tasks)} tasks)")
-                return True
+            print(f"[GitState] Exported state to {STATE_REF} ({len(tasks)} tasks)")
+            return True
 
         except subprocess.CalledProcessError as e:
             print(f"[GitState] Error exporting state: {e}")
@@ -345,6 +435,95 @@ This is a **hidden ref** - not a regular branch. It:
             traceback.print_exc()
             return False
 
+    def _commit_changes(self, message: str, files: Dict[str, bytes], changed: List[str],
+                        removed: Iterable[str], parent_sha: str, hash_algo: str) -> None:
+        """
+        Commit a small change set on top of parent_sha.
+
+        Seeds a temp index with the parent tree so unchanged entries (and their
+        cached subtrees) are reused by write-tree, then hashes only the changed
+        blobs.
+        """
+        index_info = []
+        for relpath in changed:
+            result = self._run_git("hash-object", "-w", "--stdin", input_data=files[relpath])
+            blob_sha = result.stdout.strip().decode("ascii")
+            index_info.append(f"100644 {blob_sha}\t{relpath}")
+
+        # Mode 0 removes the entry (e.g. a spec that was deleted)
+        null_sha = "0" * (64 if hash_algo == "sha256" else 40)
+        for relpath in removed:
+            index_info.append(f"0 {null_sha}\t{relpath}")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env = os.environ.copy()
+            env["GIT_INDEX_FILE"] = str(Path(tmpdir) / "temp_index")
+
+            subprocess.run(
+                ["git", "-C", str(self.project_path), "read-tree", parent_sha],
+                env=env, capture_output=True, check=True
+            )
+            subprocess.run(
+                ["git", "-C", str(self.project_path), "update-index", "-z", "--index-info"],
+                input="".join(f"{line}\0" for line in index_info).encode("utf-8"),
+                env=env, capture_output=True, check=True
+            )
+
+            # Write tree
+            result = subprocess.run(
+                ["git", "-C", str(self.project_path), "write-tree"],
+                env=env, capture_output=True, check=True
+            )
+            tree_sha = result.stdout.strip().decode("ascii")
+
+        # Create commit
+        result = subprocess.run(
+            ["git", "-C", str(self.project_path), "commit-tree", tree_sha, "-p", parent_sha, "-m", message],
+            capture_output=True, check=True
+        )
+        commit_sha = result.stdout.strip().decode("ascii")
+
+        # Update branch ref
+        self._run_git("update-ref", STATE_REF, commit_sha)
+
+    def _fast_import_commit(self, message: str, files: Dict[str, bytes],
+                            parent_sha: Optional[str] = None, removed: Iterable[str] = (),
+                            existing: Optional[Dict[str, str]] = None) -> None:
+        """
+        Write blobs, tree, commit and ref update in a single `git fast-import`.
+
+        Args:
+            message: Commit message
+            files: relpath -> content. Without a parent this is the full tree;
+                with a parent only the changed files need to be given.
+            parent_sha: Parent commit, or None for an orphan commit
+            removed: Paths to delete from the parent tree
+            existing: relpath -> SHA of blobs already in the repo to include
+        """
+        ident = self._run_git("var", "GIT_COMMITTER_IDENT").stdout.strip()
+        msg = message.encode("utf-8")
+
+        stream = io.BytesIO()
+        # reset drops any implied parent so an orphan commit really has none
+        stream.write(f"reset {STATE_REF}\ncommit {STATE_REF}\n".encode("ascii"))
+        stream.write(b"committer %s\ndata %d\n%s\n" % (ident, len(msg), msg))
+        if parent_sha:
+            stream.write(f"from {parent_sha}\n".encode("ascii"))
+        else:
+            stream.write(b"deleteall\n")
+        for relpath in removed:
+            stream.write(f"D {relpath}\n".encode("utf-8"))
+        for relpath, blob_sha in (existing or {}).items():
+            stream.write(f"M 100644 {blob_sha} {relpath}\n".encode("utf-8"))
+        for relpath, data in files.items():
+            stream.write(f"M 100644 inline {relpath}\n".encode("utf-8"))
+            stream.write(b"data %d\n%s\n" % (len(data), data))
+        stream.write(b"\n")
+
+        # --force: an orphan commit is not a fast-forward of the existing ref
+        self._run_git("fast-import", "--quiet", "--force", "--date-format=raw",
+                      input_data=stream.getvalue())
+
     def import_state(self) -> Optional[Dict[str, Any]]:
         """
         Import state from the git state ref.
@@ -367,39 +546,40 @@ This is a **hidden ref** - not a regular branch. It:
                 print(f"[GitState] No tasks.json in state ref")
                 return None
 
-            tasks_data = json.loads(result.stdout)
+            tasks_data = json_loads(result.stdout)
             tasks = tasks_data.get("tasks", [])
 
-            # Read specs by listing the specs directory
+            # Read specs: one ls-tree for the listing, one cat-file for all blobs
             specs = {}
-            result = self._run_git("ls-tree", "-r", "--name-only", STATE_REF, check=False)
-            if result.returncode == 0:
-                for line in result.stdout.strip().split("\n"):
-                    if not line or not line.startswith(f"{STATE_DIR}/specs/"):
-                        continue
-
-                    # Parse: .auto-claude-state/specs/{spec_id}/{filename}
-                    parts = line.replace(f"{STATE_DIR}/specs/", "").split("/", 1)
-                    if len(parts) != 2:
-                        continue
-
-                    spec_id, filename = parts
-                    if spec_id == ".gitkeep" or filename == ".gitkeep":
-                        continue
-
-                    if spec_id not in specs:
-                        specs[spec_id] = {}
-
-                    # Read file content
-                    file_result = self._run_git("show", f"{STATE_REF}:{line}", check=False)
-                    if file_result.returncode == 0:
-                        content = file_result.stdout
-                        if filename.endswith(".json"):
-                            try:
-                                content = json.loads(content)
-                            except json.JSONDecodeError:
-                                pass
-                        specs[spec_id][filename] = content
+            specs_prefix = f"{STATE_DIR}/specs/"
+            entries = self._ls_tree(specs_prefix)
+            blobs = self._cat_file_batch([sha for _, sha in entries])
+            for path, blob_sha in entries:
+                # Parse: .auto-claude-state/specs/{spec_id}/{filename}
+                parts = path[len(specs_prefix):].split("/", 1)
+                if len(parts) != 2:
+                    continue
+
+                spec_id, filename = parts
+                if spec_id == ".gitkeep" or filename == ".gitkeep":
+                    continue
+
+                if blob_sha not in blobs:
+                    continue
+
+                if spec_id not in specs:
+                    specs[spec_id] = {}
+
+                raw = blobs[blob_sha]
+                content = None
+                if filename.endswith(".json"):
+                    try:
+                        content = json_loads(raw)
+                    except json.JSONDecodeError:
+                        pass
+                if content is None:
+                    content = raw.decode("utf-8", errors="replace")
+                specs[spec_id][filename] = content
 
             # Read project-level data
             project_data = {}
@@ -408,7 +588,7 @@ This is a **hidden ref** - not a regular branch. It:
             result = self._run_git("show", f"{STATE_REF}:{STATE_DIR}/claude_settings.json", check=False)
             if result.returncode == 0:
                 try:
-                    project_data["claudeSettings"] = json.loads(result.stdout)
+                    project_data["claudeSettings"] = json_loads(result.stdout)
                 except json.JSONDecodeError:
                     pass
 
@@ -416,7 +596,7 @@ This is a **hidden ref** - not a regular branch. It:
             result = self._run_git("show", f"{STATE_REF}:{STATE_DIR}/project_index.json", check=False)
             if result.returncode == 0:
                 try:
-                    project_data["projectIndex"] = json.loads(result.stdout)
+                    project_data["projectIndex"] = json_loads(result.stdout)
                 except json.JSONDecodeError:
                     pass
 
@@ -424,7 +604,7 @@ This is a **hidden ref** - not a regular branch. It:
             result = self._run_git("show", f"{STATE_REF}:{STATE_DIR}/insights_sessions.json", check=False)
             if result.returncode == 0:
                 try:
-                    project_data["insightsSessions"] = json.loads(result.stdout)
+                    project_data["insightsSessions"] = json_loads(result.stdout)
                 except json.JSONDecodeError:
                     pass
 
@@ -432,7 +612,7 @@ This is a **hidden ref** - not a regular branch. It:
             result = self._run_git("show", f"{STATE_REF}:{STATE_DIR}/file_timelines.json", check=False)
             if result.returncode == 0:
                 try:
-                    project_data["fileTimelines"] = json.loads(result.stdout)
+                    project_data["fileTimelines"] = json_loads(result.stdout)
                 except json.JSONDecodeError:
                     pass
 
@@ -452,8 +632,9 @@ This is a **hidden ref** - not a regular branch. It:
             return False
 
         try:
-            # Push hidden ref to same location on remote
-            self._run_git("push", remote, f"{STATE_REF}:{STATE_REF}", "--force")
+            # Push hidden ref to same location on remote. Skip local pre-push
+            # hooks (the state ref is not user code) and push atomically
+            self._run_git("push", "--no-verify", "--atomic", remote, f"{STATE_REF}:{STATE_REF}", "--force")
             print(f"[GitState] Pushed state ref to {remote}")
             return True
         except subprocess.CalledProcessError as e:
@@ -472,23 +653,15 @@ This is a **hidden ref** - not a regular branch. It:
             return False
 
 
-def collect_spec_data_from_db(spec_id: str) -> Dict[str, Any]:
-    """
-    Collect spec data from database for export.
+def _invalidate_spec_cache(spec_id: str) -> None:
+    _spec_cache.pop(spec_id, None)
 
-    Args:
-        spec_id: Spec ID to collect
 
-    Returns:
-        Dictionary of filename -> content for git state export
-    """
-    from .database import SpecService
+register_spec_write_hook(_invalidate_spec_cache)
 
-    spec = SpecService.get_by_id(spec_id, include_logs=False)
-    if not spec:
-        return {}
 
-    # Map database fields to filenames for state branch
+def _spec_to_export_data(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Map database spec fields to filenames for the state ref."""
     spec_data = {}
 
     if spec.get("specMarkdown"):
@@ -513,6 +686,34 @@ def collect_spec_data_from_db(spec_id: str) -> Dict[str, Any]:
     return spec_data
 
 
+def collect_spec_data_from_db(spec_id: str) -> Dict[str, Any]:
+    """
+    Collect spec data from database for export.
+
+    Results are cached for _SPEC_CACHE_TTL_SECONDS; any SpecService write
+    to the spec drops its entry.
+
+    Args:
+        spec_id: Spec ID to collect
+
+    Returns:
+        Dictionary of filename -> content for git state export
+    """
+    cached = _spec_cache.get(spec_id)
+    if cached and time.monotonic() - cached[0] < _SPEC_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    from .database import SpecService
+
+    spec = SpecService.get_by_id(spec_id, include_logs=False)
+    if not spec:
+        return {}
+
+    spec_data = _spec_to_export_data(spec)
+    _spec_cache[spec_id] = (time.monotonic(), spec_data)
+    return spec_data
+
+
 def restore_spec_data_to_db(spec_id: str, spec_data: Dict[str, Any]) -> bool:
     """
     Restore spec data from git state to database.
@@ -546,7 +747,9 @@ def restore_spec_data_to_db(spec_id: str, spec_data: Dict[str, Any]) -> bool:
             db_data[field_name] = spec_data[filename]
 
     try:
-        SpecService.upsert(spec_id, db_data)
+        spec = SpecService.upsert(spec_id, db_data)
+        # Prime the export cache: a restore is usually followed by an export
+        _spec_cache[spec_id] = (time.monotonic(), _spec_to_export_data(spec))
         return True
     except Exception as e:
         print(f"[GitState] Error restoring spec {spec_id} to DB: {e}")
@@ -569,9 +772,11 @@ def restore_project_data_to_db(project_id: str, project_data: Dict[str, Any]) ->
         True if restore successful
     """
     from .database import ProjectService
+    from .insights_handler import forget_project_sessions
 
     try:
         updates = {}
+        restored = False
 
         # Restore claude settings
         if project_data.get("claudeSettings"):
@@ -585,9 +790,13 @@ def restore_project_data_to_db(project_id: str, project_data: Dict[str, Any]) ->
         if project_data.get("projectIndex"):
             updates["projectIndex"] = project_data["projectIndex"]
 
-        # Restore insights sessions
+        # Restore insights sessions into the sessions table (the legacy
+        # column is only read when the table has none for the project)
         if project_data.get("insightsSessions"):
-            updates["insightsSessions"] = project_data["insightsSessions"]
+            restored = ProjectService.save_insights_sessions(
+                project_id, project_data["insightsSessions"]
+            )
+            forget_project_sessions(project_id)
 
         # Restore file timelines
         if project_data.get("fileTimelines"):
@@ -595,10 +804,11 @@ def restore_project_data_to_db(project_id: str, project_data: Dict[str, Any]) ->
 
         if updates:
             ProjectService.update(project_id, updates)
-            print(f"[GitState] Restored project data for {project_id}")
-            return True
+            restored = True
 
-        return False
+        if restored:
+            print(f"[GitState] Restored project data for {project_id}")
+        return restored
     except Exception as e:
         print(f"[GitState] Error restoring project data: {e}")
         return False
@@ -671,7 +881,7 @@ def migrate_claude_settings_file(project_path: str, project_id: str) -> bool:
         return False
 
     try:
-        settings = json.loads(settings_file.read_text())
+        settings = json_loads(settings_file.read_bytes())
         if save_claude_settings(project_id, settings):
             print(f"[GitState] Migrated claude settings for project {project_id}")
             return True
@@ -700,6 +910,7 @@ def collect_spec_data(project_path: Path, spec_id: str) -> Dict[str, Any]:
         spec_dir = project_path / ".worktrees" / spec_id / ".auto-claude" / "specs" / spec_id
 
     if not spec_dir.exists():
+        _spec_file_cache.pop(str(spec_dir), None)
         return spec_data
 
     files_to_collect = [
@@ -711,17 +922,31 @@ def collect_spec_data(project_path: Path, spec_id: str) -> Dict[str, Any]:
         "context.json"
     ]
 
+    # Stats are much cheaper than reading and parsing the files again
+    signature = []
     for filename in files_to_collect:
+        try:
+            st = (spec_dir / filename).stat()
+        except OSError:
+            continue
+        signature.append((filename, st.st_mtime_ns, st.st_size))
+    signature = tuple(signature)
+
+    cached = _spec_file_cache.get(str(spec_dir))
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    for filename, _, _ in signature:
         filepath = spec_dir / filename
-        if filepath.exists():
-            try:
-                content = filepath.read_text()
-                if filename.endswith(".json"):
-                    content = json.loads(content)
-                spec_data[filename] = content
-            except Exception as e:
-                print(f"[GitState] Error reading {filepath}: {e}")
+        try:
+            content = filepath.read_text()
+            if filename.endswith(".json"):
+                content = json_loads(content)
+            spec_data[filename] = content
+        except Exception as e:
+            print(f"[GitState] Error reading {filepath}: {e}")
 
+    _spec_file_cache[str(spec_dir)] = (signature, spec_data)
     return spec_data
 
 
@@ -742,7 +967,7 @@ def restore_spec_data(project_path: Path, spec_id: str, spec_data: Dict[str, Any
         for filename, content in spec_data.items():
             filepath = spec_dir / filename
             if isinstance(content, dict):
-                filepath.write_text(json.dumps(content, indent=2))
+                filepath.write_bytes(json_dumps(content, indent=True, sort_keys=True))
             else:
                 filepath.write_text(str(content))
         return True
@@ -5,19 +5,50 @@ Manages GitHub CLI authentication for repository operations.
 Similar to Claude OAuth token management.
 """
 
-import subprocess
+import asyncio
 import os
+import re
+import shutil
+import time
 from pathlib import Path
 from typing import Optional
+
+import yaml
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from .github_client import GITHUB_HOST, GitHubAPIError, github_get, invalidate_token, ttl_cache
+
 router = APIRouter(prefix="/api/github", tags=["github"])
 
+# Seconds cached results stay fresh (login/logout clear them)
+ACCOUNT_TTL = 300
+
 # GitHub CLI config location
 GH_CONFIG_DIR = Path("/root/.config/gh")
 GH_HOSTS_FILE = GH_CONFIG_DIR / "hosts.yml"
 
+# gh binary resolved once, and the environment every gh call runs with:
+# only what gh needs, built once instead of copying os.environ per call
+_GH_PATH = shutil.which("gh") or "gh"
+_GH_ENV = {
+    "PATH": os.environ.get("PATH", ""),
+    "HOME": os.environ.get("HOME", ""),
+    "GH_CONFIG_DIR": str(GH_CONFIG_DIR),
+    **{
+        name: os.environ[name]
+        for name in ("GH_TOKEN", "GITHUB_TOKEN", "HTTPS_PROXY", "HTTP_PROXY", "NO_PROXY", "SSL_CERT_FILE")
+        if name in os.environ
+    },
+}
+
+# Username in `gh auth status` output, e.g.
+# "✓ Logged in to github.com account octocat (keyring)"
+_AUTH_USER_RE = re.compile(r'Logged in to github\.com account ([^\s(]+)')
+
+# github.com auth parsed from hosts.yml, re-read when the file changes
+_auth_state: dict = {"authenticated": False, "token": None, "user": None, "loaded_at": None, "mtime": None}
+
 class GitHubTokenRequest(BaseModel):
     token: str
 
@@ -26,26 +57,102 @@ class GitHubAuthStatus(BaseModel):
     username: Optional[str] = None
     scopes: Optional[list] = None
 
-def run_gh_command(args: list[str]) -> tuple[str, str, int]:
+def parse_gh_user(output: str) -> Optional[str]:
+    """Extract the github.com username from `gh auth status` output."""
+    match = _AUTH_USER_RE.search(output)
+    return match.group(1) if match else None
+
+def _hosts_mtime() -> Optional[float]:
+    try:
+        return GH_HOSTS_FILE.stat().st_mtime
+    except OSError:
+        return None
+
+def _load_auth_state() -> dict:
+    """Parse gh's hosts.yml into _auth_state."""
+    mtime = _hosts_mtime()
+    try:
+        hosts = yaml.safe_load(GH_HOSTS_FILE.read_text()) or {}
+    except (OSError, yaml.YAMLError):
+        hosts = {}
+
+    host = hosts.get(GITHUB_HOST) or {}
+    user = host.get("user")
+    # Multi-account layout keeps the token under users.<login>.oauth_token;
+    # with a keyring there is no token here at all, only the user
+    token = host.get("oauth_token") or ((host.get("users") or {}).get(user) or {}).get("oauth_token")
+    env_token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+
+    _auth_state.update(
+        authenticated=bool(user or token or env_token),
+        token=token,
+        user=user,
+        loaded_at=time.time(),
+        mtime=mtime
+    )
+    return _auth_state
+
+def get_auth_state() -> dict:
     """
-    Run a GitHub CLI command.
+    Get the github.com auth state without running `gh auth status`.
+
+    hosts.yml is only re-parsed when its mtime changes, so this is a stat()
+    call in the common case.
+    """
+    if _auth_state["loaded_at"] is None or _hosts_mtime() != _auth_state["mtime"]:
+        return _load_auth_state()
+    return _auth_state
+
+async def run_gh(args: list[str], input_data: Optional[str] = None, timeout: float = 30,
+                 cwd: Optional[str] = None) -> tuple[str, str, int]:
+    """
+    Run a GitHub CLI command without blocking the event loop.
 
     Args:
         args: Command arguments (e.g., ['auth', 'status'])
+        input_data: Optional text to write to the command's stdin
+        timeout: Seconds to wait before killing the process
+        cwd: Working directory for the command
 
     Returns:
         Tuple of (stdout, stderr, returncode)
+
+    Raises:
+        asyncio.TimeoutError: If the command did not finish in time
     """
+    process = await asyncio.create_subprocess_exec(
+        _GH_PATH, *args,
+        cwd=cwd,
+        stdin=asyncio.subprocess.PIPE if input_data is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=_GH_ENV
+    )
     try:
-        result = subprocess.run(
-            ['gh'] + args,
-            capture_output=True,
-            text=True,
-            timeout=30,
-            env={**os.environ, 'GH_CONFIG_DIR': str(GH_CONFIG_DIR)}
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(input_data.encode() if input_data is not None else None),
+            timeout
         )
-        return result.stdout, result.stderr, result.returncode
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return stdout.decode(), stderr.decode(), process.returncode
+
+async def run_gh_command(args: list[str], input_data: Optional[str] = None) -> tuple[str, str, int]:
+    """
+    Run a GitHub CLI command, mapping failures to HTTP errors.
+
+    Args:
+        args: Command arguments (e.g., ['auth', 'status'])
+        input_data: Optional text to write to the command's stdin
+
+    Returns:
+        Tuple of (stdout, stderr, returncode)
+    """
+    try:
+        return await run_gh(args, input_data=input_data)
+    except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="GitHub CLI command timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to run gh command: {str(e)}")
@@ -58,37 +165,15 @@ async def get_github_auth_status():
     Returns:
         Authentication status including username if authenticated
     """
-    stdout, stderr, returncode = run_gh_command(['auth', 'status'])
-
-    # gh auth status returns 0 if authenticated, 1 if not
-    if returncode == 0:
-        # Parse username from output
-        username = None
-        for line in stdout.split('\n'):
-            if 'Logged in to github.com account' in line:
-                # Format: "✓ Logged in to github.com account username (keyring)"
-                parts = line.split()
-                if 'account' in parts:
-                    idx = parts.index('account')
-                    if idx + 1 < len(parts):
-                        username = parts[idx + 1]
-                        break
+    state = get_auth_state()
 
-        return {
-            "success": True,
-            "data": {
-                "authenticated": True,
-                "username": username
-            }
-        }
-    else:
-        return {
-            "success": True,
-            "data": {
-                "authenticated": False,
-                "username": None
-            }
+    return {
+        "success": True,
+        "data": {
+            "authenticated": state["authenticated"],
+            "username": state["user"] if state["authenticated"] else None
         }
+    }
 
 @router.post("/auth/login")
 async def github_login_with_token(request: GitHubTokenRequest):
@@ -103,34 +188,19 @@ async def github_login_with_token(request: GitHubTokenRequest):
     """
     try:
         # Use gh auth login with token via stdin
-        process = subprocess.Popen(
-            ['gh', 'auth', 'login', '--with-token'],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            env={**os.environ, 'GH_CONFIG_DIR': str(GH_CONFIG_DIR)}
+        stdout, stderr, returncode = await run_gh(
+            ['auth', 'login', '--with-token'], input_data=request.token
         )
 
-        stdout, stderr = process.communicate(input=request.token, timeout=30)
-
-        if process.returncode != 0:
+        if returncode != 0:
             raise HTTPException(
                 status_code=400,
                 detail=f"GitHub authentication failed: {stderr or stdout}"
             )
 
-        # Get username after successful authentication
-        status_stdout, _, _ = run_gh_command(['auth', 'status'])
-        username = None
-        for line in status_stdout.split('\n'):
-            if 'Logged in to github.com account' in line:
-                parts = line.split()
-                if 'account' in parts:
-                    idx = parts.index('account')
-                    if idx + 1 < len(parts):
-                        username = parts[idx + 1]
-                        break
+        # gh now holds a new token
+        invalidate_token()
+        username = _load_auth_state()["user"]
 
         return {
             "success": True,
@@ -140,7 +210,7 @@ async def github_login_with_token(request: GitHubTokenRequest):
             }
         }
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="GitHub authentication timed out")
     except Exception as e:
         raise HTTPException(
@@ -156,7 +226,7 @@ async def github_logout():
     Returns:
         Success status
     """
-    stdout, stderr, returncode = run_gh_command(['auth', 'logout', '--hostname', 'github.com'])
+    stdout, stderr, returncode = await run_gh_command(['auth', 'logout', '--hostname', 'github.com'])
 
     if returncode != 0 and 'not logged in' not in stderr:
         raise HTTPException(
@@ -164,6 +234,9 @@ async def github_logout():
             detail=f"Failed to logout: {stderr or stdout}"
         )
 
+    invalidate_token()
+    _load_auth_state()
+
     return {
         "success": True,
         "data": {
@@ -172,6 +245,7 @@ async def github_logout():
     }
 
 @router.get("/user")
+@ttl_cache(ACCOUNT_TTL)
 async def get_github_user():
     """
     Get current authenticated GitHub user information.
@@ -179,85 +253,74 @@ async def get_github_user():
     Returns:
         User information from GitHub API
     """
-    # Check if authenticated first
-    _, _, returncode = run_gh_command(['auth', 'status'])
-    if returncode != 0:
-        raise HTTPException(status_code=401, detail="Not authenticated with GitHub")
-
-    # Get user info via gh api
-    stdout, stderr, returncode = run_gh_command(['api', 'user'])
-
-    if returncode != 0:
+    # Unauthenticated requests surface as a 401 from the API call itself
+    try:
+        user_data = await github_get("/user", conditional=True)
+    except GitHubAPIError as e:
+        if e.status_code == 401:
+            raise HTTPException(status_code=401, detail="Not authenticated with GitHub")
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to fetch user info: {stderr or stdout}"
+            detail=f"Failed to fetch user info: {e.message}"
         )
+    except ValueError:
+        raise HTTPException(status_code=500, detail="Failed to parse GitHub user data")
 
-    import json
-    try:
-        user_data = json.loads(stdout)
-        return {
-            "success": True,
-            "data": {
-                "login": user_data.get("login"),
-                "name": user_data.get("name"),
-                "email": user_data.get("email"),
-                "avatar_url": user_data.get("avatar_url"),
-                "bio": user_data.get("bio"),
-                "public_repos": user_data.get("public_repos"),
-                "followers": user_data.get("followers"),
-                "following": user_data.get("following")
-            }
+    return {
+        "success": True,
+        "data": {
+            "login": user_data.get("login"),
+            "name": user_data.get("name"),
+            "email": user_data.get("email"),
+            "avatar_url": user_data.get("avatar_url"),
+            "bio": user_data.get("bio"),
+            "public_repos": user_data.get("public_repos"),
+            "followers": user_data.get("followers"),
+            "following": user_data.get("following")
         }
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="Failed to parse GitHub user data")
+    }
 
 @router.get("/repos")
-async def list_github_repos(per_page: int = 30, page: int = 1):
+@ttl_cache(ACCOUNT_TTL)
+async def list_github_repos(per_page: int = 100, page: int = 1):
     """
     List repositories for the authenticated user.
 
     Args:
-        per_page: Number of repositories per page (default 30)
+        per_page: Number of repositories per page (default 100, GitHub's max)
         page: Page number (default 1)
 
     Returns:
         List of repositories
     """
-    # Check if authenticated first
-    _, _, returncode = run_gh_command(['auth', 'status'])
-    if returncode != 0:
-        raise HTTPException(status_code=401, detail="Not authenticated with GitHub")
-
-    # Get repos via gh api
-    stdout, stderr, returncode = run_gh_command([
-        'api',
-        f'user/repos?per_page={per_page}&page={page}&sort=updated'
-    ])
-
-    if returncode != 0:
+    # Unauthenticated requests surface as a 401 from the API call itself
+    try:
+        repos = await github_get(
+            "/user/repos", params={"per_page": per_page, "page": page, "sort": "updated"},
+            conditional=True
+        )
+    except GitHubAPIError as e:
+        if e.status_code == 401:
+            raise HTTPException(status_code=401, detail="Not authenticated with GitHub")
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to fetch repositories: {stderr or stdout}"
+            detail=f"Failed to fetch repositories: {e.message}"
         )
-
-    import json
-    try:
-        repos = json.loads(stdout)
-        return {
-            "success": True,
-            "data": [
-                {
-                    "name": repo.get("name"),
-                    "full_name": repo.get("full_name"),
-                    "description": repo.get("description"),
-                    "private": repo.get("private"),
-                    "url": repo.get("html_url"),
-                    "clone_url": repo.get("clone_url"),
-                    "updated_at": repo.get("updated_at")
-                }
-                for repo in repos
-            ]
-        }
-    except json.JSONDecodeError:
+    except ValueError:
         raise HTTPException(status_code=500, detail="Failed to parse GitHub repositories")
+
+    return {
+        "success": True,
+        "data": [
+            {
+                "name": repo.get("name"),
+                "full_name": repo.get("full_name"),
+                "description": repo.get("description"),
+                "private": repo.get("private"),
+                "url": repo.get("html_url"),
+                "clone_url": repo.get("clone_url"),
+                "updated_at": repo.get("updated_at")
+            }
+            for repo in repos
+        ]
+    }
@@ -0,0 +1,323 @@
+"""
+Direct GitHub REST/GraphQL client.
+
+Talks to api.github.com over one pooled httpx.AsyncClient instead of forking
+the gh CLI for every request. The OAuth token is the one gh stores after
+`gh auth login`, so the gh CLI is still the way users authenticate; it is
+just no longer in the request path.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from .json_codec import json_dumps, json_loads
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_HOST = "github.com"
+
+_client: Optional[httpx.AsyncClient] = None
+_token: Optional[str] = None
+_token_loaded = False
+
+# Longest we wait out a rate limit before failing the request instead
+MAX_RATE_LIMIT_WAIT = 60
+
+# Cached handler results: key -> (expires_at, result)
+_response_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+
+# Conditional GETs: (path, params) -> (ETag, decoded body)
+_etag_cache: Dict[Tuple[str, str], Tuple[str, Any]] = {}
+
+
+class _RateLimiter:
+    """
+    Async token bucket: at most `rate` requests per `period` seconds, with
+    bursts up to `rate`. Only used from the event loop, so no lock.
+    """
+
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+    def paused_for(self) -> float:
+        """Seconds left on a pause set by pause()."""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def pause(self, seconds: float):
+        """Hold every request for `seconds` (GitHub said the budget is spent)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+# GitHub's per-user budgets: REST core, GraphQL points, and search
+_core_limiter = _RateLimiter(5000, 3600)
+_graphql_limiter = _RateLimiter(5000, 3600)
+_search_limiter = _RateLimiter(30, 60)
+
+
+def _limiter_for(path: str) -> _RateLimiter:
+    if path == "/graphql":
+        return _graphql_limiter
+    if path.startswith("/search/"):
+        return _search_limiter
+    return _core_limiter
+
+
+def _rate_limit_wait(response: httpx.Response) -> Optional[float]:
+    """Seconds until GitHub's rate limit resets, if this response says it is spent."""
+    headers = response.headers
+    if response.status_code in (403, 429) and headers.get("Retry-After"):
+        try:
+            return float(headers["Retry-After"])
+        except ValueError:
+            return None
+    if headers.get("X-RateLimit-Remaining") == "0" and headers.get("X-RateLimit-Reset"):
+        try:
+            return max(0.0, float(headers["X-RateLimit-Reset"]) - time.time())
+        except ValueError:
+            return None
+    return None
+
+
+class GitHubAPIError(Exception):
+    """Raised when a GitHub API request fails."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+async def get_token() -> Optional[str]:
+    """
+    Get the GitHub token, loading it once per process (until invalidated).
+
+    Order: GH_TOKEN / GITHUB_TOKEN env vars, gh's hosts.yml, then
+    `gh auth token` (covers tokens gh keeps in a keyring).
+    """
+    global _token, _token_loaded
+    if _token_loaded:
+        return _token
+
+    # github_auth imports this module, so it can't be imported at the top
+    from .github_auth import get_auth_state, run_gh
+
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN") or get_auth_state()["token"]
+    if not token:
+        try:
+            stdout, _, returncode = await run_gh(["auth", "token"], timeout=10)
+            if returncode == 0:
+                token = stdout.strip() or None
+        except Exception:
+            token = None
+
+    # Only remember a found token, so a login done elsewhere (terminal,
+    # another endpoint) is picked up on the next call
+    _token = token
+    _token_loaded = token is not None
+    return _token
+
+
+def invalidate_token():
+    """
+    Forget the cached token (call after gh login/logout).
+
+    Cached responses belong to the old identity, so they are dropped too.
+    """
+    global _token, _token_loaded
+    _token = None
+    _token_loaded = False
+    clear_cache()
+
+
+def clear_cache():
+    """Drop every cached GitHub response."""
+    _response_cache.clear()
+    _etag_cache.clear()
+
+
+def ttl_cache(ttl: float, skip_args: int = 0) -> Callable:
+    """
+    Cache an async function's result for `ttl` seconds.
+
+    The key is the function name plus its arguments, so arguments must be
+    JSON-serializable. Falsy results (the handlers' "failed" values) and
+    exceptions are not cached.
+
+    Args:
+        ttl: Seconds a result stays fresh
+        skip_args: Leading positional args left out of the key (e.g. a
+            WebSocket handler's conn_id)
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (func.__qualname__, json_dumps([args[skip_args:], kwargs], sort_keys=True).decode())
+
+            entry = _response_cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+            result = await func(*args, **kwargs)
+            if result:
+                _response_cache[key] = (time.monotonic() + ttl, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=GITHUB_API_URL,
+            headers={
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=50),
+            timeout=30,
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared HTTP client (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def github_request(method: str, path: str, *, params: Optional[Dict[str, Any]] = None,
+                         json: Any = None, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    """
+    Send an authenticated request to the GitHub API.
+
+    Raises:
+        GitHubAPIError: If not authenticated or the response is 4xx/5xx
+    """
+    token = await get_token()
+    if not token:
+        raise GitHubAPIError(401, "Not authenticated with GitHub")
+
+    headers = {**(headers or {}), "Authorization": f"Bearer {token}"}
+    content = None
+    if json is not None:
+        content = json_dumps(json)
+        headers["Content-Type"] = "application/json"
+
+    limiter = _limiter_for(path)
+    if limiter.paused_for() > MAX_RATE_LIMIT_WAIT:
+        raise GitHubAPIError(429, "GitHub API rate limit exceeded")
+
+    for attempt in range(2):
+        await limiter.acquire()
+        try:
+            response = await _get_client().request(
+                method, path, params=params, content=content, headers=headers
+            )
+        except httpx.HTTPError as e:
+            raise GitHubAPIError(502, f"GitHub request failed: {e}")
+
+        wait = _rate_limit_wait(response)
+        if wait is None:
+            break
+        limiter.pause(wait)
+
+        # Retry once if the limit resets soon; otherwise report the 403/429
+        if response.status_code not in (403, 429) or attempt or wait > MAX_RATE_LIMIT_WAIT:
+            break
+        print(f"[GitHub] Rate limited on {path}, retrying in {wait:.0f}s")
+
+    if response.status_code >= 400:
+        try:
+            message = json_loads(response.content).get("message", response.text)
+        except ValueError:
+            message = response.text
+        raise GitHubAPIError(response.status_code, message)
+
+    return response
+
+
+async def github_get(path: str, params: Optional[Dict[str, Any]] = None,
+                     conditional: bool = False) -> Any:
+    """
+    GET a REST endpoint and return the decoded JSON body.
+
+    Args:
+        path: API path, e.g. "/user/repos"
+        params: Query parameters
+        conditional: Send If-None-Match with the last ETag for this URL and
+            reuse the previous body on 304 (which costs no rate limit). For
+            rarely-changing lists that are polled often
+    """
+    if not conditional:
+        response = await github_request("GET", path, params=params)
+        return json_loads(response.content)
+
+    key = (path, json_dumps(params or {}, sort_keys=True).decode())
+    cached = _etag_cache.get(key)
+    response = await github_request(
+        "GET", path, params=params,
+        headers={"If-None-Match": cached[0]} if cached else None
+    )
+    if response.status_code == 304 and cached:
+        return cached[1]
+
+    body = json_loads(response.content)
+    etag = response.headers.get("ETag")
+    if etag:
+        _etag_cache[key] = (etag, body)
+    return body
+
+
+async def github_post(path: str, json: Any) -> Any:
+    """POST to a REST endpoint and return the decoded JSON body."""
+    response = await github_request("POST", path, json=json)
+    return json_loads(response.content)
+
+
+async def github_graphql(query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run a GraphQL query and return its `data` object.
+
+    GraphQL reports per-field failures (e.g. a missing issue) in `errors`
+    alongside partial data, so errors only raise when no data came back.
+    """
+    response = await github_request("POST", "/graphql", json={"query": query, "variables": variables or {}})
+    body = json_loads(response.content)
+    if body.get("data") is None:
+        errors = body.get("errors") or [{}]
+        raise GitHubAPIError(response.status_code, errors[0].get("message", "GraphQL query failed"))
+    return body["data"]
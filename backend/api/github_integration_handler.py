@@ -5,40 +5,118 @@ Handles GitHub issues, repositories, and release operations.
 """
 
 import asyncio
-import json
+import configparser
 import os
-import subprocess
-from typing import Any, Dict, List, Optional
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .github_auth import get_auth_state
+from .github_client import (
+    GitHubAPIError, clear_cache, github_get, github_graphql, github_post, ttl_cache
+)
+
+# Seconds cached handler results stay fresh
+_ACCOUNT_CACHE_TTL = 300
+
+# owner/repo from git@github.com:owner/repo.git or https://github.com/owner/repo.git
+_REPO_RE = re.compile(r'github\.com[:/]([^/]+/[^/]+?)(?:\.git)?$')
+
+# Detected repo per project path: path -> (.git/config mtime, repo)
+_REPO_CACHE: Dict[str, Tuple[float, Optional[str]]] = {}
+
+# git options that authenticate https remotes with gh's login, which holds
+# even when `gh auth setup-git` was never run (e.g. after an in-app login)
+_GH_CREDENTIAL_ARGS = ["-c", "credential.helper=", "-c", "credential.helper=!gh auth git-credential"]
+
+# Issue listing: only the fields the issue list renders. The issues
+# connection excludes pull requests, and comments are a count rather than
+# the comment bodies
+_ISSUE_LIST_QUERY = """
+query($owner: String!, $name: String!, $states: [IssueState!], $labels: [String!], $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $after, states: $states, labels: $labels,
+           orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes {
+        number title body state url createdAt updatedAt
+        author { login }
+        labels(first: 20) { nodes { name } }
+        comments { totalCount }
+      }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
 
+# Repo picker: the three fields it shows for the user's own repos
+_OWNED_REPOS_QUERY = """
+query {
+  viewer {
+    repositories(first: 100, ownerAffiliations: [OWNER], orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes { nameWithOwner description isPrivate }
+    }
+  }
+}
+"""
 
-def register_github_integration_handlers(ws_manager, api_main):
-    """Register GitHub integration-related WebSocket handlers."""
+# getIssues "state" payload value -> GraphQL IssueState filter
+_ISSUE_STATES = {"open": ["OPEN"], "closed": ["CLOSED"], "all": None}
+
+# Max concurrent REST issue fetches during an import
+_ISSUE_FETCH_CONCURRENCY = 10
+
+# Issues per GraphQL query during an import (GraphQL node limit)
+_GRAPHQL_ISSUE_BATCH = 100
+
+
+class GitHubHandlers:
+    """GitHub integration WebSocket handlers, bound to one ws_manager/api_main."""
+
+    # WS action -> handler method name
+    _ROUTES = {
+        "github.getRepositories": "github_get_repositories",
+        "github.getIssues": "github_get_issues",
+        "github.getIssue": "github_get_issue",
+        "github.getIssueComments": "github_get_issue_comments",
+        "github.checkConnection": "github_check_connection",
+        "github.investigateIssue": "github_investigate_issue",
+        "github.importIssues": "github_import_issues",
+        "github.detectRepo": "github_detect_repo",
+        "github.getBranches": "github_get_branches",
+        "github.getUser": "github_get_user",
+        "github.listUserRepos": "github_list_user_repos",
+        "github.listOrgs": "github_list_orgs",
+        "github.createRepo": "github_create_repo",
+        "github.addRemote": "github_add_remote",
+        "github.createRelease": "github_create_release",
+        "github.clearCache": "github_clear_cache",
+    }
 
-    async def github_get_repositories(conn_id: str, payload: dict) -> List[dict]:
+    def __init__(self, ws_manager, api_main):
+        self.ws_manager = ws_manager
+        self.api_main = api_main
+
+    @ttl_cache(_ACCOUNT_CACHE_TTL, skip_args=2)
+    async def github_get_repositories(self, conn_id: str, payload: dict) -> List[dict]:
         """Get user's GitHub repositories."""
         try:
-            result = subprocess.run(
-                ["gh", "repo", "list", "--json", "name,nameWithOwner,description,isPrivate,url", "--limit", "100"],
-                capture_output=True,
-                text=True,
-                timeout=30
+            repos = await github_get(
+                "/user/repos", params={"affiliation": "owner", "sort": "updated", "per_page": 100},
+                conditional=True
             )
-
-            if result.returncode == 0:
-                repos = json.loads(result.stdout)
-                return [{
-                    "name": r.get("name"),
-                    "fullName": r.get("nameWithOwner"),
-                    "description": r.get("description"),
-                    "isPrivate": r.get("isPrivate"),
-                    "url": r.get("url")
-                } for r in repos]
+            return [{
+                "name": r.get("name"),
+                "fullName": r.get("full_name"),
+                "description": r.get("description"),
+                "isPrivate": r.get("private"),
+                "url": r.get("html_url")
+            } for r in repos]
         except Exception as e:
             print(f"[GitHub] Error listing repos: {e}")
 
         return []
 
-    async def github_get_issues(conn_id: str, payload: dict) -> List[dict]:
+    async def github_get_issues(self, conn_id: str, payload: dict) -> List[dict]:
         """Get issues for a repository."""
         project_id = payload.get("projectId")
         repo = payload.get("repo")
@@ -46,161 +124,119 @@ def register_github_integration_handlers(ws_manager, api_main):
         labels = payload.get("labels", [])
         limit = payload.get("limit", 50)
 
-        if not repo and project_id and project_id in api_main.projects:
+        if not repo and project_id and project_id in self.api_main.projects:
             # Try to detect repo from project
-            project = api_main.projects[project_id]
-            repo = _detect_repo_from_project(project.path)
+            project = self.api_main.projects[project_id]
+            repo = await _detect_repo_from_project(project.path)
 
         if not repo:
             return []
 
         try:
-            cmd = [
-                "gh", "issue", "list",
-                "--repo", repo,
-                "--state", state,
-                "--json", "number,title,body,state,labels,author,createdAt,updatedAt,url,comments",
-                "--limit", str(limit)
-            ]
-
-            if labels:
-                cmd.extend(["--label", ",".join(labels)])
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-            if result.returncode == 0:
-                issues = json.loads(result.stdout)
-                return [{
-                    "number": i.get("number"),
-                    "title": i.get("title"),
-                    "body": i.get("body"),
-                    "state": i.get("state"),
-                    "labels": [l.get("name") for l in i.get("labels", [])],
-                    "author": i.get("author", {}).get("login"),
-                    "createdAt": i.get("createdAt"),
-                    "updatedAt": i.get("updatedAt"),
-                    "url": i.get("url"),
-                    "commentCount": len(i.get("comments", []))
-                } for i in issues]
+            owner, _, name = repo.partition("/")
+            variables = {
+                "owner": owner,
+                "name": name,
+                "states": _ISSUE_STATES.get(state, ["OPEN"]),
+                "labels": labels or None,
+            }
+
+            issues = []
+            cursor = None
+            while len(issues) < limit:
+                data = await github_graphql(_ISSUE_LIST_QUERY, {
+                    **variables, "first": min(limit - len(issues), 100), "after": cursor
+                })
+                connection = (data.get("repository") or {}).get("issues") or {}
+                issues.extend(connection.get("nodes") or [])
+                page_info = connection.get("pageInfo") or {}
+                if not page_info.get("hasNextPage"):
+                    break
+                cursor = page_info.get("endCursor")
+
+            return [{
+                "number": i.get("number"),
+                "title": i.get("title"),
+                "body": i.get("body"),
+                "state": (i.get("state") or "").lower(),
+                "labels": [l.get("name") for l in (i.get("labels") or {}).get("nodes", [])],
+                "author": (i.get("author") or {}).get("login"),
+                "createdAt": i.get("createdAt"),
+                "updatedAt": i.get("updatedAt"),
+                "url": i.get("url"),
+                "commentCount": (i.get("comments") or {}).get("totalCount", 0)
+            } for i in issues[:limit]]
         except Exception as e:
             print(f"[GitHub] Error listing issues: {e}")
 
         return []
 
-    async def github_get_issue(conn_id: str, payload: dict) -> Optional[dict]:
+    async def github_get_issue(self, conn_id: str, payload: dict) -> Optional[dict]:
         """Get a single issue by number."""
         project_id = payload.get("projectId")
         repo = payload.get("repo")
         issue_number = payload.get("issueNumber")
 
-        if not repo and project_id and project_id in api_main.projects:
-            project = api_main.projects[project_id]
-            repo = _detect_repo_from_project(project.path)
+        if not repo and project_id and project_id in self.api_main.projects:
+            project = self.api_main.projects[project_id]
+            repo = await _detect_repo_from_project(project.path)
 
         if not repo or not issue_number:
             return None
 
         try:
-            result = subprocess.run(
-                [
-                    "gh", "issue", "view", str(issue_number),
-                    "--repo", repo,
-                    "--json", "number,title,body,state,labels,author,createdAt,updatedAt,url,comments"
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30
+            i, comments = await asyncio.gather(
+                github_get(f"/repos/{repo}/issues/{issue_number}"),
+                _get_issue_comments(repo, issue_number)
             )
-
-            if result.returncode == 0:
-                i = json.loads(result.stdout)
-                return {
-                    "number": i.get("number"),
-                    "title": i.get("title"),
-                    "body": i.get("body"),
-                    "state": i.get("state"),
-                    "labels": [l.get("name") for l in i.get("labels", [])],
-                    "author": i.get("author", {}).get("login"),
-                    "createdAt": i.get("createdAt"),
-                    "updatedAt": i.get("updatedAt"),
-                    "url": i.get("url"),
-                    "comments": [{
-                        "author": c.get("author", {}).get("login"),
-                        "body": c.get("body"),
-                        "createdAt": c.get("createdAt")
-                    } for c in i.get("comments", [])]
-                }
+            return {
+                **_issue_summary(i),
+                "comments": comments
+            }
         except Exception as e:
             print(f"[GitHub] Error getting issue: {e}")
 
         return None
 
-    async def github_get_issue_comments(conn_id: str, payload: dict) -> List[dict]:
+    async def github_get_issue_comments(self, conn_id: str, payload: dict) -> List[dict]:
         """Get comments for an issue."""
         project_id = payload.get("projectId")
         repo = payload.get("repo")
         issue_number = payload.get("issueNumber")
 
-        if not repo and project_id and project_id in api_main.projects:
-            project = api_main.projects[project_id]
-            repo = _detect_repo_from_project(project.path)
+        if not repo and project_id and project_id in self.api_main.projects:
+            project = self.api_main.projects[project_id]
+            repo = await _detect_repo_from_project(project.path)
 
         if not repo or not issue_number:
             return []
 
         try:
-            result = subprocess.run(
-                [
-                    "gh", "issue", "view", str(issue_number),
-                    "--repo", repo,
-                    "--json", "comments"
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                return [{
-                    "author": c.get("author", {}).get("login"),
-                    "body": c.get("body"),
-                    "createdAt": c.get("createdAt")
-                } for c in data.get("comments", [])]
+            return await _get_issue_comments(repo, issue_number)
         except Exception as e:
             print(f"[GitHub] Error getting comments: {e}")
 
         return []
 
-    async def github_check_connection(conn_id: str, payload: dict) -> dict:
+    async def github_check_connection(self, conn_id: str, payload: dict) -> dict:
         """Check GitHub connection status."""
-        try:
-            result = subprocess.run(
-                ["gh", "auth", "status"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if result.returncode == 0:
-                return {"connected": True}
-            return {"connected": False, "error": "Not authenticated"}
-        except Exception as e:
-            return {"connected": False, "error": str(e)}
+        if get_auth_state()["authenticated"]:
+            return {"connected": True}
+        return {"connected": False, "error": "Not authenticated"}
 
-    async def github_investigate_issue(conn_id: str, payload: dict) -> dict:
+    async def github_investigate_issue(self, conn_id: str, payload: dict) -> dict:
         """Investigate a GitHub issue using AI."""
         project_id = payload.get("projectId")
         repo = payload.get("repo")
         issue_number = payload.get("issueNumber")
 
-        if not project_id or project_id not in api_main.projects:
+        if not project_id or project_id not in self.api_main.projects:
             return {"success": False, "error": "Project not found"}
 
-        project = api_main.projects[project_id]
+        project = self.api_main.projects[project_id]
 
         if not repo:
-            repo = _detect_repo_from_project(project.path)
+            repo = await _detect_repo_from_project(project.path)
 
         if not repo or not issue_number:
             return {"success": False, "error": "Repository or issue number not specified"}
@@ -208,68 +244,75 @@ def register_github_integration_handlers(ws_manager, api_main):
         # Start async investigation
         asyncio.create_task(
             _run_issue_investigation(
-                ws_manager, conn_id, project_id, project.path, repo, issue_number
+                self.ws_manager, conn_id, project_id, project.path, repo, issue_number
             )
         )
 
         return {"success": True, "message": "Investigation started"}
 
-    async def github_import_issues(conn_id: str, payload: dict) -> dict:
+    async def github_import_issues(self, conn_id: str, payload: dict) -> dict:
         """Import GitHub issues as tasks."""
         project_id = payload.get("projectId")
         issue_numbers = payload.get("issueNumbers", [])
         repo = payload.get("repo")
 
-        if not project_id or project_id not in api_main.projects:
+        if not project_id or project_id not in self.api_main.projects:
             return {"success": False, "error": "Project not found"}
 
-        project = api_main.projects[project_id]
+        project = self.api_main.projects[project_id]
 
         if not repo:
-            repo = _detect_repo_from_project(project.path)
+            repo = await _detect_repo_from_project(project.path)
 
         if not repo:
             return {"success": False, "error": "Repository not found"}
 
-        imported = []
-        failed = []
+        # Issues the GraphQL batch could not return are fetched over REST,
+        # concurrently but capped to respect GitHub's secondary rate limits
+        semaphore = asyncio.Semaphore(_ISSUE_FETCH_CONCURRENCY)
 
-        for issue_num in issue_numbers:
-            try:
-                # Get issue details
-                result = subprocess.run(
-                    [
-                        "gh", "issue", "view", str(issue_num),
-                        "--repo", repo,
-                        "--json", "title,body"
-                    ],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
+        async def fetch_issue(issue_num) -> dict:
+            async with semaphore:
+                return await github_get(f"/repos/{repo}/issues/{issue_num}")
+
+        async def create_issue_task(issue_num, issue: dict) -> bool:
+            task_request = self.api_main.TaskCreateRequest(
+                projectId=project_id,
+                title=f"[#{issue_num}] {issue.get('title', '')}",
+                description=issue.get("body") or ""
+            )
+            task_result = await self.api_main.create_task(task_request)
+            return "task" in task_result
 
-                if result.returncode == 0:
-                    issue = json.loads(result.stdout)
+        imported = []
+        failed = []
 
-                    # Create task
-                    from .main import TaskCreateRequest
+        batched = await _fetch_issues_graphql(repo, issue_numbers)
+        missing = [n for n in issue_numbers if n not in batched]
+        fallback = await asyncio.gather(
+            *[fetch_issue(n) for n in missing], return_exceptions=True
+        )
+        batched.update(zip(missing, fallback))
 
-                    task_request = TaskCreateRequest(
-                        projectId=project_id,
-                        title=f"[#{issue_num}] {issue.get('title', '')}",
-                        description=issue.get("body", "")
-                    )
+        to_create = []
+        for issue_num in issue_numbers:
+            issue = batched[issue_num]
+            if isinstance(issue, Exception):
+                print(f"[GitHub] Error importing issue {issue_num}: {issue}")
+                failed.append(issue_num)
+            else:
+                to_create.append((issue_num, issue))
 
-                    task_result = await api_main.create_task(task_request)
+        created = await asyncio.gather(
+            *[create_issue_task(n, issue) for n, issue in to_create], return_exceptions=True
+        )
 
-                    if "task" in task_result:
-                        imported.append(issue_num)
-                    else:
-                        failed.append(issue_num)
-                else:
-                    failed.append(issue_num)
-            except Exception as e:
-                print(f"[GitHub] Error importing issue {issue_num}: {e}")
+        for (issue_num, _), result in zip(to_create, created):
+            if result is True:
+                imported.append(issue_num)
+            else:
+                if isinstance(result, Exception):
+                    print(f"[GitHub] Error importing issue {issue_num}: {result}")
                 failed.append(issue_num)
 
         return {
@@ -278,90 +321,69 @@ def register_github_integration_handlers(ws_manager, api_main):
             "failed": failed
         }
 
-    async def github_detect_repo(conn_id: str, payload: dict) -> Optional[str]:
+    async def github_detect_repo(self, conn_id: str, payload: dict) -> Optional[str]:
         """Detect the GitHub repository for a project."""
         project_id = payload.get("projectId")
 
-        if not project_id or project_id not in api_main.projects:
+        if not project_id or project_id not in self.api_main.projects:
             return None
 
-        project = api_main.projects[project_id]
-        return _detect_repo_from_project(project.path)
+        project = self.api_main.projects[project_id]
+        return await _detect_repo_from_project(project.path)
 
-    async def github_get_branches(conn_id: str, payload: dict) -> List[str]:
+    @ttl_cache(_ACCOUNT_CACHE_TTL, skip_args=2)
+    async def github_get_branches(self, conn_id: str, payload: dict) -> List[str]:
         """Get branches for a repository."""
         project_id = payload.get("projectId")
         repo = payload.get("repo")
 
-        if not repo and project_id and project_id in api_main.projects:
-            project = api_main.projects[project_id]
-            repo = _detect_repo_from_project(project.path)
+        if not repo and project_id and project_id in self.api_main.projects:
+            project = self.api_main.projects[project_id]
+            repo = await _detect_repo_from_project(project.path)
 
         if not repo:
             return []
 
         try:
-            result = subprocess.run(
-                ["gh", "api", f"repos/{repo}/branches", "--jq", ".[].name"],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode == 0:
-                return [b.strip() for b in result.stdout.strip().split("\n") if b.strip()]
+            branches = await github_get(f"/repos/{repo}/branches", params={"per_page": 100}, conditional=True)
+            return [b["name"] for b in branches]
         except Exception as e:
             print(f"[GitHub] Error getting branches: {e}")
 
         return []
 
-    async def github_get_user(conn_id: str, payload: dict) -> Optional[dict]:
+    @ttl_cache(_ACCOUNT_CACHE_TTL, skip_args=2)
+    async def github_get_user(self, conn_id: str, payload: dict) -> Optional[dict]:
         """Get current GitHub user."""
         try:
-            result = subprocess.run(
-                ["gh", "api", "user", "--jq", "{login: .login, name: .name, email: .email, avatarUrl: .avatar_url}"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if result.returncode == 0:
-                return json.loads(result.stdout)
+            user = await github_get("/user", conditional=True)
+            return {
+                "login": user.get("login"),
+                "name": user.get("name"),
+                "email": user.get("email"),
+                "avatarUrl": user.get("avatar_url")
+            }
         except Exception as e:
             print(f"[GitHub] Error getting user: {e}")
 
         return None
 
-    async def github_list_user_repos(conn_id: str, payload: dict) -> dict:
+    async def github_list_user_repos(self, conn_id: str, payload: dict) -> dict:
         """List user's repositories."""
-        repos = await github_get_repositories(conn_id, payload)
-        return {
-            "repos": [{
-                "fullName": r.get("fullName"),
-                "description": r.get("description"),
-                "isPrivate": r.get("isPrivate")
-            } for r in repos]
-        }
+        return {"repos": await _list_owned_repos()}
 
-    async def github_list_orgs(conn_id: str, payload: dict) -> dict:
+    @ttl_cache(_ACCOUNT_CACHE_TTL, skip_args=2)
+    async def github_list_orgs(self, conn_id: str, payload: dict) -> dict:
         """List user's organizations."""
         try:
-            result = subprocess.run(
-                ["gh", "api", "user/orgs", "--jq", "[.[] | {login: .login, avatarUrl: .avatar_url}]"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if result.returncode == 0:
-                orgs = json.loads(result.stdout)
-                return {"orgs": orgs}
+            orgs = await github_get("/user/orgs", params={"per_page": 100}, conditional=True)
+            return {"orgs": [{"login": o.get("login"), "avatarUrl": o.get("avatar_url")} for o in orgs]}
         except Exception as e:
             print(f"[GitHub] Error getting orgs: {e}")
 
         return {"orgs": []}
 
-    async def github_create_repo(conn_id: str, payload: dict) -> dict:
+    async def github_create_repo(self, conn_id: str, payload: dict) -> dict:
         """Create a new GitHub repository."""
         repo_name = payload.get("repoName")
         description = payload.get("description", "")
@@ -372,38 +394,47 @@ def register_github_integration_handlers(ws_manager, api_main):
         if not repo_name:
             return {"success": False, "error": "Repository name required"}
 
-        try:
-            cmd = ["gh", "repo", "create"]
-
-            if owner:
-                cmd.append(f"{owner}/{repo_name}")
-            else:
-                cmd.append(repo_name)
-
-            if description:
-                cmd.extend(["--description", description])
+        # Like gh repo create --source, leave an existing origin alone
+        if project_path:
+            try:
+                if await _get_origin_url(project_path):
+                    return {"success": False, "error": "Remote origin already exists"}
+            except Exception as e:
+                return {"success": False, "error": str(e)}
 
-            if is_private:
-                cmd.append("--private")
-            else:
-                cmd.append("--public")
+        try:
+            repo = await github_post(f"/orgs/{owner}/repos" if owner else "/user/repos", {
+                "name": repo_name,
+                "description": description,
+                "private": bool(is_private)
+            })
+        except GitHubAPIError as e:
+            return {"success": False, "error": e.message}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
 
-            # If project path provided, add as source
-            if project_path:
-                cmd.extend(["--source", project_path, "--push"])
+        data = {"url": repo.get("html_url"), "fullName": repo.get("full_name")}
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+        # If project path provided, add the new repo as origin and push it
+        if project_path:
+            try:
+                _, stderr, returncode = await _run_git(
+                    ["remote", "add", "origin", repo.get("clone_url")], project_path
+                )
+                if returncode == 0:
+                    _REPO_CACHE.pop(project_path, None)
+                    _, stderr, returncode = await _run_git(
+                        [*_GH_CREDENTIAL_ARGS, "push", "--set-upstream", "origin", "HEAD"],
+                        project_path, timeout=120
+                    )
+                if returncode != 0:
+                    return {"success": False, "error": stderr, "data": data}
+            except Exception as e:
+                return {"success": False, "error": str(e), "data": data}
 
-            if result.returncode == 0:
-                # Parse repo URL from output
-                repo_url = result.stdout.strip()
-                return {"success": True, "data": {"url": repo_url}}
-            else:
-                return {"success": False, "error": result.stderr}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return {"success": True, "data": data}
 
-    async def github_add_remote(conn_id: str, payload: dict) -> dict:
+    async def github_add_remote(self, conn_id: str, payload: dict) -> dict:
         """Add a remote to a git repository."""
         project_path = payload.get("projectPath")
         repo_full_name = payload.get("repoFullName")
@@ -412,42 +443,16 @@ def register_github_integration_handlers(ws_manager, api_main):
             return {"success": False, "error": "Project path and repo required"}
 
         try:
-            # Check if origin already exists
-            result = subprocess.run(
-                ["git", "remote", "get-url", "origin"],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            stderr, returncode = await _set_origin(project_path, f"git@github.com:{repo_full_name}.git")
 
-            if result.returncode == 0:
-                # Update existing remote
-                result = subprocess.run(
-                    ["git", "remote", "set-url", "origin", f"git@github.com:{repo_full_name}.git"],
-                    cwd=project_path,
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-            else:
-                # Add new remote
-                result = subprocess.run(
-                    ["git", "remote", "add", "origin", f"git@github.com:{repo_full_name}.git"],
-                    cwd=project_path,
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-
-            if result.returncode == 0:
+            if returncode == 0:
                 return {"success": True}
             else:
-                return {"success": False, "error": result.stderr}
+                return {"success": False, "error": stderr}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    async def github_create_release(conn_id: str, payload: dict) -> dict:
+    async def github_create_release(self, conn_id: str, payload: dict) -> dict:
         """Create a GitHub release."""
         project_id = payload.get("projectId")
         version = payload.get("version")
@@ -455,92 +460,213 @@ def register_github_integration_handlers(ws_manager, api_main):
         draft = payload.get("draft", False)
         prerelease = payload.get("prerelease", False)
 
-        if not project_id or project_id not in api_main.projects:
+        if not project_id or project_id not in self.api_main.projects:
             return {"success": False, "error": "Project not found"}
 
-        project = api_main.projects[project_id]
-        repo = _detect_repo_from_project(project.path)
+        project = self.api_main.projects[project_id]
+        repo = await _detect_repo_from_project(project.path)
 
         if not repo:
             return {"success": False, "error": "Repository not found"}
 
         try:
-            cmd = [
-                "gh", "release", "create", f"v{version}",
-                "--repo", repo,
-                "--title", f"v{version}",
-                "--notes", notes or f"Release {version}"
-            ]
-
-            if draft:
-                cmd.append("--draft")
-            if prerelease:
-                cmd.append("--prerelease")
-
-            result = subprocess.run(
-                cmd,
-                cwd=project.path,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-
-            if result.returncode == 0:
-                return {"success": True, "data": {"url": result.stdout.strip()}}
-            else:
-                return {"success": False, "error": result.stderr}
+            release = await github_post(f"/repos/{repo}/releases", {
+                "tag_name": f"v{version}",
+                "name": f"v{version}",
+                "body": notes or f"Release {version}",
+                "draft": draft,
+                "prerelease": prerelease
+            })
+            return {"success": True, "data": {"url": release.get("html_url")}}
+        except GitHubAPIError as e:
+            return {"success": False, "error": e.message}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    # Register handlers
-    handlers = {
-        "github.getRepositories": github_get_repositories,
-        "github.getIssues": github_get_issues,
-        "github.getIssue": github_get_issue,
-        "github.getIssueComments": github_get_issue_comments,
-        "github.checkConnection": github_check_connection,
-        "github.investigateIssue": github_investigate_issue,
-        "github.importIssues": github_import_issues,
-        "github.detectRepo": github_detect_repo,
-        "github.getBranches": github_get_branches,
-        "github.getUser": github_get_user,
-        "github.listUserRepos": github_list_user_repos,
-        "github.listOrgs": github_list_orgs,
-        "github.createRepo": github_create_repo,
-        "github.addRemote": github_add_remote,
-        "github.createRelease": github_create_release,
+    async def github_clear_cache(self, conn_id: str, payload: dict) -> dict:
+        """Drop cached GitHub results so the next calls refetch."""
+        clear_cache()
+        return {"success": True}
+
+    def register(self) -> int:
+        """Register every route's bound method; returns the number registered."""
+        for action, name in self._ROUTES.items():
+            self.ws_manager.register_handler(action, getattr(self, name))
+        return len(self._ROUTES)
+
+
+def register_github_integration_handlers(ws_manager, api_main):
+    """Register GitHub integration-related WebSocket handlers."""
+    count = GitHubHandlers(ws_manager, api_main).register()
+    print(f"[GitHub Integration] Registered {count} handlers")
+
+
+def _issue_summary(i: dict) -> dict:
+    """Project a REST issue object onto the fields the frontend renders."""
+    return {
+        "number": i.get("number"),
+        "title": i.get("title"),
+        "body": i.get("body"),
+        "state": i.get("state"),
+        "labels": [l.get("name") for l in i.get("labels", [])],
+        "author": (i.get("user") or {}).get("login"),
+        "createdAt": i.get("created_at"),
+        "updatedAt": i.get("updated_at"),
+        "url": i.get("html_url")
     }
 
-    for action, handler in handlers.items():
-        ws_manager.register_handler(action, handler)
 
-    print(f"[GitHub Integration] Registered {len(handlers)} handlers")
+async def _get_issue_comments(repo: str, issue_number: int) -> List[dict]:
+    """Fetch an issue's comments."""
+    comments = await github_get(f"/repos/{repo}/issues/{issue_number}/comments", params={"per_page": 100})
+    return [{
+        "author": (c.get("user") or {}).get("login"),
+        "body": c.get("body"),
+        "createdAt": c.get("created_at")
+    } for c in comments]
 
 
-def _detect_repo_from_project(project_path: str) -> Optional[str]:
-    """Detect GitHub repo from project's git remote."""
+@ttl_cache(_ACCOUNT_CACHE_TTL)
+async def _list_owned_repos() -> List[dict]:
+    """List the user's own repos with only the fields the repo picker shows."""
     try:
-        result = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            cwd=project_path,
-            capture_output=True,
-            text=True,
-            timeout=10
+        data = await github_graphql(_OWNED_REPOS_QUERY)
+        nodes = ((data.get("viewer") or {}).get("repositories") or {}).get("nodes") or []
+        return [{
+            "fullName": r.get("nameWithOwner"),
+            "description": r.get("description"),
+            "isPrivate": r.get("isPrivate")
+        } for r in nodes]
+    except Exception as e:
+        print(f"[GitHub] Error listing repos: {e}")
+
+    return []
+
+
+async def _fetch_issues_graphql(repo: str, issue_numbers: List[Any]) -> Dict[Any, dict]:
+    """
+    Fetch issue titles and bodies by number with one GraphQL query per
+    batch, instead of one REST call per issue.
+
+    Returns {issue number: {"title", "body"}} for the issues found. Issues
+    that are missing, or whose batch failed, are left out for the caller
+    to retry individually.
+    """
+    owner, _, name = repo.partition("/")
+    found: Dict[Any, dict] = {}
+
+    for start in range(0, len(issue_numbers), _GRAPHQL_ISSUE_BATCH):
+        batch = issue_numbers[start:start + _GRAPHQL_ISSUE_BATCH]
+        fields = []
+        for idx, issue_num in enumerate(batch):
+            try:
+                fields.append(f"i{idx}: issue(number: {int(issue_num)}) {{ title body }}")
+            except (TypeError, ValueError):
+                continue
+
+        if not fields:
+            continue
+
+        query = (
+            "query($owner: String!, $name: String!) { "
+            "repository(owner: $owner, name: $name) { " + " ".join(fields) + " } }"
         )
+        try:
+            data = await github_graphql(query, {"owner": owner, "name": name})
+        except GitHubAPIError as e:
+            print(f"[GitHub] GraphQL issue batch failed, falling back to REST: {e}")
+            continue
+
+        repository = data.get("repository") or {}
+        for idx, issue_num in enumerate(batch):
+            issue = repository.get(f"i{idx}")
+            if issue:
+                found[issue_num] = issue
+
+    return found
+
+
+async def _run_git(args: List[str], cwd: str, timeout: float = 10) -> Tuple[str, str, int]:
+    """Run a git command in cwd without blocking the event loop."""
+    process = await asyncio.create_subprocess_exec(
+        "git", *args,
+        cwd=cwd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return stdout.decode(), stderr.decode(), process.returncode
+
+
+def _read_origin_url(project_path: str) -> Optional[str]:
+    """
+    Read remote.origin.url straight from .git/config.
+
+    Raises:
+        OSError, configparser.Error: If there is no readable .git/config
+            (e.g. a worktree, where .git is a file)
+    """
+    config = configparser.ConfigParser(strict=False, interpolation=None)
+    with open(os.path.join(project_path, ".git", "config"), encoding="utf-8") as f:
+        config.read_file(f)
+    return config.get('remote "origin"', "url", fallback=None)
+
+
+async def _get_origin_url(project_path: str) -> Optional[str]:
+    """Get the origin remote URL, asking git only if .git/config can't be read."""
+    try:
+        return _read_origin_url(project_path)
+    except (OSError, UnicodeDecodeError, configparser.Error):
+        stdout, _, returncode = await _run_git(["remote", "get-url", "origin"], project_path)
+        return stdout.strip() if returncode == 0 else None
+
+
+async def _set_origin(project_path: str, url: str) -> Tuple[str, int]:
+    """Point the origin remote at url, adding it if missing. Returns (stderr, returncode)."""
+    if await _get_origin_url(project_path):
+        _, stderr, returncode = await _run_git(["remote", "set-url", "origin", url], project_path)
+    else:
+        _, stderr, returncode = await _run_git(["remote", "add", "origin", url], project_path)
 
-        if result.returncode == 0:
-            url = result.stdout.strip()
-            # Parse repo from URL
-            # git@github.com:owner/repo.git
-            # https://github.com/owner/repo.git
-            import re
-            match = re.search(r'github\.com[:/]([^/]+/[^/]+?)(?:\.git)?$', url)
-            if match:
-                return match.group(1)
+    if returncode == 0:
+        _REPO_CACHE.pop(project_path, None)
+    return stderr, returncode
+
+
+async def _detect_repo_from_project(project_path: str) -> Optional[str]:
+    """
+    Detect GitHub repo from project's git remote.
+
+    Results are cached per path until the project's .git/config changes.
+    """
+    try:
+        mtime = os.stat(os.path.join(project_path, ".git", "config")).st_mtime
+    except OSError:
+        # No plain .git directory (e.g. a worktree); don't cache
+        mtime = None
+
+    cached = _REPO_CACHE.get(project_path)
+    if cached is not None and mtime is not None and cached[0] == mtime:
+        return cached[1]
+
+    repo = None
+    try:
+        url = await _get_origin_url(project_path)
+        match = _REPO_RE.search(url) if url else None
+        if match:
+            repo = match.group(1)
     except Exception:
-        pass
+        return None
 
-    return None
+    if mtime is not None:
+        _REPO_CACHE[project_path] = (mtime, repo)
+    return repo
 
 
 async def _run_issue_investigation(
@@ -554,25 +680,17 @@ async def _run_issue_investigation(
         })
 
         # Get issue details
-        result = subprocess.run(
-            [
-                "gh", "issue", "view", str(issue_number),
-                "--repo", repo,
-                "--json", "title,body,comments"
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        if result.returncode != 0:
+        try:
+            issue, comments = await asyncio.gather(
+                github_get(f"/repos/{repo}/issues/{issue_number}"),
+                _get_issue_comments(repo, issue_number)
+            )
+        except GitHubAPIError as e:
             await ws_manager.send_event(conn_id, f"github.{project_id}.investigationError", {
-                "error": f"Failed to fetch issue: {result.stderr}"
+                "error": f"Failed to fetch issue: {e.message}"
             })
             return
 
-        issue = json.loads(result.stdout)
-
         await ws_manager.send_event(conn_id, f"github.{project_id}.investigationProgress", {
             "stage": "analyzing",
             "message": "Analyzing issue context..."
@@ -585,7 +703,7 @@ async def _run_issue_investigation(
                 "number": issue_number,
                 "title": issue.get("title"),
                 "body": issue.get("body"),
-                "comments": issue.get("comments", [])
+                "comments": comments
             },
             "analysis": {
                 "summary": f"Issue #{issue_number}: {issue.get('title')}",
@@ -5,80 +5,348 @@ Handles AI-powered idea generation and management.
 """
 
 import asyncio
+import functools
 import json
 import os
-import uuid
+import secrets
+import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from .json_codec import json_dumps, json_loads
 
 # In-memory storage for ideation data (per-project)
 _ideation_store: Dict[str, dict] = {}
 
+# Per-project idea id -> position in ideation["ideas"], with the list it indexes
+_idea_index: Dict[str, Tuple[list, Dict[str, int]]] = {}
+
 # Active ideation processes
 _active_ideation: Dict[str, asyncio.subprocess.Process] = {}
 
+# Mutations are appended to an op log (ideation.log.jsonl) instead of
+# rewriting ideation.json; ops within this window share one append
+_SAVE_DEBOUNCE_SECONDS = 0.15
+
+# Rewrite the snapshot and clear the log once the log outgrows the snapshot by this factor
+_LOG_COMPACT_RATIO = 2
+
+# Per-project pending append timer and the (project_path, snapshot seq, ops) it will write
+_pending_saves: Dict[str, asyncio.TimerHandle] = {}
+_pending_ops: Dict[str, Tuple[str, int, List[dict]]] = {}
+
+# Bumped by every full snapshot save; pending ops older than it are already included
+_snapshot_seq: Dict[str, int] = {}
+
+# Serializes the disk writes of one project so they land in order
+_write_locks: Dict[str, asyncio.Lock] = {}
+
+# Keeps running flush tasks referenced until they finish
+_flush_tasks: set = set()
+
+# Caps how many ideation runners run at once across all projects; further
+# generations wait for a free slot
+_MAX_CONCURRENT_GENERATIONS = os.cpu_count() or 4
+_generation_slots = asyncio.Semaphore(_MAX_CONCURRENT_GENERATIONS)
+
+# Bytes per read from the ideation runner's stdout
+_STDOUT_CHUNK_SIZE = 65536
+
+# Runner stderr is drained alongside stdout so a chatty runner can't block
+# on a full pipe; only the first _STDERR_LIMIT bytes are kept for the log
+_STDERR_LIMIT = 1024 * 1024
+
+# Runner output markers look like b"__NAME__:payload"
+_MARK_START = b"__"
+_MARK_END = b"__:"
+
+# Streamed ideas are sent in one logBatch event per this many ideas or
+# this many seconds, whichever comes first
+_LOG_BATCH_SIZE = 16
+_LOG_BATCH_SECONDS = 0.05
+
 
 def _get_ideation_file(project_path: str) -> Path:
     """Get the path to the ideation file for a project."""
     return Path(project_path) / ".auto-claude" / "ideation.json"
 
 
-def _load_ideation(project_id: str, project_path: str) -> Optional[dict]:
-    """Load ideation from disk for a project."""
-    if project_id in _ideation_store:
-        return _ideation_store[project_id]
+def _get_ideation_log(project_path: str) -> Path:
+    """Get the path to the ideation op log for a project."""
+    return Path(project_path) / ".auto-claude" / "ideation.log.jsonl"
+
+
+def _replay_ops(ideation: dict, ops: List[dict]):
+    """
+    Apply logged ops to a snapshot.
+
+    Ops are idempotent, so replaying ones the snapshot already includes
+    (e.g. after a crash mid-compaction) is harmless:
+        {"op": "set", "ideaIds": [...], "fields": {...}, "updatedAt": ts}
+        {"op": "delete", "ideaIds": [...], "updatedAt": ts}
+    """
+    by_id = {idea.get("id"): idea for idea in ideation.get("ideas", [])}
+    for op in ops:
+        idea_ids = op.get("ideaIds") or []
+        if op.get("op") == "set":
+            for idea_id in idea_ids:
+                if idea_id in by_id:
+                    by_id[idea_id].update(op.get("fields") or {})
+        elif op.get("op") == "delete":
+            deleted = set(idea_ids)
+            ideation["ideas"] = [i for i in ideation.get("ideas", []) if i.get("id") not in deleted]
+            for idea_id in deleted:
+                by_id.pop(idea_id, None)
+
+        if op.get("updatedAt"):
+            ideation["updatedAt"] = op["updatedAt"]
+
 
+def _load_ideation_sync(project_path: str) -> Optional[dict]:
+    """Read ideation.json and replay the op log on top of it (blocking)."""
     ideation_file = _get_ideation_file(project_path)
-    if ideation_file.exists():
-        try:
-            with open(ideation_file) as f:
-                ideation = json.load(f)
-                _ideation_store[project_id] = ideation
-                return ideation
-        except Exception as e:
-            print(f"[Ideation] Error loading ideation: {e}")
+    if not ideation_file.exists():
+        return None
 
+    try:
+        ideation = json_loads(ideation_file.read_bytes())
+    except Exception as e:
+        print(f"[Ideation] Error loading ideation: {e}")
+        return None
+
+    log_file = _get_ideation_log(project_path)
+    if log_file.exists():
+        ops = []
+        for line in log_file.read_bytes().splitlines():
+            try:
+                ops.append(json_loads(line))
+            except json.JSONDecodeError:
+                # Torn final line from an interrupted append
+                continue
+        _replay_ops(ideation, ops)
+
+    return ideation
+
+
+async def _load_ideation(project_id: str, project_path: str) -> Optional[dict]:
+    """Load ideation for a project; disk reads run in a worker thread."""
+    if project_id in _ideation_store:
+        return _ideation_store[project_id]
+
+    ideation = await asyncio.to_thread(_load_ideation_sync, project_path)
+    if ideation is None:
+        return None
+    # A concurrent load may have won; keep the copy handlers already use
+    return _ideation_store.setdefault(project_id, ideation)
+
+
+def _find_idea(project_id: str, ideation: dict, idea_id: str) -> Optional[dict]:
+    """
+    Look up an idea by id in O(1).
+
+    The index is tied to the ideas list object, so replacing the list
+    (delete, reload, regeneration) rebuilds it on the next lookup.
+    """
+    ideas = ideation.get("ideas", [])
+    entry = _idea_index.get(project_id)
+    if entry is None or entry[0] is not ideas or len(entry[1]) != len(ideas):
+        entry = (ideas, {idea.get("id"): i for i, idea in enumerate(ideas)})
+        _idea_index[project_id] = entry
+
+    idx = entry[1].get(idea_id)
+    if idx is not None and ideas[idx].get("id") == idea_id:
+        return ideas[idx]
     return None
 
 
-def _save_ideation(project_id: str, project_path: str, ideation: dict):
-    """Save ideation to disk for a project."""
-    _ideation_store[project_id] = ideation
+def _write_ideation_file(project_path: str, data: bytes):
+    """
+    Write the ideation snapshot and drop the op log it now includes (blocking).
 
+    The snapshot goes to a temp file that replaces ideation.json, so a crash
+    mid-write leaves the previous snapshot (and its log) intact rather than
+    a truncated file that loads as "no ideation".
+    """
     ideation_file = _get_ideation_file(project_path)
     ideation_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=ideation_file.parent, prefix=".ideation_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, ideation_file)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    _get_ideation_log(project_path).unlink(missing_ok=True)
+
+
+def _append_ideation_log(project_path: str, data: bytes) -> Tuple[int, int]:
+    """Append op records to the log (blocking). Returns (log size, snapshot size)."""
+    log_file = _get_ideation_log(project_path)
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_file, "ab") as f:
+        f.write(data)
+
+    ideation_file = _get_ideation_file(project_path)
+    snapshot_size = ideation_file.stat().st_size if ideation_file.exists() else 0
+    return log_file.stat().st_size, snapshot_size
+
+
+async def _write_snapshot(project_id: str, project_path: str, seq: int):
+    """
+    Write the project's current ideation as a snapshot, in order per project.
+
+    Saves queue on the project's write lock. Once a save gets the lock it
+    checks whether a newer save was requested while it waited; if so it
+    skips, because that save will write the same in-memory ideation. A
+    burst of saves therefore costs one encode and one file write.
+    """
+    try:
+        async with _write_locks.setdefault(project_id, asyncio.Lock()):
+            if _snapshot_seq.get(project_id, 0) != seq:
+                return
+            ideation = _ideation_store.get(project_id)
+            if ideation is None:
+                return
+            # Serialize on the loop: handlers mutate the dict in place
+            data = json_dumps(ideation, indent=True, default=str)
+            await asyncio.to_thread(_write_ideation_file, project_path, data)
+    except Exception as e:
+        print(f"[Ideation] Error saving ideation: {e}")
+
+
+async def _save_ideation(project_id: str, project_path: str, ideation: dict):
+    """Save a full ideation snapshot to disk for a project."""
+    _ideation_store[project_id] = ideation
+
+    # The snapshot includes every pending op; drop them
+    handle = _pending_saves.pop(project_id, None)
+    if handle is not None:
+        handle.cancel()
+    _pending_ops.pop(project_id, None)
+    seq = _snapshot_seq[project_id] = _snapshot_seq.get(project_id, 0) + 1
+
+    await _write_snapshot(project_id, project_path, seq)
+
+
+def _schedule_save(project_id: str, project_path: str, ideation: dict, op: dict):
+    """
+    Record a mutation already applied to ideation, appending it to the op
+    log after a short delay so rapid mutations share one write.
+
+    The in-memory store is updated immediately, so reads see the change
+    before it reaches disk.
+    """
+    _ideation_store[project_id] = ideation
+
+    entry = _pending_ops.get(project_id)
+    if entry is None:
+        entry = (project_path, _snapshot_seq.get(project_id, 0), [])
+        _pending_ops[project_id] = entry
+    entry[2].append(op)
+
+    if project_id not in _pending_saves:
+        loop = asyncio.get_running_loop()
+        _pending_saves[project_id] = loop.call_later(
+            _SAVE_DEBOUNCE_SECONDS, _start_flush, project_id
+        )
+
+
+def _start_flush(project_id: str):
+    _pending_saves.pop(project_id, None)
+    task = asyncio.ensure_future(_flush_save(project_id))
+    _flush_tasks.add(task)
+    task.add_done_callback(_flush_tasks.discard)
+
+
+async def _flush_save(project_id: str):
+    """Append a project's pending ops to its log, compacting if it grew too large."""
+    entry = _pending_ops.pop(project_id, None)
+    if entry is None:
+        return
+    project_path, seq, ops = entry
 
     try:
-        with open(ideation_file, "w") as f:
-            json.dump(ideation, f, indent=2, default=str)
+        data = b"".join(json_dumps(op, default=str) + b"\n" for op in ops)
+        async with _write_locks.setdefault(project_id, asyncio.Lock()):
+            if _snapshot_seq.get(project_id, 0) != seq:
+                # A full snapshot taken since these ops were recorded has them
+                return
+
+            log_size, snapshot_size = await asyncio.to_thread(_append_ideation_log, project_path, data)
+            ideation = _ideation_store.get(project_id)
+            if ideation is not None and log_size > _LOG_COMPACT_RATIO * snapshot_size:
+                snapshot = json_dumps(ideation, indent=True, default=str)
+                await asyncio.to_thread(_write_ideation_file, project_path, snapshot)
     except Exception as e:
         print(f"[Ideation] Error saving ideation: {e}")
 
 
+async def flush_ideation_saves():
+    """Write every pending debounced save now (called on shutdown)."""
+    for project_id in list(_pending_saves):
+        _pending_saves.pop(project_id).cancel()
+
+    for project_id in list(_pending_ops):
+        await _flush_save(project_id)
+
+    if _flush_tasks:
+        await asyncio.gather(*_flush_tasks, return_exceptions=True)
+
+
 def register_ideation_handlers(ws_manager, api_main):
     """Register ideation-related WebSocket handlers."""
 
+    def requires_ideation(if_missing: dict):
+        """
+        Resolve the payload's project and its loaded ideation before calling
+        the handler as fn(conn_id, payload, project_id, project, ideation).
+
+        Returns "Project not found" for an unknown project and a copy of
+        `if_missing` when the project has no ideation yet.
+        """
+        def decorator(fn):
+            @functools.wraps(fn)
+            async def wrapper(conn_id: str, payload: dict) -> dict:
+                project_id = payload.get("projectId")
+                project = api_main.projects.get(project_id) if project_id else None
+                if project is None:
+                    return {"success": False, "error": "Project not found"}
+
+                ideation = await _load_ideation(project_id, project.path)
+                if not ideation:
+                    return dict(if_missing)
+
+                return await fn(conn_id, payload, project_id, project, ideation)
+
+            return wrapper
+
+        return decorator
+
+    no_ideation = {"success": False, "error": "Ideation data not found"}
+
     async def ideation_get(conn_id: str, payload: dict) -> Optional[dict]:
         """Get ideation data for a project."""
         project_id = payload.get("projectId")
-        if not project_id or project_id not in api_main.projects:
+        project = api_main.projects.get(project_id) if project_id else None
+        if project is None:
             return None
-
-        project = api_main.projects[project_id]
-        return _load_ideation(project_id, project.path)
+        return await _load_ideation(project_id, project.path)
 
     async def ideation_generate(conn_id: str, payload: dict) -> dict:
         """Generate ideas using AI analysis."""
         project_id = payload.get("projectId")
         idea_types = payload.get("ideaTypes", ["features", "improvements", "bugs"])
 
-        if not project_id or project_id not in api_main.projects:
+        project = api_main.projects.get(project_id) if project_id else None
+        if project is None:
             return {"success": False, "error": "Project not found"}
 
-        project = api_main.projects[project_id]
-
         # Start async ideation generation
         asyncio.create_task(
             _run_ideation_generation(
@@ -92,11 +360,10 @@ def register_ideation_handlers(ws_manager, api_main):
         """Refresh ideation by re-analyzing the codebase."""
         project_id = payload.get("projectId")
 
-        if not project_id or project_id not in api_main.projects:
+        project = api_main.projects.get(project_id) if project_id else None
+        if project is None:
             return {"success": False, "error": "Project not found"}
 
-        project = api_main.projects[project_id]
-
         # Clear cached ideation
         if project_id in _ideation_store:
             del _ideation_store[project_id]
@@ -123,57 +390,36 @@ def register_ideation_handlers(ws_manager, api_main):
 
         return {"success": True}
 
-    async def ideation_update_status(conn_id: str, payload: dict) -> dict:
+    @requires_ideation(no_ideation)
+    async def ideation_update_status(conn_id: str, payload: dict, project_id: str, project, ideation: dict) -> dict:
         """Update the status of an idea."""
-        project_id = payload.get("projectId")
         idea_id = payload.get("ideaId")
         status = payload.get("status")
 
-        if not project_id or project_id not in api_main.projects:
-            return {"success": False, "error": "Project not found"}
-
-        project = api_main.projects[project_id]
-        ideation = _load_ideation(project_id, project.path)
-
-        if not ideation:
-            return {"success": False, "error": "Ideation data not found"}
-
         # Find and update the idea
-        updated = False
-        for idea in ideation.get("ideas", []):
-            if idea.get("id") == idea_id:
-                idea["status"] = status
-                idea["updatedAt"] = datetime.now().isoformat()
-                updated = True
-                break
-
-        if updated:
-            ideation["updatedAt"] = datetime.now().isoformat()
-            _save_ideation(project_id, project.path, ideation)
+        idea = _find_idea(project_id, ideation, idea_id)
+        if idea:
+            if idea.get("status") == status:
+                return {"success": True}  # Already there; nothing to save
+            idea["status"] = status
+            now_iso = datetime.now().isoformat()
+            idea["updatedAt"] = now_iso
+            ideation["updatedAt"] = now_iso
+            _schedule_save(project_id, project.path, ideation, {
+                "op": "set", "ideaIds": [idea_id],
+                "fields": {"status": status, "updatedAt": now_iso}, "updatedAt": now_iso
+            })
             return {"success": True}
 
         return {"success": False, "error": "Idea not found"}
 
-    async def ideation_convert_to_task(conn_id: str, payload: dict) -> dict:
+    @requires_ideation(no_ideation)
+    async def ideation_convert_to_task(conn_id: str, payload: dict, project_id: str, project, ideation: dict) -> dict:
         """Convert an idea to a task."""
-        project_id = payload.get("projectId")
         idea_id = payload.get("ideaId")
 
-        if not project_id or project_id not in api_main.projects:
-            return {"success": False, "error": "Project not found"}
-
-        project = api_main.projects[project_id]
-        ideation = _load_ideation(project_id, project.path)
-
-        if not ideation:
-            return {"success": False, "error": "Ideation data not found"}
-
         # Find the idea
-        idea = None
-        for i in ideation.get("ideas", []):
-            if i.get("id") == idea_id:
-                idea = i
-                break
+        idea = _find_idea(project_id, ideation, idea_id)
 
         if not idea:
             return {"success": False, "error": "Idea not found"}
@@ -191,127 +437,114 @@ def register_ideation_handlers(ws_manager, api_main):
 
         if "task" in result:
             # Update idea status
-            idea["status"] = "converted"
-            idea["taskId"] = result["task"]["id"]
-            idea["updatedAt"] = datetime.now().isoformat()
-            _save_ideation(project_id, project.path, ideation)
+            fields = {
+                "status": "converted",
+                "taskId": result["task"]["id"],
+                "updatedAt": datetime.now().isoformat()
+            }
+            idea.update(fields)
+            _schedule_save(project_id, project.path, ideation, {
+                "op": "set", "ideaIds": [idea_id], "fields": fields
+            })
 
             return {"success": True, "data": result["task"]}
 
         return {"success": False, "error": "Failed to create task"}
 
-    async def ideation_dismiss(conn_id: str, payload: dict) -> dict:
+    @requires_ideation(no_ideation)
+    async def ideation_dismiss(conn_id: str, payload: dict, project_id: str, project, ideation: dict) -> dict:
         """Dismiss an idea."""
-        project_id = payload.get("projectId")
         idea_id = payload.get("ideaId")
 
-        if not project_id or project_id not in api_main.projects:
-            return {"success": False, "error": "Project not found"}
-
-        project = api_main.projects[project_id]
-        ideation = _load_ideation(project_id, project.path)
-
-        if not ideation:
-            return {"success": False, "error": "Ideation data not found"}
-
         # Find and dismiss the idea
-        for idea in ideation.get("ideas", []):
-            if idea.get("id") == idea_id:
-                idea["status"] = "dismissed"
-                idea["updatedAt"] = datetime.now().isoformat()
-                ideation["updatedAt"] = datetime.now().isoformat()
-                _save_ideation(project_id, project.path, ideation)
-                return {"success": True}
+        idea = _find_idea(project_id, ideation, idea_id)
+        if idea:
+            if idea.get("status") == "dismissed":
+                return {"success": True}  # Already there; nothing to save
+            idea["status"] = "dismissed"
+            now_iso = datetime.now().isoformat()
+            idea["updatedAt"] = now_iso
+            ideation["updatedAt"] = now_iso
+            _schedule_save(project_id, project.path, ideation, {
+                "op": "set", "ideaIds": [idea_id],
+                "fields": {"status": "dismissed", "updatedAt": now_iso}, "updatedAt": now_iso
+            })
+            return {"success": True}
 
         return {"success": False, "error": "Idea not found"}
 
-    async def ideation_dismiss_all(conn_id: str, payload: dict) -> dict:
+    @requires_ideation({"success": True})  # Nothing to dismiss
+    async def ideation_dismiss_all(conn_id: str, payload: dict, project_id: str, project, ideation: dict) -> dict:
         """Dismiss all ideas."""
-        project_id = payload.get("projectId")
-
-        if not project_id or project_id not in api_main.projects:
-            return {"success": False, "error": "Project not found"}
-
-        project = api_main.projects[project_id]
-        ideation = _load_ideation(project_id, project.path)
-
-        if not ideation:
-            return {"success": True}  # Nothing to dismiss
-
+        now_iso = datetime.now().isoformat()
+        skip = {"dismissed", "converted"}
+        dismissed = []
         for idea in ideation.get("ideas", []):
-            if idea.get("status") not in ["dismissed", "converted"]:
+            if idea.get("status") not in skip:
                 idea["status"] = "dismissed"
-                idea["updatedAt"] = datetime.now().isoformat()
+                idea["updatedAt"] = now_iso
+                dismissed.append(idea.get("id"))
+
+        if not dismissed:
+            return {"success": True}
 
-        ideation["updatedAt"] = datetime.now().isoformat()
-        _save_ideation(project_id, project.path, ideation)
+        ideation["updatedAt"] = now_iso
+        _schedule_save(project_id, project.path, ideation, {
+            "op": "set", "ideaIds": dismissed,
+            "fields": {"status": "dismissed", "updatedAt": now_iso}, "updatedAt": now_iso
+        })
 
         return {"success": True}
 
-    async def ideation_archive(conn_id: str, payload: dict) -> dict:
+    @requires_ideation(no_ideation)
+    async def ideation_archive(conn_id: str, payload: dict, project_id: str, project, ideation: dict) -> dict:
         """Archive an idea."""
-        project_id = payload.get("projectId")
         idea_id = payload.get("ideaId")
 
-        if not project_id or project_id not in api_main.projects:
-            return {"success": False, "error": "Project not found"}
-
-        project = api_main.projects[project_id]
-        ideation = _load_ideation(project_id, project.path)
-
-        if not ideation:
-            return {"success": False, "error": "Ideation data not found"}
-
-        for idea in ideation.get("ideas", []):
-            if idea.get("id") == idea_id:
-                idea["status"] = "archived"
-                idea["updatedAt"] = datetime.now().isoformat()
-                ideation["updatedAt"] = datetime.now().isoformat()
-                _save_ideation(project_id, project.path, ideation)
-                return {"success": True}
+        idea = _find_idea(project_id, ideation, idea_id)
+        if idea:
+            if idea.get("status") == "archived":
+                return {"success": True}  # Already there; nothing to save
+            idea["status"] = "archived"
+            now_iso = datetime.now().isoformat()
+            idea["updatedAt"] = now_iso
+            ideation["updatedAt"] = now_iso
+            _schedule_save(project_id, project.path, ideation, {
+                "op": "set", "ideaIds": [idea_id],
+                "fields": {"status": "archived", "updatedAt": now_iso}, "updatedAt": now_iso
+            })
+            return {"success": True}
 
         return {"success": False, "error": "Idea not found"}
 
-    async def ideation_delete(conn_id: str, payload: dict) -> dict:
+    @requires_ideation(no_ideation)
+    async def ideation_delete(conn_id: str, payload: dict, project_id: str, project, ideation: dict) -> dict:
         """Delete an idea."""
-        project_id = payload.get("projectId")
         idea_id = payload.get("ideaId")
 
-        if not project_id or project_id not in api_main.projects:
-            return {"success": False, "error": "Project not found"}
-
-        project = api_main.projects[project_id]
-        ideation = _load_ideation(project_id, project.path)
-
-        if not ideation:
-            return {"success": False, "error": "Ideation data not found"}
-
-        ideas = ideation.get("ideas", [])
-        ideation["ideas"] = [i for i in ideas if i.get("id") != idea_id]
-        ideation["updatedAt"] = datetime.now().isoformat()
-        _save_ideation(project_id, project.path, ideation)
+        if _find_idea(project_id, ideation, idea_id):
+            # A new list, so the id index is rebuilt on next lookup
+            ideation["ideas"] = [i for i in ideation["ideas"] if i.get("id") != idea_id]
+        now_iso = datetime.now().isoformat()
+        ideation["updatedAt"] = now_iso
+        _schedule_save(project_id, project.path, ideation, {
+            "op": "delete", "ideaIds": [idea_id], "updatedAt": now_iso
+        })
 
         return {"success": True}
 
-    async def ideation_delete_multiple(conn_id: str, payload: dict) -> dict:
+    @requires_ideation(no_ideation)
+    async def ideation_delete_multiple(conn_id: str, payload: dict, project_id: str, project, ideation: dict) -> dict:
         """Delete multiple ideas."""
-        project_id = payload.get("projectId")
         idea_ids = payload.get("ideaIds", [])
 
-        if not project_id or project_id not in api_main.projects:
-            return {"success": False, "error": "Project not found"}
-
-        project = api_main.projects[project_id]
-        ideation = _load_ideation(project_id, project.path)
-
-        if not ideation:
-            return {"success": False, "error": "Ideation data not found"}
-
-        idea_ids_set = set(idea_ids)
-        ideas = ideation.get("ideas", [])
-        ideation["ideas"] = [i for i in ideas if i.get("id") not in idea_ids_set]
-        ideation["updatedAt"] = datetime.now().isoformat()
-        _save_ideation(project_id, project.path, ideation)
+        contains = set(idea_ids).__contains__
+        ideation["ideas"] = [i for i in ideation.get("ideas", []) if not contains(i.get("id"))]
+        now_iso = datetime.now().isoformat()
+        ideation["updatedAt"] = now_iso
+        _schedule_save(project_id, project.path, ideation, {
+            "op": "delete", "ideaIds": list(idea_ids), "updatedAt": now_iso
+        })
 
         return {"success": True}
 
@@ -336,6 +569,131 @@ def register_ideation_handlers(ws_manager, api_main):
     print(f"[Ideation] Registered {len(handlers)} handlers")
 
 
+async def _drain_stderr(stream: asyncio.StreamReader) -> bytes:
+    """Read a stream to EOF, keeping at most _STDERR_LIMIT bytes."""
+    kept = bytearray()
+    while True:
+        chunk = await stream.read(_STDOUT_CHUNK_SIZE)
+        if not chunk:
+            return bytes(kept)
+        if len(kept) < _STDERR_LIMIT:
+            kept += chunk[:_STDERR_LIMIT - len(kept)]
+
+
+async def _read_lines(stream: asyncio.StreamReader):
+    """Yield lines (as bytes, without the newline) from a stream read in large chunks."""
+    buffer = b""
+    while True:
+        chunk = await stream.read(_STDOUT_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            yield line
+
+    if buffer:
+        yield buffer
+
+
+def _resolve_runner_path() -> Optional[Path]:
+    """Find ideation_runner.py: the container path, then the development checkout."""
+    for runner_path in (
+        Path("/app/auto-claude/runners/ideation_runner.py"),
+        Path(__file__).parent.parent / "auto-claude" / "runners" / "ideation_runner.py",
+    ):
+        if runner_path.exists():
+            return runner_path
+    return None
+
+
+_RUNNER_PATH: Optional[Path] = _resolve_runner_path()
+
+
+def _get_runner_path() -> Optional[Path]:
+    """The runner found at import, or a fresh lookup if there was none then."""
+    global _RUNNER_PATH
+    if _RUNNER_PATH is None:
+        _RUNNER_PATH = _resolve_runner_path()
+    return _RUNNER_PATH
+
+
+class _GenerationState:
+    """What the marker handlers share during one ideation run"""
+
+    def __init__(self, ws_manager, conn_id: str, project_id: str):
+        self.ws_manager = ws_manager
+        self.conn_id = conn_id
+        self.project_id = project_id
+        self.current_type: Optional[str] = None
+        self.ideas: List[dict] = []
+        self.pending_ideas: List[dict] = []
+        self.last_flush = time.monotonic()
+
+    async def flush_ideas(self):
+        """Send the ideas streamed since the last flush as one event"""
+        self.last_flush = time.monotonic()
+        if not self.pending_ideas:
+            return
+        ideas, self.pending_ideas = self.pending_ideas, []
+        await self.ws_manager.send_event(self.conn_id, f"ideation.{self.project_id}.logBatch", {
+            "ideas": ideas
+        })
+
+
+async def _on_type(state: _GenerationState, payload: bytes):
+    await state.flush_ideas()
+    state.current_type = payload.decode("utf-8", errors="replace").strip()
+    await state.ws_manager.send_event(state.conn_id, f"ideation.{state.project_id}.progress", {
+        "stage": "generating",
+        "message": f"Generating {state.current_type} ideas...",
+        "type": state.current_type
+    })
+
+
+async def _on_idea(state: _GenerationState, payload: bytes):
+    try:
+        idea_data = json_loads(payload)
+    except json.JSONDecodeError:
+        return
+
+    now_iso = datetime.now().isoformat()
+    idea = {
+        "id": f"idea-{secrets.token_hex(4)}",
+        "type": state.current_type or "feature",
+        "title": idea_data.get("title", "Untitled"),
+        "description": idea_data.get("description", ""),
+        "priority": idea_data.get("priority", "medium"),
+        "effort": idea_data.get("effort", "medium"),
+        "status": "new",
+        "createdAt": now_iso,
+        "updatedAt": now_iso
+    }
+    state.ideas.append(idea)
+    state.pending_ideas.append(idea)
+
+    if (len(state.pending_ideas) >= _LOG_BATCH_SIZE
+            or time.monotonic() - state.last_flush > _LOG_BATCH_SECONDS):
+        await state.flush_ideas()
+
+
+async def _on_type_complete(state: _GenerationState, payload: bytes):
+    await state.flush_ideas()
+    type_name = payload.decode("utf-8", errors="replace").strip()
+    await state.ws_manager.send_event(state.conn_id, f"ideation.{state.project_id}.typeComplete", {
+        "type": type_name
+    })
+
+
+# Marker name -> handler; __TYPE__, __IDEA__ and __TYPE_COMPLETE__
+_MARKER_DISPATCH = {
+    b"TYPE": _on_type,
+    b"IDEA": _on_idea,
+    b"TYPE_COMPLETE": _on_type_complete,
+}
+
+
 async def _run_ideation_generation(
     ws_manager, conn_id: str, project_id: str, project_path: str, idea_types: List[str]
 ):
@@ -346,13 +704,8 @@ async def _run_ideation_generation(
             "message": "Starting idea generation..."
         })
 
-        # Get the ideation runner path
-        runner_path = Path("/app/auto-claude/runners/ideation_runner.py")
-        if not runner_path.exists():
-            # Development fallback
-            runner_path = Path(__file__).parent.parent / "auto-claude" / "runners" / "ideation_runner.py"
-
-        if not runner_path.exists():
+        runner_path = _get_runner_path()
+        if runner_path is None:
             # Generate sample ideas without AI
             await _generate_sample_ideas(ws_manager, conn_id, project_id, project_path, idea_types)
             return
@@ -364,77 +717,58 @@ async def _run_ideation_generation(
             "--types", ",".join(idea_types)
         ]
 
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=project_path
-        )
+        if _generation_slots.locked():
+            await ws_manager.send_event(conn_id, f"ideation.{project_id}.progress", {
+                "stage": "starting",
+                "message": "Waiting for other idea generations to finish..."
+            })
+
+        async with _generation_slots:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=project_path
+            )
 
-        _active_ideation[project_id] = process
-
-        # Stream output
-        ideas = []
-        current_type = None
-
-        while True:
-            line = await process.stdout.readline()
-            if not line:
-                break
-
-            text = line.decode('utf-8').strip()
-
-            # Check for markers
-            if text.startswith("__TYPE__:"):
-                current_type = text[9:].strip()
-                await ws_manager.send_event(conn_id, f"ideation.{project_id}.progress", {
-                    "stage": "generating",
-                    "message": f"Generating {current_type} ideas...",
-                    "type": current_type
-                })
-            elif text.startswith("__IDEA__:"):
-                try:
-                    idea_data = json.loads(text[9:])
-                    idea = {
-                        "id": f"idea-{uuid.uuid4().hex[:8]}",
-                        "type": current_type or "feature",
-                        "title": idea_data.get("title", "Untitled"),
-                        "description": idea_data.get("description", ""),
-                        "priority": idea_data.get("priority", "medium"),
-                        "effort": idea_data.get("effort", "medium"),
-                        "status": "new",
-                        "createdAt": datetime.now().isoformat(),
-                        "updatedAt": datetime.now().isoformat()
-                    }
-                    ideas.append(idea)
-
-                    # Send individual idea event
-                    await ws_manager.send_event(conn_id, f"ideation.{project_id}.log", {
-                        "idea": idea
-                    })
-                except json.JSONDecodeError:
-                    pass
-            elif text.startswith("__TYPE_COMPLETE__:"):
-                type_name = text[18:].strip()
-                await ws_manager.send_event(conn_id, f"ideation.{project_id}.typeComplete", {
-                    "type": type_name
-                })
-
-        await process.wait()
-
-        # Clean up
-        if project_id in _active_ideation:
-            del _active_ideation[project_id]
+            _active_ideation[project_id] = process
+            stderr_task = asyncio.create_task(_drain_stderr(process.stderr))
+
+            # Stream output
+            state = _GenerationState(ws_manager, conn_id, project_id)
+
+            async for line in _read_lines(process.stdout):
+                line = line.strip()
+
+                # Check for markers; only the payload is decoded
+                if not line.startswith(_MARK_START):
+                    continue
+                end = line.find(_MARK_END, 2)
+                if end > 0:
+                    handler = _MARKER_DISPATCH.get(line[2:end])
+                    if handler:
+                        await handler(state, line[end + 3:])
+
+            await state.flush_ideas()
+            stderr = await stderr_task
+            await process.wait()
+            if process.returncode != 0 and stderr:
+                print(f"[Ideation] Runner error: {stderr.decode('utf-8', errors='replace')}")
+
+            # Clean up
+            if project_id in _active_ideation:
+                del _active_ideation[project_id]
 
         # Save ideation data
+        now_iso = datetime.now().isoformat()
         ideation = {
-            "id": f"ideation-{uuid.uuid4().hex[:8]}",
+            "id": f"ideation-{secrets.token_hex(4)}",
             "projectId": project_id,
-            "ideas": ideas,
-            "createdAt": datetime.now().isoformat(),
-            "updatedAt": datetime.now().isoformat()
+            "ideas": state.ideas,
+            "createdAt": now_iso,
+            "updatedAt": now_iso
         }
-        _save_ideation(project_id, project_path, ideation)
+        await _save_ideation(project_id, project_path, ideation)
 
         await ws_manager.send_event(conn_id, f"ideation.{project_id}.complete", {
             "ideation": ideation
@@ -460,7 +794,7 @@ async def _generate_sample_ideas(
     if "features" in idea_types:
         ideas.extend([
             {
-                "id": f"idea-{uuid.uuid4().hex[:8]}",
+                "id": f"idea-{secrets.token_hex(4)}",
                 "type": "feature",
                 "title": "Add comprehensive test coverage",
                 "description": "Implement unit and integration tests for core functionality",
@@ -471,7 +805,7 @@ async def _generate_sample_ideas(
                 "updatedAt": now
             },
             {
-                "id": f"idea-{uuid.uuid4().hex[:8]}",
+                "id": f"idea-{secrets.token_hex(4)}",
                 "type": "feature",
                 "title": "Add API documentation",
                 "description": "Generate OpenAPI/Swagger documentation for all endpoints",
@@ -486,7 +820,7 @@ async def _generate_sample_ideas(
     if "improvements" in idea_types:
         ideas.extend([
             {
-                "id": f"idea-{uuid.uuid4().hex[:8]}",
+                "id": f"idea-{secrets.token_hex(4)}",
                 "type": "improvement",
                 "title": "Optimize database queries",
                 "description": "Add indexes and optimize N+1 queries",
@@ -501,7 +835,7 @@ async def _generate_sample_ideas(
     if "bugs" in idea_types:
         ideas.extend([
             {
-                "id": f"idea-{uuid.uuid4().hex[:8]}",
+                "id": f"idea-{secrets.token_hex(4)}",
                 "type": "bug",
                 "title": "Fix error handling edge cases",
                 "description": "Review and improve error handling throughout the codebase",
@@ -514,13 +848,13 @@ async def _generate_sample_ideas(
         ])
 
     ideation = {
-        "id": f"ideation-{uuid.uuid4().hex[:8]}",
+        "id": f"ideation-{secrets.token_hex(4)}",
         "projectId": project_id,
         "ideas": ideas,
         "createdAt": now,
         "updatedAt": now
     }
-    _save_ideation(project_id, project_path, ideation)
+    await _save_ideation(project_id, project_path, ideation)
 
     await ws_manager.send_event(conn_id, f"ideation.{project_id}.complete", {
         "ideation": ideation
@@ -9,33 +9,83 @@ import asyncio
 import json
 import os
 import subprocess
-import tempfile
+import time
 import uuid
+from collections import OrderedDict, deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .database import ProjectService
+from .json_codec import json_dumps, json_loads
 
-# In-memory cache for sessions (per-project)
+# In-memory cache for sessions (per-project), least recently used first;
+# beyond MAX_CACHED_PROJECTS the oldest project is dropped and reloaded
+# from the database on its next use
 # Structure: {project_id: {session_id: InsightsSession}}
-_sessions_store: Dict[str, Dict[str, dict]] = {}
+MAX_CACHED_PROJECTS = 32
+_sessions_store: "OrderedDict[str, Dict[str, dict]]" = OrderedDict()
+
+# Session summaries per project, most recently updated first; built on the
+# first list call and kept in order by _touch_summary/_drop_summary
+_summary_cache: Dict[str, List[dict]] = {}
+
+# Most recently updated session per cached project, so the current session
+# is found without scanning them all; set on load and by _touch_summary
+_latest_session_id: Dict[str, str] = {}
+
+# Messages of conversation history handed to the insights runner per query
+MAX_HISTORY_MESSAGES = int(os.environ.get("INSIGHTS_MAX_HISTORY_MESSAGES", "40"))
+
+# Session writes are coalesced: changed (project_id, session_id) pairs wait
+# here for one timer, then each is upserted on its own
+_SAVE_DEBOUNCE_SECONDS = 0.25
+_dirty_sessions: set = set()
+_flush_handle: Optional[asyncio.TimerHandle] = None
 
 # Active insights processes
 _active_processes: Dict[str, subprocess.Popen] = {}
 
+# Idle runner workers kept between queries, so a message doesn't pay for
+# interpreter startup and the SDK imports again
+INSIGHTS_RUNNER_WORKERS = int(os.environ.get("INSIGHTS_RUNNER_WORKERS", "2"))
+
+# Runner output markers, matched against raw stdout lines. Every marker
+# starts with _MARK_START, so plain text needs only that one check.
+# Marker -> (chunk type, chunk field for the payload, payload offset)
+_MARK_START = b"__"
+_MARKERS = {
+    marker: (chunk_type, field, len(marker))
+    for marker, chunk_type, field in (
+        (b"__TOOL_START__:", "tool_start", "tool"),
+        (b"__TOOL_END__:", "tool_end", "tool"),
+        (b"__TASK_SUGGESTION__:", "task_suggestion", "suggestedTask"),
+    )
+}
+
+# Runner stdout is read this many bytes at a time; the pipe's StreamReader
+# buffers up to _STDOUT_BUFFER_LIMIT before pausing the runner
+_STDOUT_CHUNK_SIZE = 65536
+_STDOUT_BUFFER_LIMIT = 256 * 1024
+
+# Streamed text lines are sent in one text_batch event per this many lines
+# or this many seconds, whichever comes first
+_TEXT_BATCH_SIZE = 16
+_TEXT_BATCH_SECONDS = 0.015
+
 
 def _load_sessions(project_id: str, project_path: str) -> Dict[str, dict]:
     """Load sessions from database (with file fallback for migration)."""
-    if project_id in _sessions_store:
-        return _sessions_store[project_id]
+    sessions = _sessions_store.get(project_id)
+    if sessions is not None:
+        _sessions_store.move_to_end(project_id)
+        return sessions
 
     # Try database first
     try:
         db_sessions = ProjectService.get_insights_sessions(project_id)
         if db_sessions:
-            _sessions_store[project_id] = db_sessions
-            return db_sessions
+            return _cache_sessions(project_id, db_sessions)
     except Exception as e:
         print(f"[Insights] Error loading sessions from DB: {e}")
 
@@ -43,34 +93,147 @@ def _load_sessions(project_id: str, project_path: str) -> Dict[str, dict]:
     sessions_file = Path(project_path) / ".auto-claude" / "insights_sessions.json"
     if sessions_file.exists():
         try:
-            with open(sessions_file) as f:
-                sessions = json.load(f)
-                _sessions_store[project_id] = sessions
-                # Migrate to database
-                ProjectService.save_insights_sessions(project_id, sessions)
-                print(f"[Insights] Migrated sessions to database for {project_id}")
-                return sessions
+            sessions = json_loads(sessions_file.read_bytes())
+            _cache_sessions(project_id, sessions)
+            # Migrate to database
+            ProjectService.save_insights_sessions(project_id, sessions)
+            print(f"[Insights] Migrated sessions to database for {project_id}")
+            return sessions
         except Exception as e:
             print(f"[Insights] Error loading sessions from file: {e}")
 
-    _sessions_store[project_id] = {}
-    return _sessions_store[project_id]
+    return _cache_sessions(project_id, {})
 
 
-def _save_sessions(project_id: str, project_path: str):
-    """Save sessions to database."""
-    if project_id not in _sessions_store:
-        return
+def _cache_sessions(project_id: str, sessions: Dict[str, dict]) -> Dict[str, dict]:
+    """Keep a project's sessions in memory, evicting the least recently used project."""
+    while len(_sessions_store) >= MAX_CACHED_PROJECTS:
+        evicted = next(iter(_sessions_store))
+        # Write its pending changes while the sessions are still reachable
+        if any(key[0] == evicted for key in _dirty_sessions):
+            flush_insights_saves()
+        del _sessions_store[evicted]
+        _summary_cache.pop(evicted, None)
+        _latest_session_id.pop(evicted, None)
+
+    for session in sessions.values():
+        if "updatedAtNs" not in session:
+            session["updatedAtNs"] = _iso_to_ns(session.get("updatedAt"))
+
+    _sessions_store[project_id] = sessions
+    _find_latest_session(project_id, sessions)
+    return sessions
+
+
+def forget_project_sessions(project_id: str):
+    """
+    Drop a project's cached sessions after they were replaced in the
+    database, so the next use reloads them; pending saves are discarded
+    rather than written over the new data.
+    """
+    _dirty_sessions.difference_update(
+        [key for key in _dirty_sessions if key[0] == project_id]
+    )
+    _sessions_store.pop(project_id, None)
+    _summary_cache.pop(project_id, None)
+    _latest_session_id.pop(project_id, None)
+
+
+def _now() -> Tuple[str, int]:
+    """
+    The current time as an ISO string (updatedAt, shown to clients) and as
+    nanoseconds since the epoch (updatedAtNs, used for ordering).
+    """
+    now_ns = time.time_ns()
+    seconds, ns = divmod(now_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=ns // 1000).isoformat(), now_ns
+
+
+def _iso_to_ns(value: Optional[str]) -> int:
+    """updatedAtNs for a session saved before it was recorded."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return 0
+    return int(parsed.timestamp()) * 1_000_000_000 + parsed.microsecond * 1000
+
 
+def _find_latest_session(project_id: str, sessions: Dict[str, dict]):
+    """Scan for the most recently updated session (on load and after deletes)."""
+    if sessions:
+        latest = max(sessions.values(), key=lambda s: s["updatedAtNs"])
+        _latest_session_id[project_id] = latest["id"]
+    else:
+        _latest_session_id.pop(project_id, None)
+
+
+def _latest_session(project_id: str, project_path: str) -> Optional[dict]:
+    """The project's most recently updated session, if it has any."""
+    sessions = _load_sessions(project_id, project_path)
+    session_id = _latest_session_id.get(project_id)
+    return sessions.get(session_id) if session_id else None
+
+
+def _save_session(project_id: str, session_id: str):
+    """
+    Mark a session for saving; the database write happens after a short
+    delay so a burst of changes (message, reply, rename) shares one write.
+    """
+    _dirty_sessions.add((project_id, session_id))
+
+    global _flush_handle
+    if _flush_handle is None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called outside the server loop; nothing would run the timer
+            flush_insights_saves()
+            return
+        _flush_handle = loop.call_later(_SAVE_DEBOUNCE_SECONDS, flush_insights_saves)
+
+
+def _save_session_now(project_id: str, session_id: str):
+    """Write a session immediately, along with any other pending saves."""
+    _dirty_sessions.add((project_id, session_id))
+    flush_insights_saves()
+
+
+def _delete_session(project_id: str, session_id: str):
+    """Drop a session from memory and the database."""
+    sessions = _sessions_store.get(project_id, {})
+    sessions.pop(session_id, None)
+    _drop_summary(project_id, session_id)
+    if _latest_session_id.get(project_id) == session_id:
+        _find_latest_session(project_id, sessions)
+    _dirty_sessions.discard((project_id, session_id))
     try:
-        ProjectService.save_insights_sessions(project_id, _sessions_store[project_id])
+        ProjectService.delete_insights_session(project_id, session_id)
     except Exception as e:
-        print(f"[Insights] Error saving sessions to DB: {e}")
+        print(f"[Insights] Error deleting session from DB: {e}")
+
+
+def flush_insights_saves():
+    """Write every session with pending changes (also called on shutdown)."""
+    global _flush_handle
+    if _flush_handle is not None:
+        _flush_handle.cancel()
+        _flush_handle = None
+
+    while _dirty_sessions:
+        project_id, session_id = _dirty_sessions.pop()
+        session = _sessions_store.get(project_id, {}).get(session_id)
+        if session is None:
+            continue
+        try:
+            ProjectService.upsert_insights_session(project_id, session_id, session)
+        except Exception as e:
+            print(f"[Insights] Error saving session to DB: {e}")
 
 
 def _create_session(project_id: str, project_path: str) -> dict:
     """Create a new insights session."""
     session_id = f"session-{uuid.uuid4().hex[:8]}"
+    now_iso, now_ns = _now()
     session = {
         "id": session_id,
         "projectId": project_id,
@@ -80,35 +243,62 @@ def _create_session(project_id: str, project_path: str) -> dict:
             "model": "claude-sonnet-4-5-20250929",
             "thinkingLevel": "medium"
         },
-        "createdAt": datetime.now().isoformat(),
-        "updatedAt": datetime.now().isoformat()
+        "createdAt": now_iso,
+        "updatedAt": now_iso,
+        "updatedAtNs": now_ns
     }
 
     sessions = _load_sessions(project_id, project_path)
     sessions[session_id] = session
-    _save_sessions(project_id, project_path)
+    _touch_summary(project_id, session)
+    _save_session(project_id, session_id)
 
     return session
 
 
-def _get_session_summaries(project_id: str, project_path: str) -> List[dict]:
-    """Get summaries of all sessions for a project."""
-    sessions = _load_sessions(project_id, project_path)
-    summaries = []
+def _summarize(session: dict) -> dict:
+    return {
+        "id": session["id"],
+        "projectId": session["projectId"],
+        "title": session.get("title", "Untitled"),
+        "messageCount": len(session.get("messages", [])),
+        "createdAt": session["createdAt"],
+        "updatedAt": session["updatedAt"]
+    }
 
-    for session in sessions.values():
-        summaries.append({
-            "id": session["id"],
-            "projectId": session["projectId"],
-            "title": session.get("title", "Untitled"),
-            "messageCount": len(session.get("messages", [])),
-            "createdAt": session["createdAt"],
-            "updatedAt": session["updatedAt"]
-        })
 
-    # Sort by updatedAt descending
-    summaries.sort(key=lambda x: x["updatedAt"], reverse=True)
-    return summaries
+def _get_session_summaries(project_id: str, project_path: str) -> List[dict]:
+    """Get summaries of all sessions for a project, most recently updated first."""
+    summaries = _summary_cache.get(project_id)
+    if summaries is None:
+        sessions = _load_sessions(project_id, project_path)
+        ordered = sorted(sessions.values(), key=lambda s: s["updatedAtNs"], reverse=True)
+        summaries = [_summarize(session) for session in ordered]
+        _summary_cache[project_id] = summaries
+    return list(summaries)
+
+
+def _touch_summary(project_id: str, session: dict):
+    """
+    Refresh a session's summary after a change and move it to the front;
+    the session is now the project's latest.
+    """
+    _latest_session_id[project_id] = session["id"]
+    summaries = _summary_cache.get(project_id)
+    if summaries is None:
+        return  # Built from the sessions on the next list call
+    _drop_summary(project_id, session["id"])
+    summaries.insert(0, _summarize(session))
+
+
+def _drop_summary(project_id: str, session_id: str):
+    summaries = _summary_cache.get(project_id)
+    if summaries is None:
+        return
+    for i, summary in enumerate(summaries):
+        if summary["id"] == session_id:
+            del summaries[i]
+            return
 
 
 def register_insights_handlers(ws_manager, api_main):
@@ -121,11 +311,8 @@ def register_insights_handlers(ws_manager, api_main):
             return None
 
         project = api_main.projects[project_id]
-        sessions = _load_sessions(project_id, project.path)
-
-        if sessions:
-            # Return most recent session
-            latest = max(sessions.values(), key=lambda s: s.get("updatedAt", ""))
+        latest = _latest_session(project_id, project.path)
+        if latest is not None:
             return latest
 
         # Create new session if none exist
@@ -174,8 +361,7 @@ def register_insights_handlers(ws_manager, api_main):
         sessions = _load_sessions(project_id, project.path)
 
         if session_id in sessions:
-            del sessions[session_id]
-            _save_sessions(project_id, project.path)
+            _delete_session(project_id, session_id)
             return {"success": True}
 
         return {"success": False, "error": "Session not found"}
@@ -197,8 +383,9 @@ def register_insights_handlers(ws_manager, api_main):
 
         if session_id in sessions:
             sessions[session_id]["title"] = new_title
-            sessions[session_id]["updatedAt"] = datetime.now().isoformat()
-            _save_sessions(project_id, project.path)
+            sessions[session_id]["updatedAt"], sessions[session_id]["updatedAtNs"] = _now()
+            _touch_summary(project_id, sessions[session_id])
+            _save_session(project_id, session_id)
             return {"success": True}
 
         return {"success": False, "error": "Session not found"}
@@ -217,8 +404,9 @@ def register_insights_handlers(ws_manager, api_main):
 
         if session_id in sessions:
             sessions[session_id]["modelConfig"] = model_config
-            sessions[session_id]["updatedAt"] = datetime.now().isoformat()
-            _save_sessions(project_id, project.path)
+            sessions[session_id]["updatedAt"], sessions[session_id]["updatedAtNs"] = _now()
+            _touch_summary(project_id, sessions[session_id])
+            _save_session(project_id, session_id)
             return {"success": True}
 
         return {"success": False, "error": "Session not found"}
@@ -236,8 +424,9 @@ def register_insights_handlers(ws_manager, api_main):
 
         if session_id and session_id in sessions:
             sessions[session_id]["messages"] = []
-            sessions[session_id]["updatedAt"] = datetime.now().isoformat()
-            _save_sessions(project_id, project.path)
+            sessions[session_id]["updatedAt"], sessions[session_id]["updatedAtNs"] = _now()
+            _touch_summary(project_id, sessions[session_id])
+            _save_session(project_id, session_id)
 
         return {"success": True}
 
@@ -254,38 +443,40 @@ def register_insights_handlers(ws_manager, api_main):
             return {"success": False, "error": "Message is required"}
 
         project = api_main.projects[project_id]
-        sessions = _load_sessions(project_id, project.path)
 
         # Get or create current session
-        if not sessions:
+        session = _latest_session(project_id, project.path)
+        if session is None:
             session = _create_session(project_id, project.path)
-        else:
-            session = max(sessions.values(), key=lambda s: s.get("updatedAt", ""))
 
         session_id = session["id"]
 
         # Add user message to session
+        now_iso, now_ns = _now()
         user_msg = {
             "id": f"msg-{uuid.uuid4().hex[:8]}",
             "role": "user",
             "content": message,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso
         }
         session["messages"].append(user_msg)
-        session["updatedAt"] = datetime.now().isoformat()
+        session["updatedAt"] = now_iso
+        session["updatedAtNs"] = now_ns
 
         # Update title if this is the first message
         if len(session["messages"]) == 1:
             # Use first 50 chars of message as title
             session["title"] = message[:50] + ("..." if len(message) > 50 else "")
 
-        _save_sessions(project_id, project.path)
+        _touch_summary(project_id, session)
+        _save_session(project_id, session_id)
 
-        # Start async task to run insights runner and stream response
+        # Start async task to run insights runner and stream response; the
+        # runner only sees the most recent messages (the new one last)
         asyncio.create_task(
             _run_insights_query(
                 ws_manager, conn_id, project_id, project.path,
-                session_id, message, session["messages"], model_config
+                session_id, message, session["messages"][-MAX_HISTORY_MESSAGES:], model_config
             )
         )
 
@@ -308,14 +499,19 @@ def register_insights_handlers(ws_manager, api_main):
 
         project = api_main.projects[project_id]
 
-        # Check if task was already created from this message
+        # The message the suggestion came from, if the client named one
+        source_msg = None
         if session_id and message_id:
-            sessions = _load_sessions(project_id, project.path)
-            if session_id in sessions:
-                session = sessions[session_id]
+            session = _load_sessions(project_id, project.path).get(session_id)
+            if session is not None:
                 for msg in session.get("messages", []):
-                    if msg.get("id") == message_id and msg.get("taskCreated"):
-                        return {"success": False, "error": "Task already created from this message"}
+                    if msg.get("id") == message_id:
+                        source_msg = msg
+                        break
+
+        # Check if task was already created from this message
+        if source_msg is not None and source_msg.get("taskCreated"):
+            return {"success": False, "error": "Task already created from this message"}
 
         # Create task via the existing task creation logic
         from .main import TaskCreateRequest
@@ -330,16 +526,10 @@ def register_insights_handlers(ws_manager, api_main):
 
         if "task" in result:
             # Mark the message as having had its task created
-            if session_id and message_id:
-                sessions = _load_sessions(project_id, project.path)
-                if session_id in sessions:
-                    session = sessions[session_id]
-                    for msg in session.get("messages", []):
-                        if msg.get("id") == message_id:
-                            msg["taskCreated"] = True
-                            msg["createdTaskId"] = result["task"].get("id")
-                            break
-                    _save_sessions(project_id, project.path)
+            if source_msg is not None:
+                source_msg["taskCreated"] = True
+                source_msg["createdTaskId"] = result["task"].get("id")
+                _save_session(project_id, session_id)
 
             # Broadcast task created event
             await ws_manager.broadcast_event(f"project.{project_id}.tasks", {
@@ -370,6 +560,113 @@ def register_insights_handlers(ws_manager, api_main):
     print(f"[Insights] Registered {len(handlers)} handlers")
 
 
+class _LineReader:
+    """
+    Reads newline-terminated lines from a stream in large chunks.
+
+    One read() call usually yields many lines, so the per-line cost is a
+    deque pop instead of a readline() round-trip through the event loop.
+    readline() is safe to cancel (e.g. by wait_for): state only changes
+    after the read returns.
+    """
+
+    def __init__(self, stream: asyncio.StreamReader):
+        self._stream = stream
+        self._lines: deque = deque()
+        self._partial = b""
+        self._eof = False
+
+    async def readline(self) -> bytes:
+        """Next line including its newline; b"" at end of stream."""
+        while not self._lines:
+            if self._eof:
+                return b""
+            chunk = await self._stream.read(_STDOUT_CHUNK_SIZE)
+            if not chunk:
+                self._eof = True
+                if self._partial:
+                    self._lines.append(self._partial)
+                    self._partial = b""
+                continue
+
+            data = self._partial + chunk
+            end = data.rfind(b"\n") + 1
+            if end:
+                self._lines.extend(line + b"\n" for line in data[:end - 1].split(b"\n"))
+            self._partial = data[end:]
+
+        return self._lines.popleft()
+
+
+class _RunnerWorker:
+    """A runner started with --worker, with its stdout reader kept across jobs."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.stdout = _LineReader(process.stdout)
+
+
+class _RunnerPool:
+    """
+    Long-lived insights runners.
+
+    A query takes an idle worker or starts a new one, so queries never wait
+    on each other; afterwards up to `size` workers stay around for the next
+    query and any extra are stopped.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._idle: deque = deque()
+
+    async def acquire(self, runner_path: Path) -> _RunnerWorker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.process.returncode is None:
+                return worker
+            await self.discard(worker)
+
+        process = await asyncio.create_subprocess_exec(
+            "python3", str(runner_path), "--worker",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=_STDOUT_BUFFER_LIMIT
+        )
+        print(f"[Insights] Started runner worker {process.pid}")
+        return _RunnerWorker(process)
+
+    async def release(self, worker: _RunnerWorker):
+        """Return a worker that finished its job cleanly."""
+        if worker.process.returncode is None and len(self._idle) < self.size:
+            self._idle.append(worker)
+        else:
+            await self.discard(worker)
+
+    async def discard(self, worker: _RunnerWorker):
+        """Stop a worker: closing stdin ends its job loop."""
+        process = worker.process
+        if process.stdin and not process.stdin.is_closing():
+            process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), 5)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    async def close(self):
+        workers = list(self._idle)
+        self._idle.clear()
+        await asyncio.gather(*(self.discard(worker) for worker in workers))
+
+
+_runner_pool = _RunnerPool(INSIGHTS_RUNNER_WORKERS)
+
+
+async def close_insights_runners():
+    """Stop the idle runner workers (called on shutdown)."""
+    await _runner_pool.close()
+
+
 async def _run_insights_query(
     ws_manager,
     conn_id: str,
@@ -396,116 +693,137 @@ async def _run_insights_query(
         })
         return
 
-    # Write history to temp file to avoid command line length limits
-    history_file = None
+    worker = None
+    job_done = False
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(history, f)
-            history_file = f.name
-
-        # Build command
-        model = model_config.get("model", "claude-sonnet-4-5-20250929")
-        thinking_level = model_config.get("thinkingLevel", "medium")
-
-        cmd = [
-            "python3", str(runner_path),
-            "--project-dir", project_path,
-            "--message", message,
-            "--history-file", history_file,
-            "--model", model,
-            "--thinking-level", thinking_level
-        ]
-
-        print(f"[Insights] Running: {' '.join(cmd[:6])}...")
-
-        # Run the process
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=project_path
-        )
-
+        worker = await _runner_pool.acquire(runner_path)
+        process = worker.process
         _active_processes[session_id] = process
 
-        # Stream stdout
-        response_text = ""
+        # One job per line; the worker answers with stdout lines up to
+        # its __JOB_END__ line for this job id
+        job_id = uuid.uuid4().hex
+        job_end = f"__JOB_END__:{job_id}\n".encode()
+        job = {
+            "id": job_id,
+            "projectDir": project_path,
+            "message": message,
+            "history": history,
+            "model": model_config.get("model", "claude-sonnet-4-5-20250929"),
+            "thinkingLevel": model_config.get("thinkingLevel", "medium"),
+        }
+
+        process.stdin.write(json_dumps(job) + b"\n")
+        try:
+            await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Runner exited; its stdout ends without a job end
+
+        # Stream stdout; markers are matched on raw bytes and only their
+        # payload is decoded
+        response_chunks: List[bytes] = []
         suggested_task = None
         tools_used = []
 
+        stdout = worker.stdout
+
+        # Text lines waiting to go out as one text_batch event
+        loop = asyncio.get_running_loop()
+        pending_text: List[str] = []
+        last_flush = loop.time()
+
+        async def flush_text():
+            nonlocal last_flush
+            last_flush = loop.time()
+            if not pending_text:
+                return
+            contents = pending_text[:]
+            pending_text.clear()
+            await ws_manager.send_event(conn_id, f"insights.{project_id}.chunk", {
+                "type": "text_batch",
+                "contents": contents
+            })
+
         while True:
-            line = await process.stdout.readline()
+            if pending_text:
+                # Don't let buffered text wait on a runner that went quiet
+                try:
+                    line = await asyncio.wait_for(
+                        stdout.readline(),
+                        max(0.0, last_flush + _TEXT_BATCH_SECONDS - loop.time())
+                    )
+                except asyncio.TimeoutError:
+                    await flush_text()
+                    continue
+            else:
+                line = await stdout.readline()
             if not line:
                 break
+            if line == job_end:
+                job_done = True
+                break
 
-            text = line.decode('utf-8')
-
-            # Check for special markers
-            if text.startswith("__TOOL_START__:"):
-                try:
-                    tool_data = json.loads(text[15:].strip())
-                    tools_used.append(tool_data)
+            if line.startswith(_MARK_START):
+                for prefix, (chunk_type, field, offset) in _MARKERS.items():
+                    if line.startswith(prefix):
+                        break
+                else:
+                    chunk_type = None
+
+                if chunk_type:
+                    # Markers go out in order after the text before them
+                    await flush_text()
+                    try:
+                        data = json_loads(line[offset:])
+                    except json.JSONDecodeError:
+                        continue
+                    if chunk_type == "tool_start":
+                        tools_used.append(data)
+                    elif chunk_type == "task_suggestion":
+                        suggested_task = data
                     await ws_manager.send_event(conn_id, f"insights.{project_id}.chunk", {
-                        "type": "tool_start",
-                        "tool": tool_data
+                        "type": chunk_type,
+                        field: data
                     })
-                except json.JSONDecodeError:
-                    pass
-            elif text.startswith("__TOOL_END__:"):
-                try:
-                    tool_data = json.loads(text[13:].strip())
-                    await ws_manager.send_event(conn_id, f"insights.{project_id}.chunk", {
-                        "type": "tool_end",
-                        "tool": tool_data
-                    })
-                except json.JSONDecodeError:
-                    pass
-            elif text.startswith("__TASK_SUGGESTION__:"):
-                try:
-                    suggested_task = json.loads(text[20:].strip())
-                    await ws_manager.send_event(conn_id, f"insights.{project_id}.chunk", {
-                        "type": "task_suggestion",
-                        "suggestedTask": suggested_task
-                    })
-                except json.JSONDecodeError:
-                    pass
-            else:
-                # Regular text
-                response_text += text
-                await ws_manager.send_event(conn_id, f"insights.{project_id}.chunk", {
-                    "type": "text",
-                    "content": text
-                })
+                    continue
+
+            # Regular text
+            response_chunks.append(line)
+            pending_text.append(line.decode("utf-8", errors="replace"))
+            if (len(pending_text) >= _TEXT_BATCH_SIZE
+                    or loop.time() - last_flush > _TEXT_BATCH_SECONDS):
+                await flush_text()
 
-        # Wait for process to complete
-        await process.wait()
+        await flush_text()
+        response_text = b"".join(response_chunks).decode("utf-8", errors="replace")
 
         # Clean up
         if session_id in _active_processes:
             del _active_processes[session_id]
 
-        # Check for errors
-        stderr = await process.stderr.read()
-        if stderr:
-            stderr_text = stderr.decode('utf-8')
-            if process.returncode != 0:
-                print(f"[Insights] Runner error: {stderr_text}")
+        if not job_done:
+            # The runner's own stderr (shared with the server) says why
+            await process.wait()
+            print(f"[Insights] Runner {process.pid} exited with code {process.returncode}")
 
         # Save assistant message to session
         if response_text.strip():
             sessions = _load_sessions(project_id, project_path)
             if session_id in sessions:
+                now_iso, now_ns = _now()
                 assistant_msg = {
                     "id": f"msg-{uuid.uuid4().hex[:8]}",
                     "role": "assistant",
                     "content": response_text.strip(),
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso,
                     "toolsUsed": tools_used if tools_used else None,
                     "suggestedTask": suggested_task
                 }
                 sessions[session_id]["messages"].append(assistant_msg)
-                sessions[session_id]["updatedAt"] = datetime.now().isoformat()
-                _save_sessions(project_id, project_path)
+                sessions[session_id]["updatedAt"] = now_iso
+                sessions[session_id]["updatedAtNs"] = now_ns
+                _touch_summary(project_id, sessions[session_id])
+                _save_session_now(project_id, session_id)
 
         # Send done event
         await ws_manager.send_event(conn_id, f"insights.{project_id}.chunk", {
@@ -520,7 +838,11 @@ async def _run_insights_query(
             "type": "error",
             "error": str(e)
         })
+
     finally:
-        # Clean up temp file
-        if history_file and os.path.exists(history_file):
-            os.unlink(history_file)
+        # A worker stopped mid-job still has that job's output pending
+        if worker is not None:
+            if job_done:
+                await _runner_pool.release(worker)
+            else:
+                await _runner_pool.discard(worker)
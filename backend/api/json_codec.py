@@ -0,0 +1,54 @@
+"""
+JSON encoding helpers.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise. Encoded output is always bytes, so callers can hand it straight
+to Path.write_bytes() or a subprocess pipe without an extra encode step.
+
+orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+catching json.JSONDecodeError regardless of which backend is active.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+def json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False,
+               default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes.
+
+    Args:
+        obj: JSON-compatible value
+        indent: Pretty-print with two-space indentation
+        sort_keys: Emit object keys in sorted order (stable git blobs)
+        default: Called for values that aren't natively serializable
+    """
+    if orjson is not None:
+        # Non-str keys are stringified, as the stdlib json module does
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option)
+
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+        default=default,
+    ).encode("utf-8")
+
+
+def json_loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Deserialize JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -5,12 +5,19 @@ Replaces Electron IPC with REST/WebSocket APIs
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict, Tuple
 import asyncio
 import json
 import subprocess
+import operator
 import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -20,9 +27,29 @@ from .pty_terminal import router as terminal_router
 from .profiles import router as profiles_router
 from .git import router as git_router
 from .github_auth import router as github_router
+from .github_client import close_client as close_github_client
+from .ideation_handler import flush_ideation_saves
+from .insights_handler import close_insights_runners, flush_insights_saves
+from .json_codec import json_dumps, json_loads
 from .websocket_handler import ws_manager, register_handlers
 from .profiles import start_usage_collection, stop_usage_collection
 
+# Fire-and-forget tasks, kept referenced until they finish (the event loop
+# only holds weak references to tasks)
+_background_tasks: set = set()
+
+# The server's event loop, for scheduling coroutines from other threads
+_main_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _spawn(coro) -> asyncio.Task:
+    """Start a background task on the running loop."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
 # Token refresh background task
 _token_refresh_task: asyncio.Task | None = None
 TOKEN_REFRESH_INTERVAL_SECONDS = 30 * 60  # 30 minutes
@@ -53,6 +80,29 @@ except ImportError as e:
     get_clone_manager = None
 
 
+def _install_child_watcher():
+    """
+    Reap subprocesses through pidfds instead of a waitpid thread per child.
+
+    Before Python 3.12 asyncio's default ThreadedChildWatcher starts a thread
+    for every spawned process (runners, git, gh). Linux 5.3+ can poll a pidfd
+    on the event loop instead; 3.12+ already does this by default, and
+    uvloop (the production loop) reaps children through libuv itself.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return
+    if not isinstance(asyncio.get_event_loop_policy(), asyncio.DefaultEventLoopPolicy):
+        return
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return  # Kernel without pidfd support
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(asyncio.get_running_loop())
+    asyncio.set_child_watcher(watcher)
+    print("[App] Using pidfd child watcher")
+
+
 async def _token_refresh_loop():
     """Background task that periodically checks and refreshes OAuth tokens."""
     from core.auth import check_and_refresh_token_proactively
@@ -104,6 +154,9 @@ async def stop_token_refresh_task():
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events."""
     # Startup
+    global _main_loop
+    _main_loop = asyncio.get_running_loop()
+    _install_child_watcher()
     print("[App] Initializing database...")
     init_db()
     migrate_from_json()  # Migrate any existing JSON data
@@ -119,9 +172,21 @@ async def lifespan(app: FastAPI):
     print("[App] Stopping background tasks...")
     await stop_token_refresh_task()
     await stop_usage_collection()
+    await close_github_client()
+    await flush_ideation_saves()
+    flush_insights_saves()
+    flush_tab_state()
+    await close_insights_runners()
 
 
-app = FastAPI(title="Auto-Claude API", lifespan=lifespan)
+class CodecJSONResponse(JSONResponse):
+    """JSONResponse encoded with json_codec (orjson when it is installed)."""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+app = FastAPI(title="Auto-Claude API", lifespan=lifespan, default_response_class=CodecJSONResponse)
 
 # Include routers
 app.include_router(oauth_router)
@@ -193,12 +258,17 @@ class ProjectSettingsUpdate(BaseModel):
     settings: dict
 
 
+# Projects whose tasks changed since their last git state export
+_dirty_task_projects: set = set()
+
+
 class TaskStore:
     """
     Database-backed task store that provides dict-like access.
 
     Eliminates in-memory caching issues by always reading from/writing to SQLite.
     Provides the same interface as a dict for minimal code changes.
+    Writes record the task's project in _dirty_task_projects.
     """
 
     def __getitem__(self, task_id: str) -> Task:
@@ -210,6 +280,7 @@ class TaskStore:
 
     def __setitem__(self, task_id: str, task: Task):
         """Set/update task - writes to database."""
+        _dirty_task_projects.add(task.project_id)
         existing = TaskService.get_by_id(task_id)
         if existing:
             TaskService.update(task_id, {
@@ -230,6 +301,9 @@ class TaskStore:
 
     def __delitem__(self, task_id: str):
         """Delete task from database."""
+        task_data = TaskService.get_by_id(task_id)
+        if task_data is not None:
+            _dirty_task_projects.add(task_data["projectId"])
         TaskService.delete(task_id)
 
     def __contains__(self, task_id: str) -> bool:
@@ -245,19 +319,19 @@ class TaskStore:
 
     def keys(self):
         """Get all task IDs."""
-        return [t["id"] for t in TaskService.get_all(include_archived=True)]
+        return [row[0] for row in TaskService.get_rows(include_archived=True)]
 
-    def values(self):
-        """Get all tasks."""
-        return [self._dict_to_task(t) for t in TaskService.get_all(include_archived=False)]
+    def values(self, project_id: Optional[str] = None):
+        """Get all tasks, or those of one project (an indexed lookup)."""
+        return [self._row_to_task(row) for row in TaskService.get_rows(project_id=project_id)]
 
-    def items(self):
-        """Get all (task_id, task) pairs."""
-        return [(t["id"], self._dict_to_task(t)) for t in TaskService.get_all(include_archived=False)]
+    def items(self, project_id: Optional[str] = None):
+        """Get all (task_id, task) pairs, or those of one project."""
+        return [(row[0], self._row_to_task(row)) for row in TaskService.get_rows(project_id=project_id)]
 
     def __len__(self):
         """Count tasks."""
-        return len(TaskService.get_all(include_archived=False))
+        return TaskService.count()
 
     def __iter__(self):
         """Iterate over task IDs."""
@@ -273,12 +347,24 @@ class TaskStore:
             project_id=task_data["projectId"]
         )
 
+    def _row_to_task(self, row: tuple) -> Task:
+        """Convert a TaskService.get_rows() tuple to Task object."""
+        _, spec_id, project_id, title, description, status = row
+        return Task(
+            spec_id=spec_id,
+            title=title,
+            description=description,
+            status=status,
+            project_id=project_id
+        )
+
     def update_status(self, task_id: str, status: str) -> Optional[Task]:
         """Update just the status of a task. Returns updated task or None if not found."""
         task_data = TaskService.get_by_id(task_id)
         if task_data is None:
             return None
         TaskService.update(task_id, {"status": status})
+        _dirty_task_projects.add(task_data["projectId"])
         task_data["status"] = status
         return self._dict_to_task(task_data)
 
@@ -337,7 +423,6 @@ def _save_settings(settings: dict):
     """Save app settings to database"""
     try:
         SettingsService.set_many(settings)
-        print(f"[Settings] Saved settings to database")
     except Exception as e:
         print(f"[Settings] Error saving settings: {e}")
 
@@ -349,17 +434,21 @@ def _save_tasks(export_state: bool = False, project_id: str = None):
 
     Args:
         export_state: If True, export state to git branch
-        project_id: If provided with export_state, only export this project
+        project_id: If provided with export_state, only export this project;
+            otherwise every project with changed tasks is exported
     """
     # Task data is already in database via TaskStore - no batch save needed
     # Just handle git export if requested
     if export_state:
         try:
             if project_id:
+                _dirty_task_projects.discard(project_id)
                 _export_project_state(project_id)
             else:
-                # Export all projects
-                for pid in projects:
+                # Export the projects whose tasks changed
+                changed = [pid for pid in _dirty_task_projects if pid in projects]
+                _dirty_task_projects.clear()
+                for pid in changed:
                     _export_project_state(pid)
         except Exception as e:
             print(f"[Tasks] Error exporting state: {e}")
@@ -391,72 +480,100 @@ def _save_task(task: Task):
 # Git State Management
 # ============================================================================
 
-# Debounce state exports to avoid too many git commits
-_pending_state_exports: Dict[str, float] = {}
+# Debounce state exports to avoid too many git commits: the first
+# schedule_state_export of a burst starts one timer per project, and the
+# specs named by the rest of the burst join that export (None = all specs)
 _STATE_EXPORT_DEBOUNCE_SECONDS = 5.0
+_export_handles: Dict[str, asyncio.TimerHandle] = {}
+_export_spec_ids: Dict[str, Optional[set]] = {}
+_export_locks: Dict[str, asyncio.Lock] = {}
 
-def _export_project_state(project_id: str, force: bool = False):
+def _export_project_state(project_id: str, force: bool = False, spec_ids: Optional[set] = None):
     """
     Export project state to git state branch.
 
     Args:
         project_id: Project to export state for
-        force: If True, skip debounce check
+        force: If True, export now; otherwise the export is scheduled
+            through schedule_state_export
+        spec_ids: If provided, only re-collect these specs; the others are
+            kept as they are in the state ref
     """
-    import time
-
     if project_id not in projects:
         print(f"[GitState] Project {project_id} not found")
         return
 
-    # Debounce check
-    now = time.time()
-    last_export = _pending_state_exports.get(project_id, 0)
-    if not force and (now - last_export) < _STATE_EXPORT_DEBOUNCE_SECONDS:
-        print(f"[GitState] Debouncing export for {project_id}")
+    if not force:
+        schedule_state_export(project_id, spec_ids=spec_ids)
         return
 
-    _pending_state_exports[project_id] = now
-
     try:
-        project = projects[project_id]
-        project_path = Path(project.path)
+        _write_project_state(
+            project_id, Path(projects[project_id].path), _project_state_tasks(project_id), spec_ids
+        )
+    except Exception as e:
+        print(f"[GitState] Error exporting state for {project_id}: {e}")
+        import traceback
+        traceback.print_exc()
 
-        # Initialize state manager
-        state_mgr = GitStateManager(str(project_path))
 
-        # Collect tasks for this project
-        project_tasks = []
-        for tid, task in tasks.items():
-            if task.project_id == project_id:
-                project_tasks.append({
-                    "id": tid,
-                    "specId": task.spec_id,
-                    "title": task.title,
-                    "description": task.description,
-                    "status": task.status,
-                    "projectId": project_id
-                })
+async def _export_project_state_in_thread(project_id: str, spec_ids: Optional[set] = None):
+    """
+    _export_project_state(force=True) with the git and disk work on a worker thread.
 
-        # Collect spec data for each task
-        specs = {}
-        for task_data in project_tasks:
-            spec_id = task_data["specId"]
-            spec_data = collect_spec_data(project_path, spec_id)
-            if spec_data:
-                specs[spec_id] = spec_data
+    Task rows are read on the loop thread, which owns the shared SQLite
+    connection; exports of one project run one at a time.
+    """
+    if project_id not in projects:
+        print(f"[GitState] Project {project_id} not found")
+        return
 
-        # Export to git
-        success = state_mgr.export_state(project_tasks, specs)
-        if success:
-            print(f"[GitState] Exported state for project {project_id}")
-        else:
-            print(f"[GitState] Failed to export state for project {project_id}")
+    lock = _export_locks.setdefault(project_id, asyncio.Lock())
+    async with lock:
+        try:
+            project_tasks = _project_state_tasks(project_id)
+            await asyncio.to_thread(
+                _write_project_state, project_id, Path(projects[project_id].path), project_tasks, spec_ids
+            )
+        except Exception as e:
+            print(f"[GitState] Error exporting state for {project_id}: {e}")
+            import traceback
+            traceback.print_exc()
 
-    except Exception as e:
-        print(f"[GitState] Error exporting state for {project_id}: {e}")
-        import traceback
-        traceback.print_exc()
+
+def _project_state_tasks(project_id: str) -> List[dict]:
+    """A project's tasks as they are written to the state branch."""
+    return [
+        {
+            "id": task_id,
+            "specId": spec_id,
+            "title": title,
+            "description": description,
+            "status": status,
+            "projectId": project_id
+        }
+        for task_id, spec_id, _, title, description, status in TaskService.get_rows(project_id=project_id)
+    ]
+
+
+def _write_project_state(project_id: str, project_path: Path, project_tasks: List[dict],
+                         spec_ids: Optional[set] = None):
+    """Collect spec data and write it with the tasks to the state branch (blocking)."""
+    state_mgr = GitStateManager(str(project_path))
+
+    # Collect spec data for each task
+    specs = {}
+    for task_data in project_tasks:
+        spec_id = task_data["specId"]
+        if spec_ids is not None and spec_id not in spec_ids:
+            continue
+        spec_data = collect_spec_data(project_path, spec_id)
+        if spec_data:
+            specs[spec_id] = spec_data
+
+    # Export to git
+    if not state_mgr.export_state(project_tasks, specs, spec_ids=spec_ids):
+        print(f"[GitState] Failed to export state for project {project_id}")
 
 
 def _import_project_state(project_id: str) -> bool:
@@ -490,38 +607,18 @@ def _import_project_state(project_id: str) -> bool:
         imported_specs = state.get("specs", {})
 
         # Import tasks into database
-        for task_data in imported_tasks:
-            task_id = task_data.get("id", task_data.get("specId"))
-            spec_id = task_data.get("specId", task_id)
-
-            # Check if task already exists
-            existing = TaskService.get_by_id(task_id)
-            if existing:
-                # Update existing task
-                TaskService.update(task_id, {
-                    "title": task_data.get("title", ""),
-                    "description": task_data.get("description", ""),
-                    "status": task_data.get("status", "backlog"),
-                })
-            else:
-                # Create new task
-                TaskService.create({
-                    "id": task_id,
-                    "specId": spec_id,
-                    "projectId": project_id,
-                    "title": task_data.get("title", ""),
-                    "description": task_data.get("description", ""),
-                    "status": task_data.get("status", "backlog"),
-                })
-
-            # Add to in-memory cache
-            tasks[task_id] = Task(
-                spec_id=spec_id,
-                title=task_data.get("title", ""),
-                description=task_data.get("description", ""),
-                status=task_data.get("status", "backlog"),
-                project_id=project_id
-            )
+        TaskService.bulk_upsert([
+            {
+                "id": task_data.get("id", task_data.get("specId")),
+                "specId": task_data.get("specId", task_data.get("id")),
+                "projectId": project_id,
+                "title": task_data.get("title", ""),
+                "description": task_data.get("description", ""),
+                "status": task_data.get("status", "backlog"),
+            }
+            for task_data in imported_tasks
+        ])
+        _dirty_task_projects.add(project_id)
 
         # Restore spec files
         for spec_id, spec_data in imported_specs.items():
@@ -537,22 +634,50 @@ def _import_project_state(project_id: str) -> bool:
         return False
 
 
-def schedule_state_export(project_id: str):
-    """Schedule a debounced state export for a project."""
-    import asyncio
+def schedule_state_export(project_id: str, spec_ids: Optional[set] = None):
+    """Schedule a debounced state export for a project.
 
-    async def delayed_export():
-        await asyncio.sleep(_STATE_EXPORT_DEBOUNCE_SECONDS)
-        _export_project_state(project_id, force=True)
+    Args:
+        project_id: Project to export state for
+        spec_ids: Specs known to have changed; None re-collects every spec
+    """
+    if project_id in _export_spec_ids:
+        pending = _export_spec_ids[project_id]
+        if pending is not None:
+            _export_spec_ids[project_id] = None if spec_ids is None else pending | spec_ids
+    else:
+        _export_spec_ids[project_id] = None if spec_ids is None else set(spec_ids)
 
-    asyncio.create_task(delayed_export())
+    if project_id in _export_handles:
+        return  # The burst's timer is already running
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Called outside the server loop; nothing would run the timer
+        _run_scheduled_export(project_id)
+        return
+    _export_handles[project_id] = loop.call_later(
+        _STATE_EXPORT_DEBOUNCE_SECONDS, _run_scheduled_export, project_id
+    )
+
+
+def _run_scheduled_export(project_id: str):
+    _export_handles.pop(project_id, None)
+    spec_ids = _export_spec_ids.pop(project_id, None)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        _export_project_state(project_id, force=True, spec_ids=spec_ids)
+        return
+    _spawn(_export_project_state_in_thread(project_id, spec_ids))
 
 
 async def _broadcast_task_event(action: str, task: Task, extra_data: dict = None):
     """Broadcast task event via WebSocket to all connected clients."""
     try:
-        from .websocket_handler import ws_manager
-        if ws_manager:
+        event_type = f"project.{task.project_id}.tasks"
+        # Nobody to tell: skip building the payload (and reading the plan for subtasks)
+        if ws_manager and ws_manager.has_subscribers(event_type):
             task_data = {
                 "id": task.spec_id,
                 "specId": task.spec_id,
@@ -588,25 +713,29 @@ async def _broadcast_task_event(action: str, task: Task, extra_data: dict = None
                     st["status"] = "completed"
 
                 task_data["subtasks"] = subtasks
-                print(f"[Broadcast] Including {len(subtasks)} subtasks for {task.spec_id}")
 
             await ws_manager.broadcast_event(
-                f"project.{task.project_id}.tasks",
+                event_type,
                 {"action": action, "task": task_data}
             )
-            print(f"[Broadcast] Task {action}: {task.spec_id}")
     except Exception as e:
         print(f"[Broadcast] Error: {e}")
 
 def _broadcast_task_event_sync(action: str, task: Task, extra_data: dict = None):
-    """Synchronous wrapper for broadcasting - creates task in event loop."""
-    import asyncio
+    """Synchronous wrapper for broadcasting, from the loop thread or any other thread."""
+    coro = _broadcast_task_event(action, task, extra_data)
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            asyncio.create_task(_broadcast_task_event(action, task, extra_data))
-        else:
-            loop.run_until_complete(_broadcast_task_event(action, task, extra_data))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Another thread: hand the broadcast to the server loop
+            if _main_loop is not None and _main_loop.is_running():
+                asyncio.run_coroutine_threadsafe(coro, _main_loop)
+            else:
+                coro.close()
+                print("[Broadcast] No running event loop, event dropped")
+            return
+        _spawn(coro)
     except Exception as e:
         print(f"[Broadcast] Sync wrapper error: {e}")
 
@@ -628,72 +757,84 @@ def _sync_tasks_from_disk():
     Discover tasks from project spec directories and sync to database.
 
     This ensures tasks created via CLI or other means are properly tracked.
-    Scans each project's .auto-claude/specs/ directory for task specs.
+    Scans each project's .auto-claude/specs/ directory for task specs, one
+    project per worker thread since the scan is all file I/O.
     """
-    global tasks
-    synced_count = 0
+    # Everything already in the database, read once: ids (composite keys
+    # and legacy spec ids) and (project_id, spec_id) pairs
+    known_ids = set()
+    known_specs = set()
+    for t in TaskService.get_all(include_archived=True):
+        known_ids.add(t["id"])
+        known_specs.add((t["projectId"], t["specId"]))
+
+    if not projects:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(32, len(projects))) as pool:
+        scans = pool.map(
+            lambda item: _scan_project_specs(item[0], item[1], known_ids, known_specs),
+            list(projects.items())
+        )
+        new_tasks = [task_row for scan in scans for task_row in scan]
 
-    for project_id, project in projects.items():
-        project_path = Path(project.path)
-        specs_dir = project_path / ".auto-claude" / "specs"
+    if not new_tasks:
+        return 0
 
-        if not specs_dir.exists():
-            continue
+    # One transaction for the whole scan
+    try:
+        TaskService.create_many(new_tasks)
+    except Exception as e:
+        print(f"[Tasks] Error syncing tasks from disk: {e}")
+        return 0
+    _dirty_task_projects.update(t["projectId"] for t in new_tasks)
 
-        # Scan all spec directories
-        for spec_dir in specs_dir.iterdir():
-            if not spec_dir.is_dir():
-                continue
+    print(f"[Tasks] Synced {len(new_tasks)} tasks from disk to database")
+    return len(new_tasks)
 
-            spec_id = spec_dir.name
 
-            # Use composite key to allow same spec_id across different projects
-            task_key = f"{project_id}:{spec_id}"
+def _scan_project_specs(project_id: str, project: Project, known_ids: set, known_specs: set) -> List[dict]:
+    """Task rows for a project's spec directories that aren't in the database yet."""
+    specs_dir = Path(project.path) / ".auto-claude" / "specs"
+    if not specs_dir.exists():
+        return []
 
-            # Skip if already in database/memory for THIS project
-            # Check both composite key (new format) AND legacy spec_id (old format)
-            if task_key in tasks:
-                continue
+    new_tasks = []
+    # Scan all spec directories; DirEntry carries the file type, so no stat per entry
+    with os.scandir(specs_dir) as entries:
+        spec_entries = [entry for entry in entries if entry.is_dir()]
 
-            # Also check for legacy entries where id == spec_id
-            legacy_task = next(
-                (t for t in tasks.values()
-                 if t.spec_id == spec_id and t.project_id == project_id),
-                None
-            )
-            if legacy_task:
-                continue
+    for entry in spec_entries:
+        spec_dir = Path(entry.path)
+        spec_id = entry.name
 
-            # Try to load task info from spec files
-            task_data = _load_task_from_spec_dir(spec_dir, project_id)
-            if task_data:
-                # Add to database with composite key as id
-                try:
-                    TaskService.create({
-                        "id": task_key,
-                        "specId": spec_id,
-                        "title": task_data["title"],
-                        "description": task_data["description"],
-                        "status": task_data["status"],
-                        "projectId": project_id,
-                    })
-
-                    # Add to in-memory cache with composite key
-                    tasks[task_key] = Task(
-                        spec_id=spec_id,
-                        title=task_data["title"],
-                        description=task_data["description"],
-                        status=task_data["status"],
-                        project_id=project_id
-                    )
-                    synced_count += 1
-                    print(f"[Tasks] Synced from disk: {spec_id[:8]}... ({task_data['status']}) - {task_data['title'][:40]}")
-                except Exception as e:
-                    print(f"[Tasks] Error syncing task {spec_id}: {e}")
+        # Use composite key to allow same spec_id across different projects
+        task_key = f"{project_id}:{spec_id}"
+
+        # Skip if already in database for THIS project
+        # Check both composite key (new format) AND legacy spec_id (old format)
+        if task_key in known_ids or (project_id, spec_id) in known_specs:
+            continue
+
+        # Try to load task info from spec files
+        task_data = _load_task_from_spec_dir(spec_dir, project_id)
+        if task_data:
+            # Added to the database by the caller with composite key as id
+            new_tasks.append({
+                "id": task_key,
+                "specId": spec_id,
+                "title": task_data["title"],
+                "description": task_data["description"],
+                "status": task_data["status"],
+                "projectId": project_id,
+            })
 
-    if synced_count > 0:
-        print(f"[Tasks] Synced {synced_count} tasks from disk to database")
-    return synced_count
+    return new_tasks
+
+
+# Bytes of spec.md searched for the task title (one page)
+_SPEC_TITLE_SCAN_BYTES = 4096
+# First "# <title>" or "# Specification: <title>" heading line
+_SPEC_TITLE_RE = re.compile(rb"^# (?:Specification:)?[ \t]*(.*?)\s*$", re.MULTILINE)
 
 
 def _load_task_from_spec_dir(spec_dir: Path, project_id: str) -> dict | None:
@@ -710,40 +851,40 @@ def _load_task_from_spec_dir(spec_dir: Path, project_id: str) -> dict | None:
     description = ""
     status = "backlog"
 
-    # Try to get title from spec.md
-    spec_file = spec_dir / "spec.md"
-    if spec_file.exists():
-        try:
-            content = spec_file.read_text()
-            # Look for "# Specification: <title>" pattern
-            for line in content.split('\n'):
-                if line.startswith('# Specification:'):
-                    title = line.replace('# Specification:', '').strip()
-                    break
-                elif line.startswith('# '):
-                    title = line.replace('# ', '').strip()
-                    break
-        except Exception:
-            pass
+    # Try to get title from spec.md; the heading is near the top, so only
+    # the first _SPEC_TITLE_SCAN_BYTES are read
+    try:
+        with open(spec_dir / "spec.md", "rb") as f:
+            head = f.read(_SPEC_TITLE_SCAN_BYTES)
+        if len(head) == _SPEC_TITLE_SCAN_BYTES:
+            head = head[:head.rfind(b"\n") + 1]  # Last line may be cut off
+        match = _SPEC_TITLE_RE.search(head)
+        if match:
+            title = match.group(1).decode("utf-8", errors="replace")
+    except Exception:
+        pass
 
     # Try to get description from requirements.json
-    req_file = spec_dir / "requirements.json"
-    if req_file.exists():
-        try:
-            with open(req_file) as f:
-                req_data = json.load(f)
-                description = req_data.get("task_description", "")
-        except Exception:
-            pass
+    try:
+        req_data = json_loads((spec_dir / "requirements.json").read_bytes())
+        description = req_data.get("task_description", "")
+    except Exception:
+        pass
 
     # Determine status from task_logs.json and review_state.json
     logs_file = spec_dir / "task_logs.json"
     review_file = spec_dir / "review_state.json"
 
-    if logs_file.exists():
+    try:
+        logs = json_loads(logs_file.read_bytes())
+    except FileNotFoundError:
+        logs = None
+    except Exception as e:
+        logs = None
+        print(f"[Tasks] Error reading logs for {spec_id}: {e}")
+
+    if logs is not None:
         try:
-            with open(logs_file) as f:
-                logs = json.load(f)
             phases = logs.get("phases", {})
 
             # Check implementation phase first
@@ -754,17 +895,13 @@ def _load_task_from_spec_dir(spec_dir: Path, project_id: str) -> dict | None:
                 status = "in_progress"
             elif phases.get("planning", {}).get("status") == "completed":
                 # Planning done - check if approved
-                if review_file.exists():
-                    try:
-                        with open(review_file) as f:
-                            review = json.load(f)
-                        if review.get("approved"):
-                            status = "in_progress"  # Ready to implement
-                        else:
-                            status = "human_review"
-                    except Exception:
+                try:
+                    review = json_loads(review_file.read_bytes())
+                    if review.get("approved"):
+                        status = "in_progress"  # Ready to implement
+                    else:
                         status = "human_review"
-                else:
+                except Exception:
                     status = "human_review"
             elif phases.get("planning", {}).get("status") == "in_progress":
                 status = "in_progress"
@@ -790,10 +927,37 @@ def _save_tab_state():
         else:
             data = {"openProjectIds": [], "activeProjectId": None, "tabOrder": []}
         TabStateService.save(data)
-        print(f"[TabState] Saved tab state to database")
     except Exception as e:
         print(f"[TabState] Error saving tab state: {e}")
 
+_TAB_STATE_SAVE_DEBOUNCE_SECONDS = 0.25
+_tab_state_save_handle: Optional[asyncio.TimerHandle] = None
+
+def schedule_tab_state_save():
+    """Schedule a debounced tab state save; a burst of tab changes is written once."""
+    global _tab_state_save_handle
+    if _tab_state_save_handle is not None:
+        return  # The pending save will write the latest tab_state
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _save_tab_state()
+        return
+    _tab_state_save_handle = loop.call_later(
+        _TAB_STATE_SAVE_DEBOUNCE_SECONDS, _run_scheduled_tab_state_save
+    )
+
+def _run_scheduled_tab_state_save():
+    global _tab_state_save_handle
+    _tab_state_save_handle = None
+    _save_tab_state()
+
+def flush_tab_state():
+    """Write a pending tab state save now (used on shutdown)."""
+    if _tab_state_save_handle is not None:
+        _tab_state_save_handle.cancel()
+        _run_scheduled_tab_state_save()
+
 def _load_tab_state():
     """Load tab state from database"""
     global tab_state
@@ -804,30 +968,33 @@ def _load_tab_state():
             activeProjectId=data.get("activeProjectId"),
             tabOrder=data.get("tabOrder", [])
         )
-        print(f"[TabState] Loaded tab state from database")
         return True
     except Exception as e:
         print(f"[TabState] Error loading tab state: {e}")
     return False
 
+# Encoded form of each project as last written by _save_projects
+_saved_project_rows: Dict[str, bytes] = {}
+
 def _save_projects():
-    """Save all projects to database (batch update from in-memory cache)"""
+    """Save changed projects to database (batch update from in-memory cache)"""
     try:
-        for pid, project in projects.items():
-            # Check if project exists in database
-            existing = ProjectService.get_by_id(pid)
-            project_data = {
+        rows = {
+            pid: {
                 "id": pid,
                 "name": project.name,
                 "path": project.path,
                 "autoBuildPath": project.autoBuildPath,
                 "settings": project.settings,
             }
-            if existing:
-                ProjectService.update(pid, project_data)
-            else:
-                ProjectService.create(project_data)
-        print(f"[Projects] Saved {len(projects)} projects to database")
+            for pid, project in projects.items()
+        }
+        # Settings are mutated in place, so compare encoded snapshots
+        encoded = {pid: json_dumps(row, sort_keys=True) for pid, row in rows.items()}
+        changed = [pid for pid, data in encoded.items() if _saved_project_rows.get(pid) != data]
+        ProjectService.bulk_upsert([rows[pid] for pid in changed])
+        _saved_project_rows.clear()
+        _saved_project_rows.update(encoded)
     except Exception as e:
         print(f"[Projects] Error saving projects: {e}")
 
@@ -857,18 +1024,20 @@ def _load_projects_from_db():
     """Load projects from database into in-memory cache"""
     global projects
     try:
-        db_projects = ProjectService.get_all()
+        # Datetime columns come back as datetimes; no isoformat round trip
+        now = datetime.now()
         projects = {
-            p["id"]: Project(
-                id=p["id"],
-                name=p["name"],
-                path=p["path"],
-                autoBuildPath=p.get("autoBuildPath", ""),
-                settings=p.get("settings", {}),
-                created_at=datetime.fromisoformat(p["createdAt"]) if p.get("createdAt") else datetime.now(),
-                updated_at=datetime.fromisoformat(p["updatedAt"]) if p.get("updatedAt") else None
+            project_id: Project(
+                id=project_id,
+                name=name,
+                path=path,
+                autoBuildPath=auto_build_path,
+                settings=settings or {},
+                created_at=created_at or now,
+                updated_at=updated_at
             )
-            for p in db_projects
+            for project_id, name, path, auto_build_path, settings, created_at, updated_at
+            in ProjectService.get_rows()
         }
         print(f"[Projects] Loaded {len(projects)} projects from database")
         return True
@@ -893,14 +1062,8 @@ def _recover_orphaned_tasks():
     Since active_builds is empty at startup, any task showing 'in_progress'
     is orphaned (process was killed) and should be reset to backlog.
     """
-    recovered_count = 0
-    for task_id, task in tasks.items():
-        if task.status == "in_progress":
-            print(f"[Tasks] Recovering orphaned task: {task.title} ({task_id[:8]}...)")
-            task.status = "backlog"
-            # Save directly to database via TaskStore
-            tasks[task_id] = task
-            recovered_count += 1
+    # One UPDATE instead of reading every task and writing each back
+    recovered_count = TaskService.reset_in_progress()
 
     if recovered_count > 0:
         print(f"[Tasks] Recovered {recovered_count} orphaned task(s)")
@@ -1080,7 +1243,7 @@ async def save_tab_state_endpoint(state: TabState):
     """Save the current tab state"""
     global tab_state
     tab_state = state
-    _save_tab_state()
+    schedule_tab_state_save()
 
     return {"success": True}
 
@@ -1093,8 +1256,6 @@ async def get_project(project_id: str):
 @app.delete("/api/projects/{project_id}")
 async def delete_project(project_id: str):
     """Delete a project and its files from disk"""
-    import shutil
-
     if project_id not in projects:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -1105,19 +1266,12 @@ async def delete_project(project_id: str):
     del projects[project_id]
     _save_projects()
 
-    # Delete project files from disk
-    deleted_files = False
-    if project_path.exists():
-        try:
-            shutil.rmtree(project_path)
-            deleted_files = True
-            print(f"[Projects] Deleted project files: {project_path}")
-        except Exception as e:
-            print(f"[Projects] Warning: Failed to delete project files at {project_path}: {e}")
+    # Delete project files from disk; the walk can take seconds, so off the loop
+    deleted_files = await asyncio.to_thread(_remove_project_files, project_path)
 
     # Also clean up any tasks associated with this project
     global tasks
-    tasks_to_remove = [tid for tid, task in tasks.items() if task.project_id == project_id]
+    tasks_to_remove = [tid for tid, _ in tasks.items(project_id)]
     for tid in tasks_to_remove:
         del tasks[tid]
         try:
@@ -1129,6 +1283,21 @@ async def delete_project(project_id: str):
 
     return {"success": True, "deletedFiles": deleted_files}
 
+def _remove_project_files(project_path: Path) -> bool:
+    """Delete a project's directory tree; False if it was missing or not removed (blocking)."""
+    import shutil
+
+    try:
+        # rmtree already walks with scandir and fd-relative unlinks on Linux
+        shutil.rmtree(project_path)
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        print(f"[Projects] Warning: Failed to delete project files at {project_path}: {e}")
+        return False
+    print(f"[Projects] Deleted project files: {project_path}")
+    return True
+
 @app.post("/api/projects/create-folder")
 async def create_project_folder(request: ProjectCreateFolderRequest):
     """
@@ -1148,7 +1317,8 @@ async def create_project_folder(request: ProjectCreateFolderRequest):
 
         # Initialize git if requested
         if request.initGit:
-            subprocess.run(
+            await asyncio.to_thread(
+                subprocess.run,
                 ["git", "init"],
                 cwd=str(project_path),
                 check=True,
@@ -1196,33 +1366,45 @@ async def list_project_directory(project_id: str, path: Optional[str] = None):
         raise HTTPException(status_code=400, detail="Path is not a directory")
 
     try:
-        entries = []
-        for item in target_path.iterdir():
-            # Skip hidden files (starting with .)
-            if item.name.startswith('.'):
-                continue
-
-            entry = {
-                "name": item.name,
-                "path": str(item.relative_to(base_path)),
-                "type": "directory" if item.is_dir() else "file",
-            }
-
-            if item.is_file():
-                entry["size"] = item.stat().st_size
-
-            entries.append(entry)
-
-        # Sort: directories first, then files, alphabetically
-        entries.sort(key=lambda x: (x["type"] != "directory", x["name"].lower()))
-
         return {
             "success": True,
-            "data": entries
+            "data": await asyncio.to_thread(_list_directory, target_path, base_path)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list directory: {str(e)}")
 
+# _list_directory rows are (is_file, name_lower, name, size); sorting on the
+# first two puts directories first, then names case-insensitively
+_DIR_ENTRY_SORT_KEY = operator.itemgetter(0, 1)
+
+def _list_directory(target_path: Path, base_path: Path) -> List[dict]:
+    """Visible entries of target_path, directories first (blocking)."""
+    rows = []
+    rel_dir = os.path.relpath(target_path, base_path)
+    prefix = "" if rel_dir == "." else rel_dir + os.sep
+    # DirEntry carries the file type from the directory read; only files are stat'ed
+    with os.scandir(target_path) as it:
+        for item in it:
+            name = item.name
+            # Skip hidden files (starting with .)
+            if name[0] == '.':
+                continue
+            if item.is_dir():
+                rows.append((False, name.lower(), name, None))
+            else:
+                rows.append((True, name.lower(), name, item.stat().st_size if item.is_file() else None))
+
+    rows.sort(key=_DIR_ENTRY_SORT_KEY)
+
+    # Entry dicts are built once, in their final order
+    entries = []
+    for is_file, _, name, size in rows:
+        entry = {"name": name, "path": prefix + name, "type": "file" if is_file else "directory"}
+        if size is not None:
+            entry["size"] = size
+        entries.append(entry)
+    return entries
+
 @app.patch("/api/projects/{project_id}/settings")
 async def update_project_settings(project_id: str, updates: dict):
     """
@@ -1284,7 +1466,7 @@ async def initialize_project(project_id: str):
 
         # Initialize git state branch (creates AUTO-CLAUDE-STATE.md and hidden ref)
         state_mgr = GitStateManager(str(project_path))
-        state_initialized = state_mgr.init_state_ref()
+        state_initialized = await asyncio.to_thread(state_mgr.init_state_ref)
         print(f"[Init] Git state branch initialized: {state_initialized}")
 
         # Set up default claude settings in database
@@ -1390,6 +1572,35 @@ async def check_project_version(project_id: str):
 
 # Tasks
 
+# Parsed plan and task log files, reused while a file's (mtime_ns, size) is
+# unchanged; task listings and the build monitor re-read them far more often
+# than the runner writes them
+_JSON_FILE_CACHE_SIZE = 256
+_json_file_cache: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+_json_file_cache_lock = threading.Lock()
+
+def _read_json_cached(path: Path) -> Any:
+    """Parse a JSON file, or return its last parse if it hasn't changed since.
+
+    Raises FileNotFoundError if the file doesn't exist. Callers must not
+    mutate the result.
+    """
+    st = os.stat(path)
+    key = str(path)
+    with _json_file_cache_lock:
+        cached = _json_file_cache.get(key)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            _json_file_cache.move_to_end(key)
+            return cached[2]
+
+    data = json_loads(path.read_bytes())
+    with _json_file_cache_lock:
+        _json_file_cache[key] = (st.st_mtime_ns, st.st_size, data)
+        _json_file_cache.move_to_end(key)
+        if len(_json_file_cache) > _JSON_FILE_CACHE_SIZE:
+            _json_file_cache.popitem(last=False)
+    return data
+
 def _get_subtasks_from_plan(project_path: str, spec_id: str) -> list:
     """Read subtasks from implementation_plan.json"""
     subtasks = []
@@ -1415,10 +1626,11 @@ def _get_subtasks_from_plan(project_path: str, spec_id: str) -> list:
 
         plan_data = None
         for plan_path in plan_paths:
-            if plan_path.exists():
-                with open(plan_path) as f:
-                    plan_data = json.load(f)
-                break
+            try:
+                plan_data = _read_json_cached(plan_path)
+            except FileNotFoundError:
+                continue
+            break
 
         if not plan_data:
             return []
@@ -1539,10 +1751,14 @@ def _get_execution_progress(project_path: str, spec_id: str) -> dict:
                 logs_path = candidate_spec / "task_logs.json"
 
         # If we have task_logs.json, use it
-        if logs_path and logs_path.exists():
-            with open(logs_path) as f:
-                logs_data = json.load(f)
+        logs_data = None
+        if logs_path:
+            try:
+                logs_data = _read_json_cached(logs_path)
+            except FileNotFoundError:
+                pass
 
+        if logs_data is not None:
             phases = logs_data.get("phases", {})
             current_phase = "planning"
             completed = 0
@@ -1612,49 +1828,56 @@ async def list_tasks(project_id: str):
     if project_id in projects:
         project_path = projects[project_id].path
 
-    project_tasks = []
-    for t in tasks.values():
-        if t.project_id == project_id:
-            subtasks = []
-            execution_progress = None
-
-            # Sync status from worktree if available
-            if project_path:
-                subtasks = _sync_task_status_from_worktree(t, project_path)
-                # Get execution progress
-                if t.status == "in_progress":
-                    execution_progress = _get_execution_progress(project_path, t.spec_id)
-
-            # Convert to frontend format with subtasks
-            task_data = task_to_frontend(t)
-
-            # For completed tasks, ensure subtasks are present to avoid "incomplete" status
-            if t.status in ("ai_review", "human_review", "done"):
-                if not subtasks:
-                    # Add placeholder when no subtasks found (clone cleaned up)
-                    subtasks = [{
-                        "id": "task-complete",
-                        "title": "Task completed",
-                        "description": t.title,
-                        "status": "completed",
-                        "files": []
-                    }]
-                else:
-                    # Mark all subtasks as completed
-                    for st in subtasks:
-                        st["status"] = "completed"
-
-            if subtasks:
-                task_data["subtasks"] = subtasks
-            if execution_progress:
-                task_data["executionProgress"] = execution_progress
-            project_tasks.append(task_data)
+    # Worktree status files and plans are read on a worker thread
+    project_tasks = await asyncio.to_thread(
+        _tasks_to_frontend, tasks.values(project_id), project_path
+    )
 
     # Save any status changes
     _save_tasks()
 
     return project_tasks  # Return array directly, not wrapped
 
+def _tasks_to_frontend(project_tasks: List[Task], project_path: Optional[str]) -> List[dict]:
+    """Frontend entries for a project's tasks, with worktree status synced (blocking)."""
+    entries = []
+    for t in project_tasks:
+        subtasks = []
+        execution_progress = None
+
+        # Sync status from worktree if available
+        if project_path:
+            subtasks = _sync_task_status_from_worktree(t, project_path)
+            # Get execution progress
+            if t.status == "in_progress":
+                execution_progress = _get_execution_progress(project_path, t.spec_id)
+
+        # Convert to frontend format with subtasks
+        task_data = task_to_frontend(t)
+
+        # For completed tasks, ensure subtasks are present to avoid "incomplete" status
+        if t.status in ("ai_review", "human_review", "done"):
+            if not subtasks:
+                # Add placeholder when no subtasks found (clone cleaned up)
+                subtasks = [{
+                    "id": "task-complete",
+                    "title": "Task completed",
+                    "description": t.title,
+                    "status": "completed",
+                    "files": []
+                }]
+            else:
+                # Mark all subtasks as completed
+                for st in subtasks:
+                    st["status"] = "completed"
+
+        if subtasks:
+            task_data["subtasks"] = subtasks
+        if execution_progress:
+            task_data["executionProgress"] = execution_progress
+        entries.append(task_data)
+    return entries
+
 @app.post("/api/tasks")
 async def create_task(request: TaskCreateRequest):
     import uuid
@@ -1746,7 +1969,8 @@ async def start_task(task_id: str):
             base_branch = "dev"
             try:
                 # Check if dev branch exists
-                result = subprocess.run(
+                result = await asyncio.to_thread(
+                    subprocess.run,
                     ["git", "rev-parse", "--verify", "dev"],
                     cwd=project_path,
                     capture_output=True,
@@ -1758,7 +1982,7 @@ async def start_task(task_id: str):
             except Exception:
                 base_branch = "main"
 
-            clone_path = clone_mgr.create_clone(task_id, feature_branch, base_branch)
+            clone_path = await asyncio.to_thread(clone_mgr.create_clone, task_id, feature_branch, base_branch)
             print(f"[Task Runner] Created clone at {clone_path} on branch {feature_branch}")
 
             # Store clone info for later reference
@@ -1872,7 +2096,7 @@ async def start_task(task_id: str):
         print(f"[Task Runner] Process started with PID {proc.pid}")
 
         # Start background task to monitor the process
-        asyncio.create_task(_monitor_task_process(
+        _spawn(_monitor_task_process(
             task_id,
             proc,
             clone_path=clone_path,
@@ -1997,7 +2221,7 @@ async def plan_task(task_id: str):
         print(f"[Task Planner] Process started with PID {proc.pid}")
 
         # Start background task to monitor the planning process
-        asyncio.create_task(_monitor_plan_process(task_id, proc))
+        _spawn(_monitor_plan_process(task_id, proc))
 
         return {
             "success": True,
@@ -2013,13 +2237,58 @@ async def plan_task(task_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to start planning: {str(e)}")
 
 
+_MONITOR_POLL_SECONDS = 2.0
+_MONITOR_HEARTBEAT_SECONDS = 30.0
+_RUNNER_OUTPUT_TAIL_LINES = 20
+
+class _RunnerOutput:
+    """Drains a runner's stdout on a thread and wakes the monitor on new output.
+
+    Nothing else reads the pipe, and a runner blocks once it is full. Progress
+    is re-checked as soon as the runner writes instead of on the next poll, and
+    the last lines are kept for the failure message.
+    """
+
+    def __init__(self, proc: subprocess.Popen):
+        self.activity = asyncio.Event()
+        self.tail = deque(maxlen=_RUNNER_OUTPUT_TAIL_LINES)
+        self._loop = asyncio.get_running_loop()
+        if proc.stdout is not None:
+            threading.Thread(target=self._pump, args=(proc.stdout,), daemon=True).start()
+
+    def _pump(self, stream):
+        try:
+            for line in stream:
+                self.tail.append(line.rstrip("\n"))
+                if not self.activity.is_set():
+                    self._wake()
+        except (OSError, ValueError):
+            pass  # Pipe closed under us (process stopped)
+        self._wake()  # EOF: the process is exiting
+
+    def _wake(self):
+        try:
+            self._loop.call_soon_threadsafe(self.activity.set)
+        except RuntimeError:
+            pass  # Loop already closed (shutdown)
+
+    async def wait(self, timeout: float):
+        """Wait until the runner writes something, or timeout seconds."""
+        try:
+            await asyncio.wait_for(self.activity.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.activity.clear()
+
+
 async def _monitor_plan_process(task_id: str, proc: subprocess.Popen):
     """Monitor a planning process and update status when complete"""
     import asyncio
 
     print(f"[Plan Monitor] Started monitoring planning for task {task_id} (PID {proc.pid})")
 
-    poll_count = 0
+    output = _RunnerOutput(proc)
+    last_heartbeat = time.monotonic()
 
     # Get project info
     project_path = None
@@ -2032,8 +2301,9 @@ async def _monitor_plan_process(task_id: str, proc: subprocess.Popen):
     try:
         # Wait for process to complete
         while proc.poll() is None:
-            poll_count += 1
-            if poll_count % 15 == 0:  # Log every 30 seconds
+            heartbeat = time.monotonic() - last_heartbeat >= _MONITOR_HEARTBEAT_SECONDS
+            if heartbeat:
+                last_heartbeat = time.monotonic()
                 print(f"[Plan Monitor] Task {task_id} planning still running (PID {proc.pid})")
 
             # Broadcast planning progress updates
@@ -2041,7 +2311,6 @@ async def _monitor_plan_process(task_id: str, proc: subprocess.Popen):
                 try:
                     progress = _get_execution_progress(project_path, task_id)
                     if progress:
-                        from .websocket_handler import ws_manager
                         if ws_manager:
                             await ws_manager.broadcast_event(
                                 f"project.{project_id}.tasks",
@@ -2057,13 +2326,15 @@ async def _monitor_plan_process(task_id: str, proc: subprocess.Popen):
                                 }
                             )
                 except Exception as e:
-                    if poll_count % 15 == 0:
+                    if heartbeat:
                         print(f"[Plan Monitor] Error reading progress: {e}")
 
-            await asyncio.sleep(2)
+            await output.wait(_MONITOR_POLL_SECONDS)
 
         exit_code = proc.returncode
         print(f"[Plan Monitor] Task {task_id} planning completed with exit code {exit_code}")
+        if exit_code != 0 and output.tail:
+            print("[Plan Monitor] Runner output (last lines):\n" + "\n".join(output.tail))
 
         # Remove from active builds
         if task_id in active_builds:
@@ -2080,14 +2351,13 @@ async def _monitor_plan_process(task_id: str, proc: subprocess.Popen):
                 print(f"[Plan Monitor] Task {task_id} planning complete, moved to human_review (plan_review)")
 
                 # Schedule state export to git
-                schedule_state_export(project_id)
+                schedule_state_export(project_id, spec_ids={task_id})
             else:
                 task = tasks.update_status(task_id, "backlog")  # Failed, needs retry
                 print(f"[Plan Monitor] Task {task_id} planning failed, status set to backlog")
 
             # Broadcast task status change via WebSocket
             try:
-                from .websocket_handler import ws_manager
                 if ws_manager:
                     task = tasks[task_id]
                     task_data = {
@@ -2100,7 +2370,7 @@ async def _monitor_plan_process(task_id: str, proc: subprocess.Popen):
                     if hasattr(task, 'review_reason') and task.review_reason:
                         task_data["reviewReason"] = task.review_reason
 
-                    asyncio.create_task(ws_manager.broadcast_event(
+                    _spawn(ws_manager.broadcast_event(
                         f"project.{task.project_id}.tasks",
                         {
                             "action": "updated",
@@ -2134,7 +2404,8 @@ async def _monitor_task_process(
     if clone_path:
         print(f"[Task Monitor] Clone path: {clone_path}, branch: {feature_branch}")
 
-    poll_count = 0
+    output = _RunnerOutput(proc)
+    last_heartbeat = time.monotonic()
     last_phase = None
 
     # Get project path for this task
@@ -2146,10 +2417,12 @@ async def _monitor_task_process(
             project_path = projects[project_id].path
 
     try:
-        # Wait for process to complete (check every 2 seconds)
+        # Wait for process to complete, re-checking progress when the runner
+        # writes output (or every _MONITOR_POLL_SECONDS)
         while proc.poll() is None:
-            poll_count += 1
-            if poll_count % 15 == 0:  # Log every 30 seconds
+            heartbeat = time.monotonic() - last_heartbeat >= _MONITOR_HEARTBEAT_SECONDS
+            if heartbeat:
+                last_heartbeat = time.monotonic()
                 print(f"[Task Monitor] Task {task_id} still running (PID {proc.pid})")
 
             # Poll execution progress from task_logs.json and broadcast updates
@@ -2176,9 +2449,8 @@ async def _monitor_task_process(
                         if worktree_logs.exists():
                             logs_path = worktree_logs
 
-                    if logs_path and logs_path.exists():
-                        with open(logs_path) as f:
-                            logs_data = json.load(f)
+                    if logs_path:
+                        logs_data = _read_json_cached(logs_path)
 
                         phases = logs_data.get("phases", {})
                         current_phase = "planning"
@@ -2203,7 +2475,6 @@ async def _monitor_task_process(
                             last_phase = current_phase
                             print(f"[Task Monitor] Task {task_id} phase: {current_phase}")
 
-                            from .websocket_handler import ws_manager
                             if ws_manager:
                                 await ws_manager.broadcast_event(
                                     f"project.{project_id}.tasks",
@@ -2224,13 +2495,15 @@ async def _monitor_task_process(
                                     }
                                 )
                 except Exception as e:
-                    if poll_count % 15 == 0:  # Only log errors occasionally
+                    if heartbeat:  # Only log errors occasionally
                         print(f"[Task Monitor] Error reading progress: {e}")
 
-            await asyncio.sleep(2)
+            await output.wait(_MONITOR_POLL_SECONDS)
 
         exit_code = proc.returncode
         print(f"[Task Monitor] Task {task_id} completed with exit code {exit_code}")
+        if exit_code != 0 and output.tail:
+            print("[Task Monitor] Runner output (last lines):\n" + "\n".join(output.tail))
 
         # If using clone-based execution, push the branch to remote
         if clone_path and get_clone_manager and project_path:
@@ -2258,17 +2531,16 @@ async def _monitor_task_process(
                 print(f"[Task Monitor] Task {task_id} status updated to ai_review")
 
                 # Schedule state export to git
-                schedule_state_export(project_id)
+                schedule_state_export(project_id, spec_ids={task_id})
 
                 # Trigger AI review in the background
-                asyncio.create_task(_run_ai_review(task_id, project_id))
+                _spawn(_run_ai_review(task_id, project_id))
             else:
                 task = tasks.update_status(task_id, "backlog")  # Failed, needs retry
                 print(f"[Task Monitor] Task {task_id} failed, status set to backlog")
 
             # Broadcast task status change via WebSocket
             try:
-                from .websocket_handler import ws_manager
                 if ws_manager:
                     # Get project path for subtasks
                     project_path = None
@@ -2296,7 +2568,7 @@ async def _monitor_task_process(
                     if feature_branch:
                         task_data["featureBranch"] = feature_branch
 
-                    asyncio.create_task(ws_manager.broadcast_event(
+                    _spawn(ws_manager.broadcast_event(
                         f"project.{task.project_id}.tasks",
                         {
                             "action": "updated",
@@ -2433,7 +2705,7 @@ async def _run_ai_review(task_id: str, project_id: str):
                 print(f"[AI Review] Task {task_id} PASSED QA review")
                 task = tasks.update_status(task_id, "human_review")
                 # Export state to git on significant status change
-                schedule_state_export(project_id)
+                schedule_state_export(project_id, spec_ids={task_id})
                 if task:
                     await _broadcast_task_event("updated", task)
             else:
@@ -2532,7 +2804,6 @@ async def delete_task(task_id: str):
 
     # Broadcast task deleted
     try:
-        from .websocket_handler import ws_manager
         if ws_manager:
             await ws_manager.broadcast_event(
                 f"project.{project_id}.tasks",
@@ -2563,7 +2834,7 @@ async def submit_task_review(task_id: str, review_data: dict):
         task.status = "done"
         _save_tasks()
         # Export final state to git
-        schedule_state_export(task.project_id)
+        schedule_state_export(task.project_id, spec_ids={task.spec_id})
         await _broadcast_task_event("updated", task)
         return {"success": True}
 
@@ -2690,7 +2961,7 @@ async def export_project_state_api(project_id: str):
         raise HTTPException(status_code=404, detail="Project not found")
 
     try:
-        _export_project_state(project_id, force=True)
+        await _export_project_state_in_thread(project_id)
         return {"success": True, "message": f"State exported for {project_id}"}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -2723,7 +2994,7 @@ async def push_project_state_api(project_id: str):
         state_mgr = GitStateManager(project.path)
 
         # Export first to ensure state is current
-        _export_project_state(project_id, force=True)
+        await _export_project_state_in_thread(project_id)
 
         # Then push
         success = state_mgr.push_state()
@@ -3624,7 +3895,6 @@ async def websocket_build_progress(websocket: WebSocket, spec_id: str):
                             # Also broadcast to project-level subscription for TaskCard updates
                             if spec_id in tasks:
                                 task = tasks[spec_id]
-                                from .websocket_handler import ws_manager
                                 if ws_manager:
                                     await ws_manager.broadcast_event(
                                         f"project.{task.project_id}.tasks",
@@ -3772,4 +4042,4 @@ async def get_project_context(project_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
@@ -10,7 +10,6 @@ Protocol:
 
 from fastapi import WebSocket, WebSocketDisconnect
 from typing import Dict, Any, Callable, Optional
-import json
 import asyncio
 import traceback
 import subprocess
@@ -18,6 +17,9 @@ from datetime import datetime
 from pathlib import Path
 from pydantic import BaseModel
 
+from .json_codec import json_dumps
+from .github_auth import parse_gh_user
+
 
 def serialize_for_json(obj: Any) -> Any:
     """Convert Pydantic models and other objects to JSON-serializable format."""
@@ -34,6 +36,11 @@ def serialize_for_json(obj: Any) -> Any:
     return obj
 
 
+def _encode_message(message: dict) -> str:
+    """Encode an outgoing message; values JSON can't represent are sent as str()."""
+    return json_dumps(message, default=str).decode("utf-8")
+
+
 class WebSocketManager:
     """Manages WebSocket connections and message routing."""
 
@@ -85,7 +92,11 @@ class WebSocketManager:
         if error is not None:
             response["error"] = error
         # Use custom JSON serialization to handle datetime, etc.
-        await websocket.send_text(json.dumps(response, default=str))
+        await websocket.send_text(_encode_message(response))
+
+    def has_subscribers(self, event_type: str) -> bool:
+        """Whether a broadcast of event_type would reach any connection."""
+        return bool(self.subscriptions.get(event_type) or self.subscriptions.get('*'))
 
     async def broadcast_event(self, event_type: str, data: Any):
         """Broadcast an event to all subscribed connections."""
@@ -99,16 +110,18 @@ class WebSocketManager:
         if not all_subscribers:
             return
 
+        # Encode once for every subscriber
+        msg_text = _encode_message({
+            "type": "event",
+            "event": event_type,
+            "data": serialize_for_json(data)
+        })
+
         dead_connections = []
         for conn_id in all_subscribers:
             if conn_id in self.connections:
                 try:
-                    event_msg = {
-                        "type": "event",
-                        "event": event_type,
-                        "data": serialize_for_json(data)
-                    }
-                    await self.connections[conn_id].send_text(json.dumps(event_msg, default=str))
+                    await self.connections[conn_id].send_text(msg_text)
                 except Exception as e:
                     dead_connections.append(conn_id)
             else:
@@ -127,7 +140,7 @@ class WebSocketManager:
                     "event": event_type,
                     "data": serialize_for_json(data)
                 }
-                await self.connections[connection_id].send_text(json.dumps(event_msg, default=str))
+                await self.connections[connection_id].send_text(_encode_message(event_msg))
             except Exception:
                 self.disconnect(connection_id)
 
@@ -139,7 +152,7 @@ class WebSocketManager:
             "event": event_type,
             "data": serialize_for_json(data)
         }
-        msg_text = json.dumps(event_msg, default=str)
+        msg_text = _encode_message(event_msg)
 
         for conn_id, websocket in list(self.connections.items()):
             try:
@@ -857,12 +870,7 @@ def register_handlers(app_state: dict):
                 timeout=10
             )
             if result.returncode == 0:
-                # Parse username from output
-                output = result.stdout + result.stderr
-                # Look for "Logged in to github.com account username"
-                import re
-                match = re.search(r'Logged in to [^\s]+ account ([^\s(]+)', output)
-                username = match.group(1) if match else None
+                username = parse_gh_user(result.stdout + result.stderr)
                 return {"authenticated": True, "username": username}
             return {"authenticated": False}
         except FileNotFoundError:
@@ -9,6 +9,7 @@ about a codebase. It can also suggest tasks based on the conversation.
 import argparse
 import asyncio
 import json
+import os
 import sys
 from pathlib import Path
 
@@ -313,6 +314,7 @@ Assistant:"""
         # Try to use claude CLI with --print for simple output
         result = subprocess.run(
             ["claude", "--print", "-p", full_prompt],
+            stdin=subprocess.DEVNULL,  # In worker mode stdin carries the jobs
             capture_output=True,
             text=True,
             cwd=project_dir,
@@ -342,10 +344,62 @@ Assistant:"""
         print(f"Error: {e}")
 
 
+def run_worker() -> None:
+    """
+    Serve queries from stdin until it closes, one JSON job per line:
+    {"id", "projectDir", "message", "history", "model", "thinkingLevel"}.
+
+    Each answer is followed by a __JOB_END__:<id> line, so the server can
+    keep this process (and its imports) for the next query.
+    """
+    debug_section("insights_runner", "Starting Insights worker")
+
+    for line in sys.stdin.buffer:
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError as e:
+            debug_error("insights_runner", f"Invalid job: {e}")
+            continue
+
+        debug(
+            "insights_runner",
+            "Job",
+            job_id=job.get("id"),
+            project_dir=job.get("projectDir"),
+            message_length=len(job.get("message", "")),
+        )
+        try:
+            # Same working directory a one-shot runner would have had
+            os.chdir(job["projectDir"])
+            asyncio.run(
+                run_with_sdk(
+                    job["projectDir"],
+                    job["message"],
+                    job.get("history", []),
+                    job.get("model", "claude-sonnet-4-5-20250929"),
+                    job.get("thinkingLevel", "medium"),
+                )
+            )
+        except Exception as e:
+            print(f"Error running job: {e}", file=sys.stderr)
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+
+        print(f"__JOB_END__:{job.get('id', '')}", flush=True)
+
+    debug_success("insights_runner", "Worker stopped")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Insights AI Chat Runner")
-    parser.add_argument("--project-dir", required=True, help="Project directory path")
-    parser.add_argument("--message", required=True, help="User message")
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Serve JSON jobs from stdin instead of a single query",
+    )
+    parser.add_argument("--project-dir", help="Project directory path")
+    parser.add_argument("--message", help="User message")
     parser.add_argument("--history", default="[]", help="JSON conversation history")
     parser.add_argument(
         "--history-file", help="Path to JSON file containing conversation history"
@@ -363,6 +417,12 @@ def main():
     )
     args = parser.parse_args()
 
+    if args.worker:
+        run_worker()
+        return
+    if not args.project_dir or args.message is None:
+        parser.error("--project-dir and --message are required")
+
     debug_section("insights_runner", "Starting Insights Chat")
 
     project_dir = args.project_dir
@@ -266,9 +266,16 @@ export const infrastructureMock = {
 
   onIdeationLog: (callback: (projectId: string, data: unknown) => void) => {
     const handler = (event: { event: string; data: unknown }) => {
-      const match = event.event?.match(/^ideation\.(.+)\.log$/);
-      if (match) {
+      const match = event.event?.match(/^ideation\.(.+)\.(log|logBatch)$/);
+      if (!match) return;
+      if (match[2] === 'log') {
         callback(match[1], event.data);
+        return;
+      }
+      // Streamed ideas arrive batched; deliver them one by one
+      const { ideas } = event.data as { ideas: unknown[] };
+      for (const idea of ideas) {
+        callback(match[1], { idea });
       }
     };
     return wsService.on('*', handler);
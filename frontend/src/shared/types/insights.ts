@@ -221,8 +221,9 @@ export interface InsightsChatStatus {
 }
 
 export interface InsightsStreamChunk {
-  type: 'text' | 'task_suggestion' | 'tool_start' | 'tool_end' | 'done' | 'error';
+  type: 'text' | 'text_batch' | 'task_suggestion' | 'tool_start' | 'tool_end' | 'done' | 'error';
   content?: string;
+  contents?: string[];  // text_batch: consecutive text lines, in order
   suggestedTask?: {
     title: string;
     description: string;
@@ -352,8 +352,10 @@ export function setupInsightsListeners(): () => void {
     (_projectId, chunk: InsightsStreamChunk) => {
       switch (chunk.type) {
         case 'text':
-          if (chunk.content) {
-            store().appendStreamingContent(chunk.content);
+        case 'text_batch': {
+          const content = chunk.type === 'text_batch' ? chunk.contents?.join('') : chunk.content;
+          if (content) {
+            store().appendStreamingContent(content);
             store().setCurrentTool(null); // Clear tool when receiving text
             store().setStatus({
               phase: 'streaming',
@@ -361,6 +363,7 @@ export function setupInsightsListeners(): () => void {
             });
           }
           break;
+        }
         case 'tool_start':
           if (chunk.tool) {
             store().setCurrentTool({
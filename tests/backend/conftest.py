@@ -108,6 +108,42 @@ def reset_test_state():
     pass
 
 
+class HandlerRecorder:
+    """Collects registered WS handlers"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def register_handler(self, action, handler):
+        self.handlers[action] = handler
+
+
+class EventRecorder:
+    """Collects events sent to the client"""
+
+    def __init__(self):
+        self.events = []
+
+    async def send_event(self, conn_id, event, data):
+        self.events.append((event, data))
+
+
+@pytest.fixture
+def handler_recorder():
+    """
+    Stand-in for the WS manager that keeps registered handlers by action
+    """
+    return HandlerRecorder()
+
+
+@pytest.fixture
+def event_recorder():
+    """
+    Stand-in for the WS manager that keeps the events sent to the client
+    """
+    return EventRecorder()
+
+
 @pytest.fixture
 def temp_project_dir(tmp_path):
     """
@@ -204,7 +240,15 @@ def mock_github_cli(monkeypatch):
 
         return MockSubprocess(0, "", "")
 
+    async def _mock_run_gh(args, *a, **kwargs):
+        result = _mock_gh(["gh"] + list(args))
+        return result.stdout, result.stderr, result.returncode
+
+    from api.github_client import clear_cache
+
     monkeypatch.setattr("subprocess.run", _mock_gh)
+    monkeypatch.setattr("api.github_auth.run_gh", _mock_run_gh)
+    clear_cache()
 
 
 # Pytest configuration
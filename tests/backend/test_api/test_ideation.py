@@ -0,0 +1,242 @@
+"""
+Tests for the ideation WebSocket handlers
+
+Handlers are registered against a recorder and called directly, with a
+stand-in for the main module's project registry.
+"""
+import asyncio
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from api import ideation_handler
+from api.ideation_handler import register_ideation_handlers
+
+
+def _ideation(*idea_ids):
+    return {
+        "id": "ideation-1",
+        "projectId": "proj",
+        "ideas": [{"id": idea_id, "title": idea_id, "status": "new"} for idea_id in idea_ids],
+        "createdAt": "2024-01-01T00:00:00",
+        "updatedAt": "2024-01-01T00:00:00",
+    }
+
+
+@pytest.fixture
+def ideation_project(temp_project_dir, monkeypatch, handler_recorder):
+    """A project with saved ideation and the registered handlers"""
+    monkeypatch.setattr(ideation_handler, "_ideation_store", {})
+    monkeypatch.setattr(ideation_handler, "_write_locks", {})
+    asyncio.run(ideation_handler._save_ideation(
+        "proj", str(temp_project_dir), _ideation("idea-1", "idea-2", "idea-3")
+    ))
+
+    api_main = SimpleNamespace(projects={"proj": SimpleNamespace(path=str(temp_project_dir))})
+    register_ideation_handlers(handler_recorder, api_main)
+    return temp_project_dir, handler_recorder.handlers
+
+
+def _read_ideation(project_dir):
+    """What a fresh process would load: the snapshot plus the replayed op log"""
+    return ideation_handler._load_ideation_sync(str(project_dir))
+
+
+class TestIdeationSaves:
+    """Debounced op-log writes"""
+
+    def test_rapid_mutations_share_one_write(self, ideation_project, monkeypatch):
+        project_dir, handlers = ideation_project
+        writes = []
+        append = ideation_handler._append_ideation_log
+
+        def counting_append(project_path, data):
+            writes.append(data.count(b"\n"))
+            return append(project_path, data)
+
+        monkeypatch.setattr(ideation_handler, "_append_ideation_log", counting_append)
+        monkeypatch.setattr(ideation_handler, "_write_ideation_file", None)
+
+        async def mutate():
+            await handlers["ideation.dismiss"]("conn", {"projectId": "proj", "ideaId": "idea-1"})
+            await handlers["ideation.archive"]("conn", {"projectId": "proj", "ideaId": "idea-2"})
+            await handlers["ideation.delete"]("conn", {"projectId": "proj", "ideaId": "idea-3"})
+
+            # Reads see the change before it is written
+            ideation = await handlers["ideation.get"]("conn", {"projectId": "proj"})
+            assert [i["id"] for i in ideation["ideas"]] == ["idea-1", "idea-2"]
+            assert writes == []
+
+            await asyncio.sleep(ideation_handler._SAVE_DEBOUNCE_SECONDS * 3)
+
+        asyncio.run(mutate())
+
+        # One append of three ops, no snapshot rewrite
+        assert writes == [3]
+        saved = _read_ideation(project_dir)
+        assert [(i["id"], i["status"]) for i in saved["ideas"]] == [
+            ("idea-1", "dismissed"), ("idea-2", "archived")
+        ]
+
+    def test_flush_writes_pending_saves(self, ideation_project):
+        project_dir, handlers = ideation_project
+
+        async def mutate_and_flush():
+            await handlers["ideation.dismissAll"]("conn", {"projectId": "proj"})
+            await ideation_handler.flush_ideation_saves()
+
+        asyncio.run(mutate_and_flush())
+
+        assert {i["status"] for i in _read_ideation(project_dir)["ideas"]} == {"dismissed"}
+
+    def test_concurrent_snapshots_write_latest_once(self, ideation_project, monkeypatch):
+        project_dir, _ = ideation_project
+        writes = []
+        write = ideation_handler._write_ideation_file
+
+        def counting_write(project_path, data):
+            writes.append(data)
+            write(project_path, data)
+
+        monkeypatch.setattr(ideation_handler, "_write_ideation_file", counting_write)
+
+        async def save_burst():
+            await asyncio.gather(*(
+                ideation_handler._save_ideation("proj", str(project_dir), _ideation(f"idea-{n}"))
+                for n in range(5)
+            ))
+
+        asyncio.run(save_burst())
+
+        # The first save took the lock before the others were requested
+        assert len(writes) == 2
+        assert [i["id"] for i in _read_ideation(project_dir)["ideas"]] == ["idea-4"]
+
+    def test_log_is_compacted_into_snapshot(self, ideation_project, monkeypatch):
+        project_dir, handlers = ideation_project
+        monkeypatch.setattr(ideation_handler, "_LOG_COMPACT_RATIO", 0)
+
+        async def mutate_and_flush():
+            await handlers["ideation.archive"]("conn", {"projectId": "proj", "ideaId": "idea-2"})
+            await ideation_handler.flush_ideation_saves()
+
+        asyncio.run(mutate_and_flush())
+
+        assert not (project_dir / ".auto-claude" / "ideation.log.jsonl").exists()
+        snapshot = json.loads((project_dir / ".auto-claude" / "ideation.json").read_text())
+        assert snapshot["ideas"][1]["status"] == "archived"
+
+    def test_repeated_mutation_is_not_saved(self, ideation_project):
+        _, handlers = ideation_project
+
+        async def archive_twice():
+            archive = {"projectId": "proj", "ideaId": "idea-2"}
+            await handlers["ideation.archive"]("conn", archive)
+            await ideation_handler.flush_ideation_saves()
+            second = await handlers["ideation.archive"]("conn", archive)
+            return second, dict(ideation_handler._pending_ops)
+
+        second, pending = asyncio.run(archive_twice())
+
+        assert second == {"success": True}
+        assert pending == {}
+
+    def test_failed_snapshot_write_keeps_previous(self, ideation_project, monkeypatch):
+        project_dir, _ = ideation_project
+
+        def crash(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(ideation_handler.os, "replace", crash)
+        with pytest.raises(OSError):
+            ideation_handler._write_ideation_file(str(project_dir), b'{"trunc')
+
+        assert [i["id"] for i in _read_ideation(project_dir)["ideas"]] == ["idea-1", "idea-2", "idea-3"]
+        assert sorted(p.name for p in (project_dir / ".auto-claude").iterdir()) == ["ideation.json"]
+
+
+class TestIdeaLookup:
+    """Idea lookups by id"""
+
+    def test_lookup_after_delete(self, ideation_project):
+        _, handlers = ideation_project
+
+        async def mutate():
+            await handlers["ideation.delete"]("conn", {"projectId": "proj", "ideaId": "idea-1"})
+            updated = await handlers["ideation.updateStatus"](
+                "conn", {"projectId": "proj", "ideaId": "idea-3", "status": "planned"}
+            )
+            missing = await handlers["ideation.dismiss"]("conn", {"projectId": "proj", "ideaId": "idea-1"})
+            ideation = await handlers["ideation.get"]("conn", {"projectId": "proj"})
+            await ideation_handler.flush_ideation_saves()
+            return updated, missing, ideation
+
+        updated, missing, ideation = asyncio.run(mutate())
+
+        assert updated == {"success": True}
+        assert missing == {"success": False, "error": "Idea not found"}
+        assert [(i["id"], i["status"]) for i in ideation["ideas"]] == [
+            ("idea-2", "new"), ("idea-3", "planned")
+        ]
+
+
+class TestIdeationGeneration:
+    """Runner output parsing"""
+
+    def test_runner_markers(self, temp_project_dir, monkeypatch, event_recorder):
+        monkeypatch.setattr(ideation_handler, "_ideation_store", {})
+        monkeypatch.setattr(ideation_handler, "_write_locks", {})
+        output = "\n".join([
+            "Loading project...",
+            "__TYPE__:security",
+            '__IDEA__:{"title": "Pin dependencies", "priority": "high"}',
+            "__IDEA__:not json",
+            '__IDEA__:{"title": "Rotate keys"}',
+            "__UNKNOWN__:ignored",
+            "__TYPE_COMPLETE__:security",
+        ])
+        spawn = asyncio.create_subprocess_exec
+
+        async def fake_runner(*cmd, **kwargs):
+            return await spawn(sys.executable, "-c", f"print({output!r})", **kwargs)
+
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_runner)
+
+        asyncio.run(ideation_handler._run_ideation_generation(
+            event_recorder, "conn", "proj", str(temp_project_dir), ["security"]
+        ))
+
+        assert [event for event, _ in event_recorder.events] == [
+            "ideation.proj.progress", "ideation.proj.progress", "ideation.proj.logBatch",
+            "ideation.proj.typeComplete", "ideation.proj.complete",
+        ]
+        ideas = event_recorder.events[-1][1]["ideation"]["ideas"]
+        assert [(i["type"], i["title"], i["priority"]) for i in ideas] == [
+            ("security", "Pin dependencies", "high"), ("security", "Rotate keys", "medium")
+        ]
+        # Both ideas arrived within one batch window
+        assert event_recorder.events[2][1] == {"ideas": ideas}
+        assert event_recorder.events[3][1] == {"type": "security"}
+
+    def test_verbose_stderr_does_not_stall_runner(self, temp_project_dir, monkeypatch, event_recorder):
+        monkeypatch.setattr(ideation_handler, "_ideation_store", {})
+        monkeypatch.setattr(ideation_handler, "_write_locks", {})
+        # More stderr than a pipe buffer holds, before any stdout
+        script = (
+            "import sys; sys.stderr.write('progress\\n' * 50_000); sys.stderr.flush(); "
+            "print('__IDEA__:{\"title\": \"Cache builds\"}')"
+        )
+        spawn = asyncio.create_subprocess_exec
+
+        async def fake_runner(*cmd, **kwargs):
+            return await spawn(sys.executable, "-c", script, **kwargs)
+
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_runner)
+
+        asyncio.run(asyncio.wait_for(ideation_handler._run_ideation_generation(
+            event_recorder, "conn", "proj", str(temp_project_dir), ["performance"]
+        ), 30))
+
+        assert [i["title"] for i in event_recorder.events[-1][1]["ideation"]["ideas"]] == ["Cache builds"]
@@ -0,0 +1,299 @@
+"""
+Tests for the insights query streaming
+
+The runner is replaced by a python -c script and the database by an
+in-memory stand-in, so these run offline.
+"""
+import asyncio
+import sys
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from api import insights_handler
+
+
+class _SessionStore:
+    """Stands in for ProjectService's insights session storage"""
+
+    saved = {}
+    writes = 0
+
+    @staticmethod
+    def get_insights_sessions(project_id):
+        return _SessionStore.saved.get(project_id)
+
+    @staticmethod
+    def upsert_insights_session(project_id, session_id, session):
+        _SessionStore.saved.setdefault(project_id, {})[session_id] = session
+        _SessionStore.writes += 1
+
+    @staticmethod
+    def delete_insights_session(project_id, session_id):
+        _SessionStore.saved.get(project_id, {}).pop(session_id, None)
+
+
+@pytest.fixture
+def insights_session(temp_project_dir, monkeypatch):
+    """A project with one empty insights session"""
+    monkeypatch.setattr(_SessionStore, "saved", {})
+    monkeypatch.setattr(_SessionStore, "writes", 0)
+    monkeypatch.setattr(insights_handler, "ProjectService", _SessionStore)
+    monkeypatch.setattr(insights_handler, "_sessions_store", OrderedDict())
+    monkeypatch.setattr(insights_handler, "_summary_cache", {})
+    monkeypatch.setattr(insights_handler, "_latest_session_id", {})
+    monkeypatch.setattr(insights_handler, "_dirty_sessions", set())
+    monkeypatch.setattr(insights_handler, "_flush_handle", None)
+    monkeypatch.setattr(insights_handler, "_runner_pool", insights_handler._RunnerPool(2))
+    session = insights_handler._create_session("proj", str(temp_project_dir))
+    return temp_project_dir, session
+
+
+def _fake_runner(monkeypatch, output: str):
+    spawn = asyncio.create_subprocess_exec
+
+    async def fake_runner(*cmd, **kwargs):
+        return await spawn(sys.executable, "-c", f"import sys; sys.stdout.write({output!r})", **kwargs)
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_runner)
+
+
+class TestInsightsQuery:
+    """Runner output streaming"""
+
+    def test_markers_and_text(self, insights_session, monkeypatch, event_recorder):
+        project_dir, session = insights_session
+        _fake_runner(monkeypatch, "".join([
+            'Looking at the code\n',
+            '__TOOL_START__:{"name": "Read"}\n',
+            '__TOOL_END__:{"name": "Read"}\n',
+            '__not_a_marker__ stays text ✓\n',
+            '__TASK_SUGGESTION__:{"title": "Add tests"}\n',
+        ]))
+
+        asyncio.run(insights_handler._run_insights_query(
+            event_recorder, "conn", "proj", str(project_dir), session["id"], "What's here?", [], {}
+        ))
+
+        chunks = [data for _, data in event_recorder.events]
+        assert [c["type"] for c in chunks] == [
+            "text_batch", "tool_start", "tool_end", "text_batch", "task_suggestion", "done"
+        ]
+        assert chunks[1]["tool"] == {"name": "Read"}
+        assert chunks[3]["contents"] == ["__not_a_marker__ stays text ✓\n"]
+
+        message = _SessionStore.saved["proj"][session["id"]]["messages"][-1]
+        assert message["content"] == "Looking at the code\n__not_a_marker__ stays text ✓"
+        assert message["toolsUsed"] == [{"name": "Read"}]
+        assert message["suggestedTask"] == {"title": "Add tests"}
+
+    def test_worker_is_reused(self, insights_session, monkeypatch, event_recorder):
+        project_dir, session = insights_session
+        spawn = asyncio.create_subprocess_exec
+        spawned = []
+        # Answers each job with the size of its history, like --worker
+        script = (
+            "import json, sys\n"
+            "for line in sys.stdin:\n"
+            "    job = json.loads(line)\n"
+            "    print(len(job['history']))\n"
+            "    print('__JOB_END__:' + job['id'], flush=True)\n"
+        )
+
+        async def worker_runner(*cmd, **kwargs):
+            spawned.append(cmd)
+            return await spawn(sys.executable, "-c", script, **kwargs)
+
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", worker_runner)
+        # Larger than a pipe buffer
+        history = [{"role": "user", "content": "x" * 1000}] * 100
+
+        async def scenario():
+            for size in (100, 3):
+                await insights_handler._run_insights_query(
+                    event_recorder, "conn", "proj", str(project_dir), session["id"], "Hi", history[:size], {}
+                )
+            await insights_handler.close_insights_runners()
+
+        asyncio.run(scenario())
+
+        assert len(spawned) == 1 and "--worker" in spawned[0]
+        messages = _SessionStore.saved["proj"][session["id"]]["messages"]
+        assert [m["content"] for m in messages] == ["100", "3"]
+
+    def test_long_lines_and_unterminated_tail(self, insights_session, monkeypatch, event_recorder):
+        project_dir, session = insights_session
+        spawn = asyncio.create_subprocess_exec
+
+        async def fake_runner(*cmd, **kwargs):
+            script = "import sys; sys.stdout.write('y' * 200_000 + '\\nno newline at end')"
+            return await spawn(sys.executable, "-c", script, **kwargs)
+
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_runner)
+
+        asyncio.run(insights_handler._run_insights_query(
+            event_recorder, "conn", "proj", str(project_dir), session["id"], "Hi", [], {}
+        ))
+
+        lines = [line for _, data in event_recorder.events if data["type"] == "text_batch" for line in data["contents"]]
+        assert lines == ["y" * 200_000 + "\n", "no newline at end"]
+
+    def test_text_lines_are_batched(self, insights_session, monkeypatch, event_recorder):
+        project_dir, session = insights_session
+        _fake_runner(monkeypatch, "".join(f"line {n}\n" for n in range(20)))
+
+        asyncio.run(insights_handler._run_insights_query(
+            event_recorder, "conn", "proj", str(project_dir), session["id"], "Hi", [], {}
+        ))
+
+        batches = [data["contents"] for _, data in event_recorder.events if data["type"] == "text_batch"]
+        assert len(batches) < 20
+        assert max(len(batch) for batch in batches) <= insights_handler._TEXT_BATCH_SIZE
+        assert [line for batch in batches for line in batch] == [f"line {n}\n" for n in range(20)]
+
+
+class TestSessionSummaries:
+    """insights.listSessions ordering"""
+
+    def test_list_follows_updates(self, insights_session, handler_recorder):
+        project_dir, first = insights_session
+        api_main = SimpleNamespace(projects={"proj": SimpleNamespace(path=str(project_dir))})
+        insights_handler.register_insights_handlers(handler_recorder, api_main)
+        handlers = handler_recorder.handlers
+
+        async def scenario():
+            second = await handlers["insights.newSession"]("conn", {"projectId": "proj"})
+            listed = [s["id"] for s in await handlers["insights.listSessions"]("conn", {"projectId": "proj"})]
+            await handlers["insights.renameSession"](
+                "conn", {"projectId": "proj", "sessionId": first["id"], "newTitle": "Renamed"}
+            )
+            renamed = await handlers["insights.listSessions"]("conn", {"projectId": "proj"})
+            await handlers["insights.deleteSession"]("conn", {"projectId": "proj", "sessionId": second["id"]})
+            remaining = await handlers["insights.listSessions"]("conn", {"projectId": "proj"})
+            return second, listed, renamed, remaining
+
+        second, listed, renamed, remaining = asyncio.run(scenario())
+
+        assert listed == [second["id"], first["id"]]
+        assert [(s["id"], s["title"]) for s in renamed] == [
+            (first["id"], "Renamed"), (second["id"], "New conversation")
+        ]
+        assert [s["id"] for s in remaining] == [first["id"]]
+        insights_handler.flush_insights_saves()
+        assert list(_SessionStore.saved["proj"]) == [first["id"]]
+
+
+    def test_current_session_follows_updates(self, insights_session, handler_recorder):
+        project_dir, first = insights_session
+        api_main = SimpleNamespace(projects={"proj": SimpleNamespace(path=str(project_dir))})
+        insights_handler.register_insights_handlers(handler_recorder, api_main)
+        handlers = handler_recorder.handlers
+        target = {"projectId": "proj"}
+
+        async def scenario():
+            second = await handlers["insights.newSession"]("conn", target)
+            current = [(await handlers["insights.getSession"]("conn", target))["id"]]
+            await handlers["insights.renameSession"](
+                "conn", {**target, "sessionId": first["id"], "newTitle": "Renamed"}
+            )
+            current.append((await handlers["insights.getSession"]("conn", target))["id"])
+            await handlers["insights.deleteSession"]("conn", {**target, "sessionId": first["id"]})
+            current.append((await handlers["insights.getSession"]("conn", target))["id"])
+            return second, current
+
+        second, current = asyncio.run(scenario())
+
+        assert current == [second["id"], first["id"], second["id"]]
+
+
+    def test_sessions_saved_without_ns_are_ordered_by_iso(self, insights_session):
+        project_dir, _ = insights_session
+        _SessionStore.saved["old"] = {
+            sid: {"id": sid, "projectId": "old", "title": sid, "messages": [],
+                  "createdAt": updated, "updatedAt": updated}
+            for sid, updated in (
+                ("a", "2024-01-01T09:00:00"), ("b", "2024-01-01T10:00:00.000001"), ("c", "2024-01-01T10:00:00")
+            )
+        }
+
+        summaries = insights_handler._get_session_summaries("old", str(project_dir))
+
+        assert [s["id"] for s in summaries] == ["b", "c", "a"]
+        assert insights_handler._latest_session("old", str(project_dir))["id"] == "b"
+
+
+class TestSessionSaves:
+    """Debounced session writes"""
+
+    def test_burst_of_changes_shares_one_write(self, insights_session, handler_recorder):
+        project_dir, session = insights_session
+        api_main = SimpleNamespace(projects={"proj": SimpleNamespace(path=str(project_dir))})
+        insights_handler.register_insights_handlers(handler_recorder, api_main)
+        handlers = handler_recorder.handlers
+        target = {"projectId": "proj", "sessionId": session["id"]}
+        writes_before = _SessionStore.writes
+
+        async def scenario():
+            await handlers["insights.renameSession"]("conn", {**target, "newTitle": "Renamed"})
+            await handlers["insights.updateModelConfig"]("conn", {**target, "modelConfig": {"model": "m"}})
+            await handlers["insights.clearSession"]("conn", target)
+            pending = _SessionStore.writes - writes_before
+            await asyncio.sleep(insights_handler._SAVE_DEBOUNCE_SECONDS * 2)
+            return pending
+
+        assert asyncio.run(scenario()) == 0
+        assert _SessionStore.writes - writes_before == 1
+        saved = _SessionStore.saved["proj"][session["id"]]
+        assert (saved["title"], saved["modelConfig"]) == ("Renamed", {"model": "m"})
+
+    def test_evicted_project_is_saved_and_reloaded(self, insights_session, monkeypatch):
+        project_dir, session = insights_session
+        monkeypatch.setattr(insights_handler, "MAX_CACHED_PROJECTS", 1)
+
+        async def scenario():
+            sessions = insights_handler._load_sessions("proj", str(project_dir))
+            sessions[session["id"]]["title"] = "Unsaved"
+            insights_handler._save_session("proj", session["id"])
+            insights_handler._load_sessions("other", str(project_dir))
+
+        asyncio.run(scenario())
+
+        assert list(insights_handler._sessions_store) == ["other"]
+        reloaded = insights_handler._load_sessions("proj", str(project_dir))
+        assert reloaded[session["id"]]["title"] == "Unsaved"
+
+
+class TestCreateTask:
+    """insights.createTask"""
+
+    def test_task_is_created_once_per_message(self, insights_session, monkeypatch, handler_recorder):
+        project_dir, session = insights_session
+        session["messages"].append({"id": "msg-1", "role": "assistant", "content": "Try this"})
+        created = []
+
+        async def create_task(request):
+            created.append(request.title)
+            return {"task": {"id": f"task-{len(created)}"}}
+
+        async def broadcast_event(event, data):
+            pass
+        handler_recorder.broadcast_event = broadcast_event
+        api_main = SimpleNamespace(
+            projects={"proj": SimpleNamespace(path=str(project_dir))}, create_task=create_task
+        )
+        insights_handler.register_insights_handlers(handler_recorder, api_main)
+        create = handler_recorder.handlers["insights.createTask"]
+        request = {"projectId": "proj", "sessionId": session["id"], "messageId": "msg-1", "title": "Do it"}
+
+        async def scenario():
+            return await create("conn", request), await create("conn", request)
+
+        first, second = asyncio.run(scenario())
+
+        assert first == {"success": True, "task": {"id": "task-1"}}
+        assert second == {"success": False, "error": "Task already created from this message"}
+        assert created == ["Do it"]
+        insights_handler.flush_insights_saves()
+        saved = _SessionStore.saved["proj"][session["id"]]["messages"][0]
+        assert (saved["taskCreated"], saved["createdTaskId"]) == (True, "task-1")
@@ -150,3 +150,53 @@ class TestProjectSecurity:
 
         # Should return 404 or 403, not actual directory contents
         assert response.status_code in [403, 404]
+
+
+class TestTabState:
+    """Tab state saves"""
+
+    def test_tab_changes_share_one_save(self, monkeypatch):
+        import asyncio
+        from api import main
+
+        saves = []
+        monkeypatch.setattr(main, "_tab_state_save_handle", None)
+        monkeypatch.setattr(main, "tab_state", None)
+        monkeypatch.setattr(main.TabStateService, "save", staticmethod(saves.append))
+
+        async def switch_tabs():
+            for active in ("a", "b", "c"):
+                await main.save_tab_state_endpoint(main.TabState(
+                    openProjectIds=["a", "b", "c"], activeProjectId=active, tabOrder=["a", "b", "c"]
+                ))
+            assert saves == []
+            main.flush_tab_state()
+
+        asyncio.run(switch_tabs())
+
+        assert [s["activeProjectId"] for s in saves] == ["c"]
+
+
+class TestProjectSaves:
+    """Project registry writes"""
+
+    def test_only_changed_projects_are_written(self, monkeypatch):
+        from datetime import datetime
+        from api import main
+
+        writes = []
+        monkeypatch.setattr(main, "_saved_project_rows", {})
+        monkeypatch.setattr(main.ProjectService, "bulk_upsert", staticmethod(
+            lambda rows: writes.append([row["id"] for row in rows])
+        ))
+        monkeypatch.setattr(main, "projects", {
+            pid: main.Project(id=pid, name=pid, path=f"/projects/{pid}", created_at=datetime.now())
+            for pid in ("a", "b")
+        })
+
+        main._save_projects()
+        main._save_projects()
+        main.projects["b"].settings["mainBranch"] = "dev"
+        main._save_projects()
+
+        assert writes == [["a", "b"], [], ["b"]]
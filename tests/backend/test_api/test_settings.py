@@ -0,0 +1,31 @@
+"""
+Tests for the cached app settings service
+"""
+import uuid
+
+from api.database import SettingsService
+
+
+def test_deleted_setting_is_not_served_from_cache():
+    key = f"test-setting-{uuid.uuid4().hex[:8]}"
+    SettingsService.set(key, {"enabled": True})
+    assert SettingsService.get(key) == {"enabled": True}
+
+    assert SettingsService.delete(key)
+
+    assert SettingsService.get(key) is None
+    assert key not in SettingsService.get_all()
+
+
+def test_cached_settings_are_copies():
+    key = f"test-setting-{uuid.uuid4().hex[:8]}"
+    value = {"enabled": True, "nested": {"limit": 1}}
+    SettingsService.set(key, value)
+    try:
+        value["nested"]["limit"] = 2
+        SettingsService.get(key)["nested"]["limit"] = 3
+        SettingsService.get_all()[key]["nested"]["limit"] = 4
+
+        assert SettingsService.get(key) == {"enabled": True, "nested": {"limit": 1}}
+    finally:
+        SettingsService.delete(key)
@@ -383,3 +383,132 @@ class TestTaskArchive:
         assert response.status_code == 200
         data = response.json()
         assert data.get("success") == True
+
+
+class TestStateExportScheduling:
+    """Debounced git state exports"""
+
+    def test_burst_shares_one_export(self, monkeypatch):
+        import asyncio
+        from api import main
+
+        exports = []
+        monkeypatch.setattr(main, "_STATE_EXPORT_DEBOUNCE_SECONDS", 0.05)
+        monkeypatch.setattr(main, "_export_handles", {})
+        monkeypatch.setattr(main, "_export_spec_ids", {})
+
+        async def export(project_id, spec_ids=None):
+            exports.append((project_id, spec_ids))
+
+        monkeypatch.setattr(main, "_export_project_state_in_thread", export)
+
+        async def burst():
+            main.schedule_state_export("proj", spec_ids={"001"})
+            main.schedule_state_export("proj", spec_ids={"002"})
+            main.schedule_state_export("other")
+            await asyncio.sleep(0.15)
+
+        asyncio.run(burst())
+
+        assert sorted(exports, key=lambda e: e[0]) == [("other", None), ("proj", {"001", "002"})]
+
+    def test_export_runs_off_the_loop(self, monkeypatch, tmp_path):
+        import asyncio
+        import threading
+        from types import SimpleNamespace
+        from api import main
+
+        threads = []
+        monkeypatch.setattr(main, "projects", {"proj": SimpleNamespace(path=str(tmp_path))})
+        monkeypatch.setattr(main, "_export_locks", {})
+        monkeypatch.setattr(main, "_project_state_tasks", lambda project_id: [])
+        monkeypatch.setattr(
+            main, "_write_project_state",
+            lambda project_id, project_path, project_tasks, spec_ids: threads.append(threading.current_thread())
+        )
+
+        asyncio.run(main._export_project_state_in_thread("proj"))
+
+        assert threads and threads[0] is not threading.main_thread()
+
+
+class TestTaskBroadcast:
+    """Task events sent over the WebSocket"""
+
+    def test_unsubscribed_event_skips_plan_read(self, monkeypatch):
+        import asyncio
+        from types import SimpleNamespace
+        from api import main
+        from api.websocket_handler import WebSocketManager
+
+        manager = WebSocketManager()
+        plan_reads = []
+        monkeypatch.setattr(main, "ws_manager", manager)
+        monkeypatch.setattr(
+            main, "_get_subtasks_from_plan",
+            lambda project_path, spec_id: plan_reads.append(spec_id) or []
+        )
+        task = main.Task(spec_id="001", title="t", description="", status="done", project_id="proj")
+
+        asyncio.run(main._broadcast_task_event("updated", task))
+        assert plan_reads == []
+
+        manager.subscribe("conn", "*")
+        monkeypatch.setattr(main, "projects", {"proj": SimpleNamespace(path="/tmp")})
+        asyncio.run(main._broadcast_task_event("updated", task))
+        assert plan_reads == ["001"]
+
+
+class TestPlanReads:
+    """Parsed plan files are reused until they change"""
+
+    def test_unchanged_plan_is_parsed_once(self, monkeypatch, tmp_path):
+        import json
+        import os
+        from collections import OrderedDict
+        from api import main
+
+        monkeypatch.setattr(main, "_json_file_cache", OrderedDict())
+        parses = []
+        json_loads = main.json_loads
+        monkeypatch.setattr(main, "json_loads", lambda data: parses.append(1) or json_loads(data))
+
+        spec_dir = tmp_path / ".auto-claude" / "specs" / "001-plan"
+        spec_dir.mkdir(parents=True)
+        plan_file = spec_dir / "implementation_plan.json"
+
+        def write_plan(*ids):
+            plan_file.write_text(json.dumps({"phases": [{"subtasks": [{"id": i} for i in ids]}]}))
+
+        write_plan("a")
+        assert [s["id"] for s in main._get_subtasks_from_plan(str(tmp_path), "001-plan")] == ["a"]
+        assert [s["id"] for s in main._get_subtasks_from_plan(str(tmp_path), "001-plan")] == ["a"]
+        assert len(parses) == 1
+
+        write_plan("a", "b")
+        os.utime(plan_file, ns=(0, 1))
+        assert [s["id"] for s in main._get_subtasks_from_plan(str(tmp_path), "001-plan")] == ["a", "b"]
+        assert len(parses) == 2
+
+
+class TestRunnerMonitor:
+    """Build and planning runner output"""
+
+    def test_verbose_runner_does_not_stall(self):
+        import asyncio
+        import subprocess
+        import sys
+        from api import main
+
+        async def monitor():
+            # More output than a pipe buffer holds
+            proc = subprocess.Popen(
+                [sys.executable, "-c", "print('progress\\n' * 50_000)"],
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+            )
+            output = main._RunnerOutput(proc)
+            while proc.poll() is None:
+                await output.wait(main._MONITOR_POLL_SECONDS)
+            return proc.returncode
+
+        assert asyncio.run(asyncio.wait_for(monitor(), 30)) == 0
@@ -0,0 +1,197 @@
+"""
+Tests for the git-backed state manager
+
+Exercises export/import against a real temporary repository so the
+plumbing commands (ls-tree, cat-file, commit-tree, ...) are covered.
+"""
+import subprocess
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api import git_state, insights_handler
+from api.database import ProjectService
+from api.git_state import GitStateManager, STATE_REF
+
+
+def _sample_tasks():
+    return [
+        {"id": "001-first", "specId": "001-first", "title": "First", "description": "", "status": "backlog"},
+        {"id": "002-second", "specId": "002-second", "title": "Second", "description": "", "status": "done"},
+    ]
+
+
+def _sample_specs():
+    return {
+        "001-first": {
+            "spec.md": "# First\n\nSome details\n",
+            "implementation_plan.json": {"phases": [{"name": "one"}]},
+        },
+        "002-second": {
+            "spec.md": "# Second\n",
+            "requirements.json": {"task_description": "Do the thing"},
+        },
+    }
+
+
+class TestGitStateRoundTrip:
+    """Export state to the hidden ref and read it back"""
+
+    def test_export_creates_state_ref(self, git_initialized_project):
+        mgr = GitStateManager(str(git_initialized_project))
+
+        assert mgr.export_state(_sample_tasks(), _sample_specs())
+
+        result = subprocess.run(
+            ["git", "-C", str(git_initialized_project), "rev-parse", "--verify", STATE_REF],
+            capture_output=True
+        )
+        assert result.returncode == 0
+
+    def test_import_returns_exported_tasks_and_specs(self, git_initialized_project):
+        mgr = GitStateManager(str(git_initialized_project))
+        mgr.export_state(_sample_tasks(), _sample_specs())
+
+        state = mgr.import_state()
+
+        assert state is not None
+        assert [t["id"] for t in state["tasks"]] == ["001-first", "002-second"]
+        assert state["specs"] == _sample_specs()
+
+    def test_import_without_state_ref(self, git_initialized_project):
+        mgr = GitStateManager(str(git_initialized_project))
+
+        assert mgr.import_state() is None
+
+    def test_import_skips_gitkeep(self, git_initialized_project):
+        mgr = GitStateManager(str(git_initialized_project))
+        mgr.export_state(_sample_tasks(), {})
+
+        state = mgr.import_state()
+
+        assert state["specs"] == {}
+
+    def test_reexport_drops_removed_specs(self, git_initialized_project):
+        mgr = GitStateManager(str(git_initialized_project))
+        mgr.export_state(_sample_tasks(), _sample_specs())
+
+        specs = _sample_specs()
+        del specs["002-second"]
+        specs["001-first"]["spec.md"] = "# First (edited)\n"
+        assert mgr.export_state(_sample_tasks()[:1], specs)
+
+        state = mgr.import_state()
+        assert state["specs"] == specs
+
+    def test_history_truncated_at_limit(self, git_initialized_project, monkeypatch):
+        monkeypatch.setattr("api.git_state.STATE_HISTORY_LIMIT", 3)
+        mgr = GitStateManager(str(git_initialized_project))
+
+        for i in range(5):
+            tasks = _sample_tasks()
+            tasks[0]["title"] = f"First v{i}"
+            assert mgr.export_state(tasks, _sample_specs())
+
+        result = subprocess.run(
+            ["git", "-C", str(git_initialized_project), "rev-list", "--count", STATE_REF],
+            capture_output=True, text=True, check=True
+        )
+        assert int(result.stdout) <= 3
+        assert mgr.import_state()["tasks"][0]["title"] == "First v4"
+
+    def test_bulk_export_uses_single_commit(self, git_initialized_project):
+        mgr = GitStateManager(str(git_initialized_project))
+        mgr.export_state(_sample_tasks(), _sample_specs())
+
+        specs = {f"{i:03d}-bulk": {"spec.md": f"# Bulk {i}\n"} for i in range(30)}
+        assert mgr.export_state(_sample_tasks(), specs)
+
+        result = subprocess.run(
+            ["git", "-C", str(git_initialized_project), "rev-list", "--count", STATE_REF],
+            capture_output=True, text=True, check=True
+        )
+        # init commit + first export + bulk export
+        assert int(result.stdout) == 3
+        assert mgr.import_state()["specs"] == specs
+
+    def test_concurrent_exports_are_serialized(self, git_initialized_project):
+        mgr = GitStateManager(str(git_initialized_project))
+        mgr.export_state(_sample_tasks(), _sample_specs())
+
+        def export(i):
+            tasks = _sample_tasks()
+            tasks[0]["title"] = f"Concurrent {i}"
+            return mgr.export_state(tasks, _sample_specs())
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            assert all(pool.map(export, range(8)))
+
+        # Every export either committed or was coalesced into a running one
+        state = mgr.import_state()
+        assert state["tasks"][0]["title"].startswith("Concurrent ")
+        result = subprocess.run(
+            ["git", "-C", str(git_initialized_project), "fsck", "--no-dangling"],
+            capture_output=True
+        )
+        assert result.returncode == 0
+
+    def test_partial_export_keeps_untouched_specs(self, git_initialized_project):
+        mgr = GitStateManager(str(git_initialized_project))
+        mgr.export_state(_sample_tasks(), _sample_specs())
+
+        updated = {"001-first": {"spec.md": "# First v2\n"}}
+        assert mgr.export_state(_sample_tasks(), updated, spec_ids={"001-first"})
+
+        state = mgr.import_state()
+        assert state["specs"]["001-first"] == updated["001-first"]
+        assert state["specs"]["002-second"] == _sample_specs()["002-second"]
+
+
+class TestProjectDataRestore:
+    """Project-level data written back to the database on import"""
+
+    def test_restored_insights_sessions_replace_current_ones(self, git_initialized_project):
+        project_id = f"test-restore-{uuid.uuid4().hex[:8]}"
+        ProjectService.create({"id": project_id, "name": "Restore", "path": str(git_initialized_project)})
+        original = {"id": "session-1", "title": "Original", "messages": []}
+        ProjectService.upsert_insights_session(project_id, "session-1", original)
+        try:
+            mgr = GitStateManager(str(git_initialized_project))
+            tasks = [dict(task, projectId=project_id) for task in _sample_tasks()]
+            assert mgr.export_state(tasks, _sample_specs())
+
+            changed = dict(original, title="Changed")
+            ProjectService.upsert_insights_session(project_id, "session-1", changed)
+            insights_handler._cache_sessions(project_id, {"session-1": changed})
+
+            state = mgr.import_state()
+            assert git_state.restore_project_data_to_db(project_id, state["projectData"])
+
+            assert ProjectService.get_insights_sessions(project_id)["session-1"]["title"] == "Original"
+            sessions = insights_handler._load_sessions(project_id, str(git_initialized_project))
+            assert sessions["session-1"]["title"] == "Original"
+        finally:
+            insights_handler.forget_project_sessions(project_id)
+            ProjectService.delete(project_id)
+
+
+class TestSpecFileCollection:
+    """Flat-file spec data for specs without a database row"""
+
+    def test_unchanged_files_are_not_reread(self, temp_project_dir, monkeypatch):
+        monkeypatch.setattr(git_state, "_spec_file_cache", {})
+        monkeypatch.setattr(git_state, "collect_spec_data_from_db", lambda spec_id: {})
+        spec_dir = temp_project_dir / ".auto-claude" / "specs" / "001-first"
+        spec_dir.mkdir(parents=True)
+        (spec_dir / "spec.md").write_text("# First\n")
+        (spec_dir / "requirements.json").write_text('{"task_description": "v1"}')
+
+        first = git_state.collect_spec_data(temp_project_dir, "001-first")
+        assert git_state.collect_spec_data(temp_project_dir, "001-first") is first
+
+        # Rewritten in place: the directory's mtime stays, the file's doesn't
+        (spec_dir / "requirements.json").write_text('{"task_description": "version 2"}')
+        second = git_state.collect_spec_data(temp_project_dir, "001-first")
+        assert second["requirements.json"] == {"task_description": "version 2"}
+        assert second["spec.md"] == "# First\n"
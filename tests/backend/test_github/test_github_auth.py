@@ -275,3 +275,37 @@ class TestGitHubAuthWorkflow:
 
             # Should succeed or return 401/500
             assert repos_response.status_code in [200, 401, 500]
+
+
+class TestGitHubAuthState:
+    """Auth state read from gh's hosts.yml"""
+
+    @pytest.fixture
+    def hosts_file(self, tmp_path, monkeypatch):
+        from api import github_auth
+
+        hosts = tmp_path / "hosts.yml"
+        monkeypatch.setattr(github_auth, "GH_HOSTS_FILE", hosts)
+        monkeypatch.setitem(github_auth._auth_state, "loaded_at", None)
+        monkeypatch.delenv("GH_TOKEN", raising=False)
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        return hosts
+
+    def test_status_reads_username_from_hosts_file(self, client: TestClient, hosts_file):
+        hosts_file.write_text("github.com:\n  user: octocat\n  oauth_token: gho_abc\n")
+
+        data = client.get("/api/github/auth/status").json()["data"]
+
+        assert data == {"authenticated": True, "username": "octocat"}
+
+    def test_status_follows_hosts_file_changes(self, client: TestClient, hosts_file):
+        import os
+
+        hosts_file.write_text("github.com:\n  user: octocat\n")
+        assert client.get("/api/github/auth/status").json()["data"]["authenticated"]
+
+        hosts_file.write_text("{}\n")
+        os.utime(hosts_file, (0, 0))
+
+        data = client.get("/api/github/auth/status").json()["data"]
+        assert data == {"authenticated": False, "username": None}
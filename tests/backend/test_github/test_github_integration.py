@@ -0,0 +1,327 @@
+"""
+Tests for the GitHub integration WebSocket handlers
+
+The GitHub API is replaced by an httpx.MockTransport, so these run offline.
+"""
+import asyncio
+import json
+import re
+import subprocess
+
+import httpx
+import pytest
+
+from api import github_client, github_integration_handler
+from api.main import TaskCreateRequest
+from api.github_integration_handler import register_github_integration_handlers
+
+
+class _ApiMain:
+    projects = {}
+
+
+_GRAPHQL_ISSUES = {1: {"title": "Bug", "body": "Broken"}}
+
+
+def _graphql(request: httpx.Request) -> httpx.Response:
+    body = json.loads(request.content)
+    query = body["query"]
+    if "viewer" in query:
+        return httpx.Response(200, json={"data": {"viewer": {"repositories": {"nodes": [
+            {"nameWithOwner": "alice/app", "description": "An app", "isPrivate": False},
+        ]}}}})
+    if "issues(" in query:
+        assert body["variables"]["states"] == ["OPEN"]
+        return httpx.Response(200, json={"data": {"repository": {"issues": {
+            "nodes": [{
+                "number": 1, "title": "Bug", "body": "Broken", "state": "OPEN",
+                "labels": {"nodes": [{"name": "bug"}]}, "author": {"login": "alice"},
+                "comments": {"totalCount": 2}, "url": "https://github.com/owner/repo/issues/1",
+                "createdAt": "2024-01-01T00:00:00Z", "updatedAt": "2024-01-02T00:00:00Z",
+            }],
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+        }}}})
+    repository = {
+        alias: _GRAPHQL_ISSUES.get(int(number))
+        for alias, number in re.findall(r"(i\d+): issue\(number: (\d+)\)", query)
+    }
+    return httpx.Response(200, json={
+        "data": {"repository": repository},
+        "errors": [{"type": "NOT_FOUND"}] if None in repository.values() else [],
+    })
+
+
+def _github_api(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path == "/user":
+        return httpx.Response(200, json={"login": "alice", "name": "Alice"})
+    if path == "/orgs/acme/repos" and request.method == "POST":
+        body = json.loads(request.content)
+        return httpx.Response(201, json={
+            "full_name": f"acme/{body['name']}", "html_url": f"https://github.com/acme/{body['name']}",
+            "clone_url": f"https://github.com/acme/{body['name']}.git", "private": body["private"],
+        })
+    if path == "/graphql":
+        return _graphql(request)
+    if path == "/repos/owner/repo/issues/1":
+        return httpx.Response(200, json={"number": 1, "title": "Bug", "body": "Broken", "labels": []})
+    if path == "/repos/owner/repo/issues/1/comments":
+        return httpx.Response(200, json=[
+            {"user": {"login": "bob"}, "body": "Same here", "created_at": "2024-01-03T00:00:00Z"},
+        ])
+    if path == "/repos/owner/repo/issues/2":
+        return httpx.Response(200, json={"number": 2, "title": "Crash", "body": None, "labels": []})
+    if path == "/repos/owner/repo/branches":
+        return httpx.Response(200, json=[{"name": "main"}, {"name": "develop"}])
+    return httpx.Response(404, json={"message": "Not Found"})
+
+
+@pytest.fixture
+def github_handlers(monkeypatch, handler_recorder):
+    """Register handlers against a mocked GitHub API"""
+    client = httpx.AsyncClient(
+        base_url=github_client.GITHUB_API_URL,
+        transport=httpx.MockTransport(_github_api)
+    )
+    monkeypatch.setattr(github_client, "_client", client)
+    monkeypatch.setattr(github_client, "_token", "test-token")
+    monkeypatch.setattr(github_client, "_token_loaded", True)
+    github_client.clear_cache()
+
+    register_github_integration_handlers(handler_recorder, _ApiMain())
+    return handler_recorder.handlers
+
+
+class TestGitHubIssues:
+    """Issue listing and detail handlers"""
+
+    def test_get_issues(self, github_handlers):
+        issues = asyncio.run(github_handlers["github.getIssues"]("conn", {"repo": "owner/repo"}))
+
+        assert [i["number"] for i in issues] == [1]
+        assert issues[0]["state"] == "open"
+        assert issues[0]["author"] == "alice"
+        assert issues[0]["labels"] == ["bug"]
+        assert issues[0]["commentCount"] == 2
+
+    def test_get_issue_includes_comments(self, github_handlers):
+        issue = asyncio.run(github_handlers["github.getIssue"](
+            "conn", {"repo": "owner/repo", "issueNumber": 1}
+        ))
+
+        assert issue["title"] == "Bug"
+        assert issue["comments"] == [
+            {"author": "bob", "body": "Same here", "createdAt": "2024-01-03T00:00:00Z"}
+        ]
+
+
+class TestGitHubBranches:
+    """Branch listing handler"""
+
+    def test_get_branches(self, github_handlers):
+        branches = asyncio.run(github_handlers["github.getBranches"]("conn", {"repo": "owner/repo"}))
+
+        assert branches == ["main", "develop"]
+
+    def test_get_branches_without_repo(self, github_handlers):
+        assert asyncio.run(github_handlers["github.getBranches"]("conn", {})) == []
+
+
+class TestGitHubImportIssues:
+    """Issue import handler"""
+
+    def test_import_creates_tasks_and_reports_failures(self, github_handlers, monkeypatch):
+        created = []
+
+        async def create_task(request):
+            created.append(request.title)
+            return {"success": True, "task": {"title": request.title}}
+
+        monkeypatch.setattr(_ApiMain, "projects", {"proj": object()})
+        monkeypatch.setattr(_ApiMain, "create_task", staticmethod(create_task), raising=False)
+        monkeypatch.setattr(_ApiMain, "TaskCreateRequest", TaskCreateRequest, raising=False)
+
+        result = asyncio.run(github_handlers["github.importIssues"](
+            "conn", {"projectId": "proj", "repo": "owner/repo", "issueNumbers": [1, 2, 99]}
+        ))
+
+        assert result["imported"] == [1, 2]
+        assert result["failed"] == [99]
+        assert result["success"] is False
+        assert sorted(created) == ["[#1] Bug", "[#2] Crash"]
+
+
+class TestGitHubCache:
+    """Cached handler results"""
+
+    def test_user_is_cached_until_cleared(self, github_handlers, monkeypatch):
+        calls = []
+        original = github_client.github_request
+
+        async def counting_request(method, path, **kwargs):
+            calls.append(path)
+            return await original(method, path, **kwargs)
+
+        monkeypatch.setattr(github_client, "github_request", counting_request)
+
+        first = asyncio.run(github_handlers["github.getUser"]("conn-1", {}))
+        second = asyncio.run(github_handlers["github.getUser"]("conn-2", {}))
+        assert first == second
+        assert first["login"] == "alice"
+        assert calls == ["/user"]
+
+        asyncio.run(github_handlers["github.clearCache"]("conn-1", {}))
+        asyncio.run(github_handlers["github.getUser"]("conn-1", {}))
+        assert calls == ["/user", "/user"]
+
+
+class TestGitHubListUserRepos:
+    """Repo picker listing"""
+
+    def test_list_user_repos(self, github_handlers):
+        result = asyncio.run(github_handlers["github.listUserRepos"]("conn", {}))
+
+        assert result == {"repos": [
+            {"fullName": "alice/app", "description": "An app", "isPrivate": False}
+        ]}
+
+
+class TestGitHubCreateRepo:
+    """Repository creation handler"""
+
+    def test_create_org_repo(self, github_handlers):
+        result = asyncio.run(github_handlers["github.createRepo"](
+            "conn", {"repoName": "widget", "owner": "acme", "isPrivate": True}
+        ))
+
+        assert result == {
+            "success": True,
+            "data": {"url": "https://github.com/acme/widget", "fullName": "acme/widget"}
+        }
+
+    def test_push_authenticates_through_gh(self, github_handlers, git_initialized_project, monkeypatch):
+        path = str(git_initialized_project)
+        run_git = github_integration_handler._run_git
+        pushes = []
+
+        async def fake_run_git(args, cwd, timeout=10):
+            if "push" in args:
+                pushes.append(args)
+                return "", "", 0
+            return await run_git(args, cwd, timeout)
+
+        monkeypatch.setattr(github_integration_handler, "_run_git", fake_run_git)
+
+        result = asyncio.run(github_handlers["github.createRepo"](
+            "conn", {"repoName": "widget", "owner": "acme", "projectPath": path}
+        ))
+
+        assert result["success"]
+        assert pushes == [[
+            "-c", "credential.helper=", "-c", "credential.helper=!gh auth git-credential",
+            "push", "--set-upstream", "origin", "HEAD",
+        ]]
+        assert asyncio.run(github_integration_handler._get_origin_url(path)) == "https://github.com/acme/widget.git"
+
+    def test_existing_origin_is_kept(self, github_handlers, git_initialized_project, monkeypatch):
+        path = str(git_initialized_project)
+        subprocess.run(["git", "remote", "add", "origin", "git@github.com:owner/app.git"], cwd=path, check=True)
+        posts = []
+        original = github_client.github_request
+
+        async def counting_request(method, path, **kwargs):
+            posts.append(path)
+            return await original(method, path, **kwargs)
+
+        monkeypatch.setattr(github_client, "github_request", counting_request)
+
+        result = asyncio.run(github_handlers["github.createRepo"](
+            "conn", {"repoName": "widget", "owner": "acme", "projectPath": path}
+        ))
+
+        assert result == {"success": False, "error": "Remote origin already exists"}
+        assert posts == []
+        assert asyncio.run(github_integration_handler._get_origin_url(path)) == "git@github.com:owner/app.git"
+
+
+class TestDetectRepo:
+    """Repository detection from the project's origin remote"""
+
+    def test_detect_repo_follows_remote_changes(self, git_initialized_project, handler_recorder):
+        from api.github_integration_handler import _detect_repo_from_project
+
+        register_github_integration_handlers(handler_recorder, _ApiMain())
+        path = str(git_initialized_project)
+
+        assert asyncio.run(_detect_repo_from_project(path)) is None
+
+        result = asyncio.run(handler_recorder.handlers["github.addRemote"](
+            "conn", {"projectPath": path, "repoFullName": "owner/first"}
+        ))
+        assert result == {"success": True}
+        assert asyncio.run(_detect_repo_from_project(path)) == "owner/first"
+
+        asyncio.run(handler_recorder.handlers["github.addRemote"](
+            "conn", {"projectPath": path, "repoFullName": "owner/second"}
+        ))
+        assert asyncio.run(_detect_repo_from_project(path)) == "owner/second"
+
+
+class TestGitHubRateLimit:
+    """Rate-limit handling in the API client"""
+
+    def test_retries_after_retry_after(self, monkeypatch):
+        responses = [
+            httpx.Response(403, headers={"Retry-After": "0"}, json={"message": "secondary rate limit"}),
+            httpx.Response(200, json={"login": "alice"}),
+        ]
+        client = httpx.AsyncClient(
+            base_url=github_client.GITHUB_API_URL,
+            transport=httpx.MockTransport(lambda request: responses.pop(0))
+        )
+        monkeypatch.setattr(github_client, "_client", client)
+        monkeypatch.setattr(github_client, "_token", "test-token")
+        monkeypatch.setattr(github_client, "_token_loaded", True)
+
+        assert asyncio.run(github_client.github_get("/user")) == {"login": "alice"}
+        assert responses == []
+
+    def test_spent_budget_fails_fast(self, monkeypatch):
+        limiter = github_client._RateLimiter(5000, 3600)
+        limiter.pause(3600)
+        monkeypatch.setattr(github_client, "_core_limiter", limiter)
+        monkeypatch.setattr(github_client, "_token", "test-token")
+        monkeypatch.setattr(github_client, "_token_loaded", True)
+
+        with pytest.raises(github_client.GitHubAPIError) as exc:
+            asyncio.run(github_client.github_get("/user"))
+        assert exc.value.status_code == 429
+
+
+class TestGitHubConditionalRequests:
+    """ETag-based conditional GETs"""
+
+    def test_not_modified_reuses_cached_body(self, monkeypatch):
+        seen = []
+
+        def api(request):
+            seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, headers={"ETag": '"v1"'}, json=[{"login": "acme"}])
+
+        client = httpx.AsyncClient(base_url=github_client.GITHUB_API_URL, transport=httpx.MockTransport(api))
+        monkeypatch.setattr(github_client, "_client", client)
+        monkeypatch.setattr(github_client, "_token", "test-token")
+        monkeypatch.setattr(github_client, "_token_loaded", True)
+        github_client.clear_cache()
+
+        async def fetch_twice():
+            first = await github_client.github_get("/user/orgs", conditional=True)
+            second = await github_client.github_get("/user/orgs", conditional=True)
+            return first, second
+
+        first, second = asyncio.run(fetch_twice())
+
+        assert first == second == [{"login": "acme"}]
+        assert seen == [None, '"v1"']